@@ -0,0 +1,104 @@
+"""partition task_logs by date
+
+Revision ID: 2a7ffb0a5d6e
+Revises: fb2f7371fd7e
+Create Date: 2026-02-09 12:05:33.618027
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a7ffb0a5d6e'
+down_revision: Union[str, None] = 'fb2f7371fd7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Kept in sync with habit_tasks.database.partitions; the background job
+# creates further months after this migration.
+MONTHS_AHEAD = 3
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.rename_table('task_logs', 'task_logs_unpartitioned')
+    op.execute('ALTER TABLE task_logs_unpartitioned RENAME CONSTRAINT pk_task_logs TO pk_task_logs_unpartitioned')
+    op.execute('ALTER TABLE task_logs_unpartitioned RENAME CONSTRAINT uq_task_log_date TO uq_task_log_date_unpartitioned')
+    op.execute('ALTER TABLE task_logs_unpartitioned RENAME CONSTRAINT fk_task_logs_task_id_tasks TO fk_task_logs_unpartitioned_task_id_tasks')
+    op.execute('ALTER INDEX ix_task_logs_updated_at RENAME TO ix_task_logs_unpartitioned_updated_at')
+
+    # Unique constraints of a partitioned table must contain the partition
+    # key, hence the (id, date) primary key.
+    op.execute("""
+        CREATE TABLE task_logs (
+            id integer NOT NULL DEFAULT nextval('task_logs_id_seq'),
+            task_id integer NOT NULL,
+            date date NOT NULL,
+            status boolean NOT NULL,
+            updated_at timestamp with time zone NOT NULL,
+            CONSTRAINT pk_task_logs PRIMARY KEY (id, date),
+            CONSTRAINT uq_task_log_date UNIQUE (task_id, date),
+            CONSTRAINT fk_task_logs_task_id_tasks FOREIGN KEY (task_id)
+                REFERENCES tasks (id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (date)
+    """)
+    op.execute('ALTER SEQUENCE task_logs_id_seq OWNED BY task_logs.id')
+    op.create_index(op.f('ix_task_logs_updated_at'), 'task_logs', ['updated_at'], unique=False)
+    op.execute('CREATE TABLE task_logs_default PARTITION OF task_logs DEFAULT')
+
+    first = bind.execute(sa.text('SELECT min(date) FROM task_logs_unpartitioned')).scalar()
+    current = date.today().replace(day=1)
+    month = (first or current).replace(day=1)
+    while month <= add_months(current, MONTHS_AHEAD):
+        op.execute(
+            f"CREATE TABLE task_logs_p{month.year:04}_{month.month:02} "
+            f"PARTITION OF task_logs FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+        )
+        month = add_months(month, 1)
+
+    op.execute('INSERT INTO task_logs (id, task_id, date, status, updated_at) SELECT id, task_id, date, status, updated_at FROM task_logs_unpartitioned')
+    op.drop_table('task_logs_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.rename_table('task_logs', 'task_logs_partitioned')
+    op.execute('ALTER TABLE task_logs_partitioned RENAME CONSTRAINT pk_task_logs TO pk_task_logs_partitioned')
+    op.execute('ALTER TABLE task_logs_partitioned RENAME CONSTRAINT uq_task_log_date TO uq_task_log_date_partitioned')
+    op.execute('ALTER TABLE task_logs_partitioned RENAME CONSTRAINT fk_task_logs_task_id_tasks TO fk_task_logs_partitioned_task_id_tasks')
+    op.execute('ALTER INDEX ix_task_logs_updated_at RENAME TO ix_task_logs_partitioned_updated_at')
+
+    op.execute("""
+        CREATE TABLE task_logs (
+            id integer NOT NULL DEFAULT nextval('task_logs_id_seq'),
+            task_id integer NOT NULL,
+            date date NOT NULL,
+            status boolean NOT NULL,
+            updated_at timestamp with time zone NOT NULL,
+            CONSTRAINT pk_task_logs PRIMARY KEY (id),
+            CONSTRAINT uq_task_log_date UNIQUE (task_id, date),
+            CONSTRAINT fk_task_logs_task_id_tasks FOREIGN KEY (task_id)
+                REFERENCES tasks (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute('ALTER SEQUENCE task_logs_id_seq OWNED BY task_logs.id')
+    op.create_index(op.f('ix_task_logs_updated_at'), 'task_logs', ['updated_at'], unique=False)
+    op.execute('INSERT INTO task_logs (id, task_id, date, status, updated_at) SELECT id, task_id, date, status, updated_at FROM task_logs_partitioned')
+    op.drop_table('task_logs_partitioned')
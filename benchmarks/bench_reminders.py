@@ -0,0 +1,76 @@
+"""Throughput of the reminder scheduler draining a due queue.
+
+Run with the usual application environment (see .github/workflows/ci.yml):
+
+    PYTHONPATH=src python benchmarks/bench_reminders.py
+
+Uses in-memory SQLite, so it measures the claim/advance loop rather than
+PostgreSQL's SKIP LOCKED behaviour.
+"""
+
+import asyncio
+import time
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from datetime import time as clock_time
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from habit_tasks.database.models import Base, TaskReminder
+from habit_tasks.reminders import ReminderDelivery, ReminderScheduler
+
+REMINDERS = 200_000
+BATCH_SIZES = (500, 1000, 5000)
+
+
+class NullSink:
+    async def deliver(self, deliveries: Sequence[ReminderDelivery]) -> None:
+        pass
+
+
+async def bench(batch_size: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "task_id": i,
+            "user_id": i % 1000,
+            "local_time": clock_time(i % 24, i % 60),
+            "timezone": "Europe/Kyiv",
+            "next_fire_at": now - timedelta(seconds=i % 60),
+        }
+        for i in range(REMINDERS)
+    ]
+    async with engine.begin() as conn:
+        await conn.execute(insert(TaskReminder), rows)
+
+    scheduler = ReminderScheduler(
+        async_sessionmaker(bind=engine, expire_on_commit=False),
+        NullSink(),
+        batch_size=batch_size,
+        clock=lambda: now,
+    )
+    started = time.perf_counter()
+    delivered = 0
+    while claimed := await scheduler.run_once():
+        delivered += claimed
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"batch {batch_size:>5}: {delivered} reminders in {elapsed:6.2f}s "
+        f"({delivered / elapsed * 60:,.0f}/min)"
+    )
+    await engine.dispose()
+
+
+async def main() -> None:
+    for batch_size in BATCH_SIZES:
+        await bench(batch_size)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+"""Benchmark for the streak / completion-rate engine over long histories.
+
+Run with the usual application environment (see .github/workflows/ci.yml):
+
+    PYTHONPATH=src python benchmarks/bench_task_stats.py
+
+Times three ways of producing one user's stats: the pure-Python
+gaps-and-islands, the window query that rebuilds aggregates on writes, and
+the aggregate read that GET /tasks/stats does. The queries run on in-memory
+SQLite, so the numbers compare the paths rather than predict PostgreSQL.
+"""
+
+import asyncio
+import random
+import time
+import timeit
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from habit_tasks.api.v1.tasks.aggregates import recompute_aggregates
+from habit_tasks.api.v1.tasks.stats import (
+    compute_streaks,
+    get_task_stats_logic,
+    load_streaks,
+    to_task_stats,
+)
+from habit_tasks.database.models import Base, Task, TaskLog, User
+from habit_tasks.schemas.user import UserPrincipal
+
+ROUNDS = 5
+TASKS = 50
+TODAY = date(2025, 1, 1)
+
+
+def history(years: int, rng: random.Random) -> list[date]:
+    days = years * 365
+    return [
+        TODAY - timedelta(days=offset)
+        for offset in range(days, -1, -1)
+        if rng.random() < 0.8
+    ]
+
+
+async def time_async(call: Callable[[], Awaitable[object]]) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        await call()
+    return (time.perf_counter() - started) / ROUNDS
+
+
+def report(label: str, years: int, logs: int, per_call: float) -> None:
+    print(
+        f"{years:>2} years, {TASKS} tasks, {logs:>7} logs {label:<10}"
+        f"{per_call * 1e3:8.2f} ms/user {per_call / logs * 1e9:8.1f} ns/log"
+    )
+
+
+async def bench(years: int, rng: random.Random) -> None:
+    created_at = datetime.combine(
+        TODAY - timedelta(days=years * 365), datetime.min.time()
+    )
+    histories = [history(years, rng) for _ in range(TASKS)]
+    logs = sum(len(dates) for dates in histories)
+
+    per_call = (
+        timeit.timeit(
+            lambda: [
+                to_task_stats(i, created_at, compute_streaks(dates), TODAY)
+                for i, dates in enumerate(histories)
+            ],
+            number=ROUNDS,
+        )
+        / ROUNDS
+    )
+    report("python", years, logs, per_call)
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(User),
+            [{"id": 1, "username": "bench", "email": "b@b", "password_hash": ""}],
+        )
+        await conn.execute(
+            insert(Task),
+            [
+                {"id": i, "user_id": 1, "title": f"task {i}", "created_at": created_at}
+                for i in range(1, TASKS + 1)
+            ],
+        )
+        await conn.execute(
+            insert(TaskLog),
+            [
+                {"task_id": i, "date": day, "status": True}
+                for i, dates in enumerate(histories, start=1)
+                for day in dates
+            ],
+        )
+
+    task_ids = list(range(1, TASKS + 1))
+    user = UserPrincipal(id=1, username="bench", role="user")
+    async with async_sessionmaker(bind=engine, expire_on_commit=False)() as session:
+        report(
+            "window",
+            years,
+            logs,
+            await time_async(lambda: load_streaks(session, task_ids)),
+        )
+        await recompute_aggregates(session, task_ids)
+        await session.commit()
+        report(
+            "aggregate",
+            years,
+            logs,
+            await time_async(lambda: get_task_stats_logic(session, user)),
+        )
+    await engine.dispose()
+
+
+async def main() -> None:
+    rng = random.Random(0)
+    for years in (1, 5, 10):
+        await bench(years, rng)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""Microbenchmark for access-token verification.
+
+Run with the usual application environment (see .github/workflows/ci.yml):
+
+    PYTHONPATH=src python benchmarks/bench_token_verification.py
+"""
+
+import timeit
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from habit_tasks.api.v1.auth import utils
+
+ROUNDS = 2_000
+
+
+def generate_keys(algorithm: str) -> tuple[str, str]:
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        private_key = ed25519.Ed25519PrivateKey.generate()
+
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return private_pem.decode(), public_pem.decode()
+
+
+def bench(label: str, func) -> None:
+    seconds = timeit.timeit(func, number=ROUNDS)
+    print(f"{label:<32} {seconds / ROUNDS * 1e6:10.1f} us/op")
+
+
+def main() -> None:
+    for algorithm in ("RS256", "ES256", "EdDSA"):
+        private_key, public_key = generate_keys(algorithm)
+        token = utils.encode_token({"sub": "bench"}, private_key, algorithm)
+
+        bench(
+            f"{algorithm} sign",
+            lambda: utils.encode_token({"sub": "bench"}, private_key, algorithm),
+        )
+        bench(
+            f"{algorithm} verify",
+            lambda: utils.decode_token(token, public_key, algorithm),
+        )
+
+    token = utils.encode_token({"sub": "bench"})
+    utils.decode_token_cached(token)
+    bench("verified-token cache hit", lambda: utils.decode_token_cached(token))
+
+
+if __name__ == "__main__":
+    main()
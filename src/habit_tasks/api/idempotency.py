@@ -0,0 +1,275 @@
+import hashlib
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+from jwt.exceptions import InvalidTokenError
+from sqlalchemy import delete, null, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from habit_tasks.api.v1.auth.utils import TokenType, decode_token_cached
+from habit_tasks.config import settings
+from habit_tasks.database import database_helper
+from habit_tasks.database.dialect import dialect_insert
+from habit_tasks.database.models import IdempotencyKey
+from habit_tasks.utils import (
+    IdempotencyRecord,
+    IdempotencyStore,
+    InMemoryIdempotencyStore,
+    StoredResponse,
+)
+
+MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+class DatabaseIdempotencyStore:
+    """Keeps records in the idempotency_keys table, so retries are deduped
+    across workers. Expired rows, including reservations whose lease ran out,
+    are taken over by the next reservation."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        self.session_factory = session_factory
+        self.clock = clock
+
+    async def reserve(
+        self, user_id: int, key: str, fingerprint: str, lease: float
+    ) -> IdempotencyRecord | None:
+        now = self.clock()
+        async with self.session_factory() as session:
+            stmt = dialect_insert(session, IdempotencyKey).values(
+                user_id=user_id,
+                key=key,
+                fingerprint=fingerprint,
+                expires_at=now + timedelta(seconds=lease),
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+                set_={
+                    "fingerprint": stmt.excluded.fingerprint,
+                    "status_code": null(),
+                    "headers": null(),
+                    "body": null(),
+                    "expires_at": stmt.excluded.expires_at,
+                },
+                where=IdempotencyKey.expires_at <= now,
+            ).returning(IdempotencyKey.key)
+
+            if await session.scalar(stmt) is not None:
+                await session.commit()
+                return None
+
+            stmt = select(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id, IdempotencyKey.key == key
+            )
+            row = await session.scalar(stmt)
+
+        if row is None:
+            return None
+        # The response columns are only set together, by save().
+        if row.status_code is None or row.headers is None or row.body is None:
+            return IdempotencyRecord(row.fingerprint)
+        return IdempotencyRecord(
+            row.fingerprint,
+            StoredResponse(
+                row.status_code, [tuple(header) for header in row.headers], row.body
+            ),
+        )
+
+    async def save(
+        self, user_id: int, key: str, response: StoredResponse, ttl: float
+    ) -> None:
+        async with self.session_factory() as session:
+            row = await session.get(IdempotencyKey, (user_id, key))
+            if row is not None:
+                row.status_code = response.status_code
+                row.headers = [list(header) for header in response.headers]
+                row.body = response.body
+                row.expires_at = self.clock() + timedelta(seconds=ttl)
+                await session.commit()
+
+    async def release(self, user_id: int, key: str) -> None:
+        async with self.session_factory() as session:
+            if row := await session.get(IdempotencyKey, (user_id, key)):
+                await session.delete(row)
+                await session.commit()
+
+    async def clear(self) -> None:
+        async with self.session_factory() as session:
+            await session.execute(delete(IdempotencyKey))
+            await session.commit()
+
+
+def request_fingerprint(method: str, path: str, query: bytes, body: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (method.encode(), path.encode(), query, body):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def access_token_user_id(headers: Headers) -> int | None:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = decode_token_cached(token)
+    except InvalidTokenError:
+        return None
+    if payload.get("type") != TokenType.ACCESS:
+        return None
+    user_id = payload.get("uid")
+    return user_id if isinstance(user_id, int) else None
+
+
+class IdempotencyMiddleware:
+    """Replays the stored response to retries of an authenticated mutating
+    request that carry the same ``Idempotency-Key`` header, without running
+    the handler again.
+
+    Reusing a key for a different request is a 422, and a retry that arrives
+    while the first request is still running is a 409. Server errors are not
+    stored, so the request can be retried with the same key.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: IdempotencyStore,
+        ttl: float = settings.idempotency.ttl_seconds,
+        lease: float = settings.idempotency.lease_seconds,
+        max_key_length: int = settings.idempotency.max_key_length,
+    ) -> None:
+        self.app = app
+        self.store = store
+        self.ttl = ttl
+        self.lease = lease
+        self.max_key_length = max_key_length
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        key = headers.get("idempotency-key")
+        user_id = access_token_user_id(headers) if key is not None else None
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not key or len(key) > self.max_key_length:
+            response = JSONResponse(
+                {"detail": f"Idempotency-Key must be 1-{self.max_key_length} chars"},
+                status_code=400,
+            )
+            await response(scope, receive, send)
+            return
+
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        fingerprint = request_fingerprint(
+            scope["method"], scope["path"], scope["query_string"], body
+        )
+        record = await self.store.reserve(user_id, key, fingerprint, self.lease)
+        if record is not None:
+            await self.reply(record, fingerprint, scope, receive, send)
+            return
+
+        body_sent = False
+
+        async def receive_body() -> Message:
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        status_code = 500
+        response_headers: list[tuple[str, str]] = []
+        response_body = []
+
+        async def send_and_capture(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers.extend(
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                )
+            elif message["type"] == "http.response.body":
+                response_body.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, send_and_capture)
+        except BaseException:
+            await self.store.release(user_id, key)
+            raise
+
+        if status_code >= 500:
+            await self.store.release(user_id, key)
+            return
+        await self.store.save(
+            user_id,
+            key,
+            StoredResponse(status_code, response_headers, b"".join(response_body)),
+            self.ttl,
+        )
+
+    async def reply(
+        self,
+        record: IdempotencyRecord,
+        fingerprint: str,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        if record.fingerprint != fingerprint:
+            response = JSONResponse(
+                {"detail": "Idempotency-Key was already used for another request"},
+                status_code=422,
+            )
+            await response(scope, receive, send)
+            return
+        if record.response is None:
+            response = JSONResponse(
+                {"detail": "A request with this Idempotency-Key is in progress"},
+                status_code=409,
+            )
+            await response(scope, receive, send)
+            return
+
+        stored = record.response
+        await send(
+            {
+                "type": "http.response.start",
+                "status": stored.status_code,
+                "headers": [
+                    (name.encode("latin-1"), value.encode("latin-1"))
+                    for name, value in stored.headers
+                ]
+                + [(b"idempotent-replayed", b"true")],
+            }
+        )
+        await send({"type": "http.response.body", "body": stored.body})
+
+
+def create_idempotency_store() -> IdempotencyStore:
+    if settings.idempotency.backend == "database":
+        return DatabaseIdempotencyStore(database_helper.session_factory)
+    return InMemoryIdempotencyStore(maxsize=settings.idempotency.store_size)
+
+
+idempotency_store: IdempotencyStore = create_idempotency_store()
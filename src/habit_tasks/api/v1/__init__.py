@@ -1,8 +1,14 @@
 from fastapi import APIRouter
 
-from . import auth, sync, tasks, users
+from . import auth, diagnostics, sync, tasks, users
 
 router = APIRouter(prefix="/v1")
 
-for subrouter in (auth.router, users.router, tasks.router, sync.router):
+for subrouter in (
+    auth.router,
+    users.router,
+    tasks.router,
+    sync.router,
+    diagnostics.router,
+):
     router.include_router(router=subrouter)
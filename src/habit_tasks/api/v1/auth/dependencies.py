@@ -1,13 +1,15 @@
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jwt.exceptions import InvalidTokenError
 from sqlalchemy import select
 
+from habit_tasks.config import settings
 from habit_tasks.database import AsyncDBSessionDep
 from habit_tasks.database.models import User
 from habit_tasks.database.models.user import UserRole
+from habit_tasks.schemas.user import UserPrincipal
 
 from . import utils
 from .exceptions import (
@@ -16,14 +18,20 @@ from .exceptions import (
     INVALID_TOKEN_TYPE_EXCEPTION,
     USER_NOT_FOUND_EXCEPTION,
 )
+from .password_hasher import password_hasher
+from .rate_limit import enforce_login_rate_limit
+from .user_cache import cache_user, get_cached_user
 
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
 async def validate_user(
+    request: Request,
     session: AsyncDBSessionDep,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 ) -> User:
+    await enforce_login_rate_limit(request, form_data.username)
+
     stmt = select(User).where(
         (User.username == form_data.username) | (User.email == form_data.username)
     )
@@ -32,9 +40,13 @@ async def validate_user(
     if not user:
         raise INVALID_CREDENTIALS_EXCEPTION
 
-    if not utils.validate_password(form_data.password, user.password_hash):
+    if not await password_hasher.verify(form_data.password, user.password_hash):
         raise INVALID_CREDENTIALS_EXCEPTION
 
+    if password_hasher.needs_rehash(user.password_hash):
+        user.password_hash = await password_hasher.hash(form_data.password)
+        await session.commit()
+
     return user
 
 
@@ -42,7 +54,7 @@ async def get_current_user_payload(
     token: Annotated[str, Depends(oauth2_bearer)],
 ) -> dict:
     try:
-        return utils.decode_token(token)
+        return utils.decode_token_cached(token)
     except InvalidTokenError:
         raise INVALID_TOKEN_EXCEPTION
 
@@ -60,12 +72,16 @@ async def get_auth_user_from_token(
     if not username:
         raise INVALID_TOKEN_EXCEPTION
 
+    if user := get_cached_user(username):
+        return user
+
     stmt = select(User).where(User.username == username)
     user = (await session.execute(stmt)).scalar_one_or_none()
 
     if not user:
         raise USER_NOT_FOUND_EXCEPTION
 
+    cache_user(user)
     return user
 
 
@@ -83,6 +99,29 @@ async def get_auth_user_from_refresh_token(
     return await get_auth_user_from_token(payload, session, utils.TokenType.REFRESH)
 
 
+async def get_current_principal(
+    payload: Annotated[dict, Depends(get_current_user_payload)],
+    session: AsyncDBSessionDep,
+) -> UserPrincipal:
+    if payload.get("type") != utils.TokenType.ACCESS:
+        raise INVALID_TOKEN_TYPE_EXCEPTION
+
+    if settings.auth.stateless_access_tokens:
+        try:
+            return UserPrincipal(
+                id=payload["uid"],
+                username=payload["sub"],
+                role=payload["role"],
+                timezone=payload["tz"],
+            )
+        except (KeyError, ValueError):
+            # Tokens issued before the claims were added fall back to the DB.
+            pass
+
+    user = await get_auth_user_from_token(payload, session, utils.TokenType.ACCESS)
+    return UserPrincipal.model_validate(user)
+
+
 async def get_current_admin_user(
     current_user: Annotated[User, Depends(get_auth_user_from_access_token)],
 ) -> User:
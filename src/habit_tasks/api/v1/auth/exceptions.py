@@ -1,3 +1,5 @@
+import math
+
 from fastapi import HTTPException, status
 
 INVALID_TOKEN_EXCEPTION = HTTPException(
@@ -21,3 +23,17 @@ TOKEN_EXPIRED_EXCEPTION = HTTPException(
 INVALID_TOKEN_TYPE_EXCEPTION = HTTPException(
     status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type"
 )
+
+PASSWORD_HASHER_BUSY_EXCEPTION = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Server is busy, try again later",
+    headers={"Retry-After": "1"},
+)
+
+
+def rate_limited_exception(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many requests",
+        headers={"Retry-After": str(math.ceil(retry_after))},
+    )
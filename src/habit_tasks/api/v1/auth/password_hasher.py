@@ -0,0 +1,74 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Literal
+
+from habit_tasks.config import settings
+
+from . import utils
+from .exceptions import PASSWORD_HASHER_BUSY_EXCEPTION
+
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop on a bounded worker pool.
+
+    Calls beyond ``max_pending`` (running plus queued) are rejected with 503
+    instead of piling up behind a login burst.
+    """
+
+    def __init__(
+        self,
+        rounds: int,
+        workers: int,
+        max_pending: int,
+        executor: Literal["thread", "process"] = "thread",
+    ) -> None:
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor_kind = executor
+        self.pending = 0
+        self._executor: Executor | None = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self.pending >= self.max_pending:
+            raise PASSWORD_HASHER_BUSY_EXCEPTION
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(utils.hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(utils.validate_password, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return utils.password_needs_rehash(hashed_password, self.rounds)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.auth.bcrypt_rounds,
+    workers=settings.auth.password_hash_workers,
+    max_pending=settings.auth.password_hash_max_pending,
+    executor=settings.auth.password_hash_executor,
+)
@@ -0,0 +1,62 @@
+from ipaddress import ip_address, ip_network
+
+from fastapi import Request
+
+from habit_tasks.config import RateLimitRule, settings
+from habit_tasks.utils import InMemoryRateLimitStore, RateLimitStore
+
+from .exceptions import rate_limited_exception
+
+rate_limit_store: RateLimitStore = InMemoryRateLimitStore(
+    maxsize=settings.rate_limit.store_size
+)
+
+
+def is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ip_address(host)
+    except ValueError:
+        return False
+    return any(
+        address in ip_network(proxy, strict=False)
+        for proxy in settings.rate_limit.trusted_proxies
+    )
+
+
+def client_ip(request: Request) -> str:
+    host = request.client.host if request.client else "unknown"
+    if not is_trusted_proxy(host):
+        return host
+
+    # Proxies append the address they received from, so walk back from the
+    # right to the first hop that is not one of ours; earlier entries are
+    # whatever the client chose to send.
+    forwarded = request.headers.get("x-forwarded-for", "")
+    for hop in reversed([hop.strip() for hop in forwarded.split(",") if hop.strip()]):
+        if not is_trusted_proxy(hop):
+            return hop
+    return host
+
+
+async def enforce_rate_limit(key: str, rule: RateLimitRule) -> None:
+    if not settings.rate_limit.enabled:
+        return
+
+    retry_after = await rate_limit_store.hit(key, rule.limit, rule.window_seconds)
+    if retry_after > 0:
+        raise rate_limited_exception(retry_after)
+
+
+async def enforce_login_rate_limit(request: Request, username: str) -> None:
+    await enforce_rate_limit(
+        f"login:ip:{client_ip(request)}", settings.rate_limit.login_per_ip
+    )
+    await enforce_rate_limit(
+        f"login:account:{username.lower()}", settings.rate_limit.login_per_account
+    )
+
+
+async def enforce_register_rate_limit(request: Request) -> None:
+    await enforce_rate_limit(
+        f"register:ip:{client_ip(request)}", settings.rate_limit.register_per_ip
+    )
@@ -2,14 +2,16 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends
 
-from habit_tasks.api.v1.users.dependencies import add_user
+from habit_tasks.api.v1.users.dependencies import add_user, update_user_in_db
+from habit_tasks.database import AsyncDBSessionDep
 from habit_tasks.database.models import User
 from habit_tasks.schemas.token import TokenInfo
-from habit_tasks.schemas.user import UserRead
+from habit_tasks.schemas.user import UserPrincipal, UserRead, UserUpdate
 
 from .dependencies import (
     get_auth_user_from_access_token,
     get_auth_user_from_refresh_token,
+    get_current_principal,
     validate_user,
 )
 from .utils import generate_token_info
@@ -41,3 +43,13 @@ async def get_me(
     user: Annotated[User, Depends(get_auth_user_from_access_token)],
 ):
     return user
+
+
+@router.patch("/users/me", response_model=UserRead)
+async def update_me(
+    principal: Annotated[UserPrincipal, Depends(get_current_principal)],
+    user_update: UserUpdate,
+    session: AsyncDBSessionDep,
+):
+    # Access tokens keep the old claims until they are refreshed.
+    return await update_user_in_db(session, principal.id, user_update)
@@ -0,0 +1,40 @@
+from typing import Any
+
+from sqlalchemy import event, inspect
+
+from habit_tasks.config import settings
+from habit_tasks.database.models import User
+from habit_tasks.utils import TTLCache
+
+user_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+    maxsize=settings.auth.user_cache_size,
+    ttl=settings.auth.user_cache_ttl_seconds,
+)
+
+
+def get_cached_user(username: str) -> User | None:
+    # Every hit gets its own transient copy, so a cached row is never shared
+    # between sessions or mutated by a request.
+    snapshot = user_cache.get(username)
+    if snapshot is None:
+        return None
+    return User(**snapshot)
+
+
+def cache_user(user: User) -> None:
+    user_cache.set(
+        user.username,
+        {attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs},
+    )
+
+
+def invalidate_user(username: str) -> None:
+    user_cache.pop(username)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_changed_user(mapper, connection, target: User) -> None:
+    invalidate_user(target.username)
+    for old_username in inspect(target).attrs.username.history.deleted:
+        invalidate_user(old_username)
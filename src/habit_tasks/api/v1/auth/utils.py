@@ -1,13 +1,23 @@
+import hashlib
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
 from enum import Enum
+from functools import lru_cache
+from typing import Any
 
 import bcrypt
 import jwt
+from jwt.algorithms import get_default_algorithms
 
 from habit_tasks.config import settings
 from habit_tasks.database.models import User
 from habit_tasks.schemas.token import TokenInfo
+from habit_tasks.utils import TTLCache
+
+verified_token_cache: TTLCache[bytes, dict] = TTLCache(
+    maxsize=settings.auth.verified_token_cache_size
+)
 
 
 class TokenType(str, Enum):
@@ -15,9 +25,9 @@ class TokenType(str, Enum):
     REFRESH = "refresh"
 
 
-def hash_password(password: str) -> str:
+def hash_password(password: str, rounds: int = settings.auth.bcrypt_rounds) -> str:
     pwd_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds)
     hashed_password = bcrypt.hashpw(pwd_bytes, salt)
     return hashed_password.decode("utf-8")
 
@@ -29,6 +39,16 @@ def validate_password(password: str, hashed_password: str) -> bool:
     )
 
 
+def password_needs_rehash(
+    hashed_password: str, rounds: int = settings.auth.bcrypt_rounds
+) -> bool:
+    # bcrypt hashes look like $2b$<cost>$<salt+digest>
+    try:
+        return int(hashed_password.split("$")[2]) != rounds
+    except (IndexError, ValueError):
+        return True
+
+
 def encode_token(
     payload: dict,
     private_key: str = settings.auth.secret_key_path,
@@ -43,7 +63,9 @@ def encode_token(
 
     to_encode.update(iat=now, jti=str(uuid.uuid4()))
 
-    return jwt.encode(to_encode, private_key, algorithm=algorithm)
+    return jwt.encode(
+        to_encode, prepare_key(private_key, algorithm), algorithm=algorithm
+    )
 
 
 def decode_token(
@@ -51,7 +73,27 @@ def decode_token(
     public_key: str = settings.auth.public_key_path,
     algorithm: str = settings.auth.algorithm,
 ) -> dict:
-    return jwt.decode(token, public_key, algorithms=[algorithm])
+    return jwt.decode(token, prepare_key(public_key, algorithm), algorithms=[algorithm])
+
+
+@lru_cache(maxsize=8)
+def prepare_key(key: str, algorithm: str) -> Any:
+    # PyJWT parses PEM keys on every call unless given a prepared key object.
+    return get_default_algorithms()[algorithm].prepare_key(key)
+
+
+def decode_token_cached(token: str) -> dict:
+    """Like decode_token, but skips signature verification for tokens that were
+    already verified and have not expired yet."""
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    if (payload := verified_token_cache.get(key)) is not None:
+        return payload.copy()
+
+    payload = decode_token(token)
+    ttl = payload.get("exp", 0) - time.time()
+    if ttl > 0:
+        verified_token_cache.set(key, payload, ttl=ttl)
+    return payload.copy()
 
 
 def generate_token_info(user: User) -> TokenInfo:
@@ -60,6 +102,9 @@ def generate_token_info(user: User) -> TokenInfo:
     # Access Token
     access_payload = {
         "sub": user.username,
+        "uid": user.id,
+        "role": user.role,
+        "tz": user.timezone,
         "email": user.email,
         "type": TokenType.ACCESS,
         "exp": now + timedelta(minutes=settings.auth.access_token_expire_minutes),
@@ -0,0 +1,22 @@
+from collections.abc import Mapping
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from habit_tasks.api.v1.auth.dependencies import get_current_admin_user
+from habit_tasks.api.v1.auth.user_cache import user_cache
+from habit_tasks.database import database_helper
+from habit_tasks.database.models.user import User
+
+router = APIRouter(prefix="/diagnostics", tags=["Diagnostics"])
+
+
+@router.get("/")
+async def get_diagnostics(
+    admin: Annotated[User, Depends(get_current_admin_user)],
+) -> dict[str, Mapping[str, float]]:
+    """In-process counters of this worker."""
+    return {
+        "user_cache": user_cache.stats(),
+        "database_pool": database_helper.pool_stats(),
+    }
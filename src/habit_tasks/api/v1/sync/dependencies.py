@@ -1,50 +1,422 @@
-from sqlalchemy import select
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, TypeVar
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import ColumnElement, and_, insert, or_, select, true
 from sqlalchemy.exc import IntegrityError
 
+from habit_tasks.api.v1.tasks.aggregates import record_completions
+from habit_tasks.api.v1.tasks.completion_cache import completed_today_store
+from habit_tasks.api.v1.tasks.log_bitmaps import (
+    bitmap_writes_enabled,
+    set_completion_bits,
+)
+from habit_tasks.api.v1.tasks.reminders import replace_task_reminders
+from habit_tasks.config import settings
 from habit_tasks.database import AsyncDBSessionDep
-from habit_tasks.database.models import Task, TaskLog, User
-from habit_tasks.schemas.sync import SyncPayload, SyncResponse
+from habit_tasks.database.dialect import dialect_insert
+from habit_tasks.database.models import Task, TaskLog, Tombstone
+from habit_tasks.schemas.sync import (
+    SyncChangesResponse,
+    SyncDeletion,
+    SyncItemStatus,
+    SyncLogChange,
+    SyncLogResult,
+    SyncPayload,
+    SyncResponse,
+    SyncTaskChange,
+    SyncTaskCreate,
+    SyncTaskResult,
+    TaskLogSync,
+)
+from habit_tasks.schemas.user import UserPrincipal
+from habit_tasks.utils import decode_cursor, encode_cursor
+
+# A failed bulk insert is retried once after re-checking ownership, which
+# covers tasks deleted by a concurrent request between the check and the write.
+LOG_INSERT_ATTEMPTS = 2
+
+# Changes are ordered by (timestamp, kind, id); the kind breaks ties so that a
+# task is always delivered before logs written in the same instant.
+CHANGE_KIND_TASK = 0
+CHANGE_KIND_LOG = 1
+CHANGE_KIND_DELETION = 2
+
+INVALID_CURSOR_EXCEPTION = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+)
+
+Item = TypeVar("Item", bound=BaseModel)
+
+
+def validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        ".".join(str(part) for part in e["loc"]) + f": {e['msg']}"
+        if e["loc"]
+        else e["msg"]
+        for e in error.errors()
+    )
+
+
+def parse_sync_items(
+    model: type[Item], items: list[dict[str, Any]]
+) -> list[Item | str]:
+    """Validate each item on its own; an invalid one becomes its error
+    message, reported with status INVALID."""
+    parsed: list[Item | str] = []
+    for item in items:
+        try:
+            parsed.append(model.model_validate(item))
+        except ValidationError as error:
+            parsed.append(validation_detail(error))
+    return parsed
+
+
+async def get_owned_task_ids(
+    session: AsyncDBSessionDep,
+    user: UserPrincipal,
+    task_ids: set[int],
+) -> set[int]:
+    if not task_ids:
+        return set()
+
+    stmt = select(Task.id).where(Task.user_id == user.id, Task.id.in_(task_ids))
+    return set((await session.scalars(stmt)).all())
+
+
+async def insert_logs_ignoring_duplicates(
+    session: AsyncDBSessionDep,
+    rows: list[dict],
+) -> set[tuple[int, date]]:
+    if not rows:
+        return set()
+
+    stmt = (
+        dialect_insert(session, TaskLog)
+        .on_conflict_do_nothing(index_elements=["task_id", "date"])
+        .returning(TaskLog.task_id, TaskLog.date)
+    )
+    result = await session.execute(stmt, rows)
+    return {(task_id, log_date) for task_id, log_date in result}
+
+
+async def sync_created_tasks(
+    session: AsyncDBSessionDep,
+    user: UserPrincipal,
+    tasks_in: list[SyncTaskCreate | str],
+) -> list[SyncTaskResult]:
+    results: list[SyncTaskResult] = []
+    accepted: list[SyncTaskResult] = []
+    rows: list[dict] = []
+    client_ids: set[str] = set()
+
+    for index, task_in in enumerate(tasks_in):
+        if isinstance(task_in, str):
+            results.append(
+                SyncTaskResult(
+                    index=index, status=SyncItemStatus.INVALID, detail=task_in
+                )
+            )
+            continue
+
+        if task_in.client_id is not None and task_in.client_id in client_ids:
+            results.append(
+                SyncTaskResult(
+                    index=index,
+                    client_id=task_in.client_id,
+                    status=SyncItemStatus.INVALID,
+                    detail="Duplicate client_id in payload",
+                )
+            )
+            continue
+
+        if task_in.client_id is not None:
+            client_ids.add(task_in.client_id)
+
+        result = SyncTaskResult(
+            index=index, client_id=task_in.client_id, status=SyncItemStatus.CREATED
+        )
+        results.append(result)
+        accepted.append(result)
+        rows.append({**task_in.model_dump(exclude={"client_id"}), "user_id": user.id})
+
+    if rows:
+        stmt = insert(Task).returning(Task.id, sort_by_parameter_order=True)
+        task_ids = (await session.execute(stmt, rows)).scalars().all()
+        for result, task_id in zip(accepted, task_ids):
+            result.id = task_id
+
+        await replace_task_reminders(
+            session,
+            user.id,
+            user.timezone,
+            {
+                task_id: row["reminders"]
+                for task_id, row in zip(task_ids, rows)
+                if row["reminders"]
+            },
+        )
+
+    return results
+
+
+def resolve_log_task_id(
+    log_in: TaskLogSync | str,
+    task_ids: dict[str, int],
+) -> int | str:
+    if isinstance(log_in, str):
+        return log_in
+    if (log_in.task_id is None) == (log_in.task_client_id is None):
+        return "Exactly one of task_id or task_client_id is required"
+
+    if log_in.task_id is not None:
+        return log_in.task_id
+
+    client_id = log_in.task_client_id
+    if client_id is None or client_id not in task_ids:
+        return "Unknown task_client_id"
+    return task_ids[client_id]
+
+
+async def sync_new_logs(
+    session: AsyncDBSessionDep,
+    user: UserPrincipal,
+    logs_in: list[TaskLogSync | str],
+    task_ids: dict[str, int],
+) -> list[SyncLogResult]:
+    resolved = [resolve_log_task_id(log_in, task_ids) for log_in in logs_in]
+
+    owned_ids = set(task_ids.values()) | await get_owned_task_ids(
+        session,
+        user,
+        {
+            task_id
+            for task_id, log_in in zip(resolved, logs_in)
+            if isinstance(task_id, int)
+            and isinstance(log_in, TaskLogSync)
+            and log_in.task_client_id is None
+        },
+    )
+
+    rows: list[dict] = []
+    seen: set[tuple[int, date]] = set()
+    for task_id, log_in in zip(resolved, logs_in):
+        if (
+            isinstance(task_id, int)
+            and isinstance(log_in, TaskLogSync)
+            and task_id in owned_ids
+        ):
+            key = (task_id, log_in.date)
+            if key not in seen:
+                seen.add(key)
+                rows.append(
+                    {"task_id": task_id, "date": log_in.date, "status": log_in.status}
+                )
+
+    inserted: set[tuple[int, date]] | None = None
+    for _ in range(LOG_INSERT_ATTEMPTS):
+        try:
+            async with session.begin_nested():
+                inserted = await insert_logs_ignoring_duplicates(session, rows)
+            break
+        except IntegrityError:
+            owned_ids = await get_owned_task_ids(
+                session, user, {row["task_id"] for row in rows}
+            )
+            rows = [row for row in rows if row["task_id"] in owned_ids]
+
+    if inserted:
+        completed: dict[int, list[date]] = {}
+        for row in rows:
+            if row["status"] and (row["task_id"], row["date"]) in inserted:
+                completed.setdefault(row["task_id"], []).append(row["date"])
+        await record_completions(session, completed)
+        if bitmap_writes_enabled():
+            await set_completion_bits(session, completed)
+
+    results: list[SyncLogResult] = []
+    reported: set[tuple[int, date | None]] = set()
+    for index, (task_id, log_in) in enumerate(zip(resolved, logs_in)):
+        detail = None
+        log_date = None if isinstance(log_in, str) else log_in.date
+        if isinstance(task_id, str):
+            item_status, detail, task_id = SyncItemStatus.INVALID, task_id, None
+        elif task_id not in owned_ids:
+            item_status = SyncItemStatus.REJECTED_NOT_OWNED
+        elif inserted is None:
+            item_status, detail = SyncItemStatus.INVALID, "Log could not be stored"
+        elif (key := (task_id, log_date)) in inserted and key not in reported:
+            item_status = SyncItemStatus.CREATED
+            reported.add(key)
+        else:
+            item_status = SyncItemStatus.DUPLICATE
+
+        results.append(
+            SyncLogResult(
+                index=index,
+                task_id=task_id,
+                date=log_date,
+                status=item_status,
+                detail=detail,
+            )
+        )
+
+    return results
 
 
 async def sync_data_logic(
     session: AsyncDBSessionDep,
-    user: User,
+    user: UserPrincipal,
     payload: SyncPayload,
 ) -> SyncResponse:
-    tasks_count = 0
-    logs_count = 0
+    tasks_in = parse_sync_items(SyncTaskCreate, payload.created_tasks)
+    logs_in = parse_sync_items(TaskLogSync, payload.new_logs)
 
-    for task_in in payload.created_tasks:
-        new_task = Task(**task_in.model_dump(), user_id=user.id)
-        session.add(new_task)
-        tasks_count += 1
+    task_results = await sync_created_tasks(session, user, tasks_in)
+    task_ids = {
+        result.client_id: result.id
+        for result in task_results
+        if result.client_id is not None and result.id is not None
+    }
 
-    await session.flush()
+    log_results = await sync_new_logs(session, user, logs_in, task_ids)
 
-    for log_in in payload.new_logs:
-        stmt_task = select(Task).where(
-            Task.id == log_in.task_id, Task.user_id == user.id
-        )
-        task = await session.scalar(stmt_task)
+    await session.commit()
 
-        if not task:
-            continue
+    for result, log_in in zip(log_results, logs_in):
+        if (
+            result.status == SyncItemStatus.CREATED
+            and result.task_id is not None
+            and isinstance(log_in, TaskLogSync)
+            and log_in.status
+        ):
+            await completed_today_store.add(user.id, log_in.date, result.task_id)
 
-        stmt_log = select(TaskLog).where(
-            TaskLog.task_id == log_in.task_id, TaskLog.date == log_in.date
+    accepted = {SyncItemStatus.CREATED, SyncItemStatus.DUPLICATE}
+    all_accepted = all(
+        result.status in accepted for result in (*task_results, *log_results)
+    )
+
+    return SyncResponse(
+        processed_tasks=sum(r.status == SyncItemStatus.CREATED for r in task_results),
+        processed_logs=sum(r.status == SyncItemStatus.CREATED for r in log_results),
+        tasks=task_results,
+        logs=log_results,
+        task_ids=task_ids,
+        status="ok" if all_accepted else "partial",
+    )
+
+
+def parse_changes_cursor(cursor: str) -> tuple[datetime, int, int]:
+    try:
+        timestamp, kind, row_id = decode_cursor(cursor)
+        return datetime.fromisoformat(timestamp), int(kind), int(row_id)
+    except (TypeError, ValueError):
+        raise INVALID_CURSOR_EXCEPTION
+
+
+def after_cursor(
+    timestamp_column: Any,
+    id_column: Any,
+    kind: int,
+    cursor: tuple[datetime, int, int] | None,
+) -> ColumnElement[bool]:
+    if cursor is None:
+        return true()
+
+    timestamp, cursor_kind, cursor_id = cursor
+    if kind > cursor_kind:
+        return timestamp_column >= timestamp
+    if kind < cursor_kind:
+        return timestamp_column > timestamp
+    return or_(
+        timestamp_column > timestamp,
+        and_(timestamp_column == timestamp, id_column > cursor_id),
+    )
+
+
+async def get_changes_logic(
+    session: AsyncDBSessionDep,
+    user: UserPrincipal,
+    since: str | None,
+    limit: int,
+) -> SyncChangesResponse:
+    cursor = parse_changes_cursor(since) if since else None
+    # Rows newer than this may still have uncommitted predecessors; they are
+    # returned by a later pull instead (see SyncSettings).
+    settled = datetime.now(timezone.utc) - timedelta(
+        seconds=settings.sync.changes_settle_seconds
+    )
+
+    tasks_stmt = (
+        select(Task)
+        .where(
+            Task.user_id == user.id,
+            Task.updated_at <= settled,
+            after_cursor(Task.updated_at, Task.id, CHANGE_KIND_TASK, cursor),
+        )
+        .order_by(Task.updated_at, Task.id)
+        .limit(limit + 1)
+    )
+    # Filtering on the user's task ids keeps this on the per-task
+    # (task_id, updated_at) index rather than every user's log changes.
+    user_task_ids = select(Task.id).where(Task.user_id == user.id)
+    logs_stmt = (
+        select(TaskLog)
+        .where(
+            TaskLog.task_id.in_(user_task_ids),
+            TaskLog.updated_at <= settled,
+            after_cursor(TaskLog.updated_at, TaskLog.id, CHANGE_KIND_LOG, cursor),
+        )
+        .order_by(TaskLog.updated_at, TaskLog.id)
+        .limit(limit + 1)
+    )
+    deletions_stmt = (
+        select(Tombstone)
+        .where(
+            Tombstone.user_id == user.id,
+            Tombstone.deleted_at <= settled,
+            after_cursor(
+                Tombstone.deleted_at, Tombstone.id, CHANGE_KIND_DELETION, cursor
+            ),
         )
-        existing_log = await session.scalar(stmt_log)
+        .order_by(Tombstone.deleted_at, Tombstone.id)
+        .limit(limit + 1)
+    )
 
-        if not existing_log:
-            new_log = TaskLog(
-                task_id=log_in.task_id, date=log_in.date, status=log_in.status
+    changes: list[tuple[datetime, int, int, Any]] = []
+    for task in await session.scalars(tasks_stmt):
+        changes.append((task.updated_at, CHANGE_KIND_TASK, task.id, task))
+    for log in await session.scalars(logs_stmt):
+        changes.append((log.updated_at, CHANGE_KIND_LOG, log.id, log))
+    for tombstone in await session.scalars(deletions_stmt):
+        changes.append(
+            (tombstone.deleted_at, CHANGE_KIND_DELETION, tombstone.id, tombstone)
+        )
+
+    changes.sort(key=lambda change: change[:3])
+    page = changes[:limit]
+
+    response = SyncChangesResponse(cursor=since, has_more=len(changes) > limit)
+    for _, kind, _, row in page:
+        if kind == CHANGE_KIND_TASK:
+            response.tasks.append(SyncTaskChange.model_validate(row))
+        elif kind == CHANGE_KIND_LOG:
+            response.logs.append(SyncLogChange.model_validate(row))
+        else:
+            response.deleted.append(
+                SyncDeletion(
+                    entity=row.entity,
+                    id=row.entity_id,
+                    task_id=row.task_id,
+                    date=row.date,
+                    deleted_at=row.deleted_at,
+                )
             )
-            session.add(new_log)
-            logs_count += 1
 
-    try:
-        await session.commit()
-    except IntegrityError:
-        await session.rollback()
+    if page:
+        timestamp, kind, row_id, _ = page[-1]
+        response.cursor = encode_cursor([timestamp.isoformat(), kind, row_id])
 
-    return SyncResponse(processed_tasks=tasks_count, processed_logs=logs_count)
+    return response
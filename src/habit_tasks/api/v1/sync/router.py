@@ -1,17 +1,17 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
-from habit_tasks.api.v1.auth.dependencies import get_auth_user_from_access_token
+from habit_tasks.api.v1.auth.dependencies import get_current_principal
 from habit_tasks.database import AsyncDBSessionDep
-from habit_tasks.database.models import User
-from habit_tasks.schemas.sync import SyncPayload, SyncResponse
+from habit_tasks.schemas.sync import SyncChangesResponse, SyncPayload, SyncResponse
+from habit_tasks.schemas.user import UserPrincipal
 
-from .dependencies import sync_data_logic
+from .dependencies import get_changes_logic, sync_data_logic
 
 router = APIRouter(prefix="/sync", tags=["Synchronization"])
 
-CurrentUser = Annotated[User, Depends(get_auth_user_from_access_token)]
+CurrentUser = Annotated[UserPrincipal, Depends(get_current_principal)]
 
 
 @router.post("/", response_model=SyncResponse)
@@ -21,3 +21,15 @@ async def sync_data(
     user: CurrentUser,
 ):
     return await sync_data_logic(session, user, payload)
+
+
+@router.get("/changes", response_model=SyncChangesResponse)
+async def get_changes(
+    session: AsyncDBSessionDep,
+    user: CurrentUser,
+    since: Annotated[
+        str | None, Query(description="Cursor returned by the previous pull")
+    ] = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 500,
+):
+    return await get_changes_logic(session, user, since, limit)
@@ -0,0 +1,112 @@
+from collections.abc import Collection, Iterable, Mapping
+from datetime import date, timedelta
+
+from sqlalchemy import select
+
+from habit_tasks.database import AsyncDBSessionDep
+from habit_tasks.database.dialect import dialect_insert
+from habit_tasks.database.models import TaskAggregate
+
+from .stats import Streaks, load_streaks
+
+
+def can_append(aggregate: TaskAggregate, days: list[date]) -> bool:
+    return aggregate.last_completed is None or days[0] > aggregate.last_completed
+
+
+def append_completions(aggregate: TaskAggregate, days: list[date]) -> None:
+    for day in days:
+        if (
+            aggregate.last_completed is not None
+            and day == aggregate.last_completed + timedelta(days=1)
+        ):
+            aggregate.current_streak += 1
+        else:
+            aggregate.current_streak = 1
+        aggregate.total_completions += 1
+        aggregate.longest_streak = max(
+            aggregate.longest_streak, aggregate.current_streak
+        )
+        aggregate.last_completed = day
+
+
+def can_remove(aggregate: TaskAggregate, day: date) -> bool:
+    # Dropping the newest day of a streak that is not the record shortens it
+    # by one; anything else needs the history to find the new values.
+    return (
+        day == aggregate.last_completed
+        and 1 < aggregate.current_streak < aggregate.longest_streak
+    )
+
+
+def remove_completion(aggregate: TaskAggregate, day: date) -> None:
+    aggregate.total_completions -= 1
+    aggregate.current_streak -= 1
+    aggregate.last_completed = day - timedelta(days=1)
+
+
+async def load_aggregates(
+    session: AsyncDBSessionDep,
+    task_ids: Collection[int],
+) -> dict[int, TaskAggregate]:
+    # Row locks serialize concurrent updates of the same task on PostgreSQL.
+    stmt = (
+        select(TaskAggregate)
+        .where(TaskAggregate.task_id.in_(task_ids))
+        .with_for_update()
+    )
+    return {aggregate.task_id: aggregate for aggregate in await session.scalars(stmt)}
+
+
+async def recompute_aggregates(
+    session: AsyncDBSessionDep,
+    task_ids: Collection[int],
+) -> None:
+    if not task_ids:
+        return
+
+    streaks = await load_streaks(session, task_ids)
+    rows = [
+        {"task_id": task_id, **streaks.get(task_id, Streaks())._asdict()}
+        for task_id in task_ids
+    ]
+    stmt = dialect_insert(session, TaskAggregate)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TaskAggregate.task_id],
+        set_={column: stmt.excluded[column] for column in Streaks._fields},
+    )
+    await session.execute(stmt, rows)
+
+
+async def record_completions(
+    session: AsyncDBSessionDep,
+    dates_by_task: Mapping[int, Iterable[date]],
+) -> None:
+    """Fold newly stored completions into the tasks' aggregates. Must run in
+    the transaction that stored them, after they were flushed."""
+    if not dates_by_task:
+        return
+
+    aggregates = await load_aggregates(session, dates_by_task.keys())
+    stale = []
+    for task_id, days in dates_by_task.items():
+        days = sorted(days)
+        aggregate = aggregates.get(task_id)
+        if aggregate is not None and can_append(aggregate, days):
+            append_completions(aggregate, days)
+        else:
+            stale.append(task_id)
+
+    await recompute_aggregates(session, stale)
+
+
+async def record_removed_completion(
+    session: AsyncDBSessionDep,
+    task_id: int,
+    day: date,
+) -> None:
+    aggregate = (await load_aggregates(session, [task_id])).get(task_id)
+    if aggregate is not None and can_remove(aggregate, day):
+        remove_completion(aggregate, day)
+    else:
+        await recompute_aggregates(session, [task_id])
@@ -0,0 +1,252 @@
+from collections.abc import Sequence
+from datetime import datetime, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from habit_tasks.database import AsyncDBSessionDep
+from habit_tasks.database.dialect import dialect_insert
+from habit_tasks.database.models import SyncEntity, Task, TaskLog, Tombstone
+from habit_tasks.schemas.task import TaskLogResponse, TaskResponse
+from habit_tasks.schemas.task_batch import (
+    BatchItemStatus,
+    TaskBatchCreate,
+    TaskBatchIds,
+    TaskBatchResponse,
+    TaskBatchResult,
+    TaskBatchUpdate,
+)
+from habit_tasks.schemas.user import UserPrincipal
+
+from .aggregates import record_completions
+from .completion_cache import completed_today_store, get_completed_today
+from .dependencies import to_task_response
+from .log_bitmaps import bitmap_writes_enabled, set_completion_bits
+from .reminders import replace_task_reminders
+
+
+def batch_response(results: list[TaskBatchResult]) -> TaskBatchResponse:
+    all_ok = all(result.status == BatchItemStatus.OK for result in results)
+    return TaskBatchResponse(results=results, status="ok" if all_ok else "partial")
+
+
+def split_duplicates(
+    ids: Sequence[int],
+) -> tuple[list[int], dict[int, TaskBatchResult]]:
+    """Return the distinct ids in order, plus INVALID results for repeats
+    keyed by their index."""
+    unique: list[int] = []
+    duplicates: dict[int, TaskBatchResult] = {}
+    seen: set[int] = set()
+    for index, task_id in enumerate(ids):
+        if task_id in seen:
+            duplicates[index] = TaskBatchResult(
+                index=index,
+                id=task_id,
+                status=BatchItemStatus.INVALID,
+                detail="Duplicate id in batch",
+            )
+        else:
+            seen.add(task_id)
+            unique.append(task_id)
+    return unique, duplicates
+
+
+async def batch_create_tasks(
+    session: AsyncDBSessionDep,
+    user: UserPrincipal,
+    batch: TaskBatchCreate,
+) -> TaskBatchResponse:
+    rows = [{**task_in.model_dump(), "user_id": user.id} for task_in in batch.tasks]
+    stmt = insert(Task).returning(Task, sort_by_parameter_order=True)
+    tasks = (await session.scalars(stmt, rows)).all()
+
+    await replace_task_reminders(
+        session,
+        user.id,
+        user.timezone,
+        {task.id: task.reminders for task in tasks if task.reminders},
+    )
+    await session.commit()
+
+    return batch_response(
+        [
+            TaskBatchResult(
+                index=index,
+                id=task.id,
+                status=BatchItemStatus.OK,
+                task=TaskResponse.model_validate(task),
+            )
+            for index, task in enumerate(tasks)
+        ]
+    )
+
+
+async def batch_update_tasks(
+    session: AsyncDBSessionDep,
+    user: UserPrincipal,
+    batch: TaskBatchUpdate,
+) -> TaskBatchResponse:
+    unique, duplicates = split_duplicates([item.id for item in batch.tasks])
+
+    stmt = select(Task).where(Task.user_id == user.id, Task.id.in_(unique))
+    tasks = {task.id: task for task in await session.scalars(stmt)}
+
+    # Changed rows are flushed as one executemany UPDATE per set of columns.
+    updated: dict[int, Task] = {}
+    reminders_by_task: dict[int, list[str] | None] = {}
+    for index, item in enumerate(batch.tasks):
+        task = tasks.get(item.id)
+        if index in duplicates or task is None:
+            continue
+
+        update_data = item.model_dump(exclude_unset=True, exclude={"id"})
+        for key, value in update_data.items():
+            setattr(task, key, value)
+        if "reminders" in update_data:
+            reminders_by_task[task.id] = task.reminders
+        updated[index] = task
+
+    await replace_task_reminders(session, user.id, user.timezone, reminders_by_task)
+    await session.commit()
+
+    completed_today = await get_completed_today(session, user, user.today())
+    results = []
+    for index, item in enumerate(batch.tasks):
+        if index in duplicates:
+            results.append(duplicates[index])
+        elif index in updated:
+            results.append(
+                TaskBatchResult(
+                    index=index,
+                    id=item.id,
+                    status=BatchItemStatus.OK,
+                    task=to_task_response(updated[index], completed_today),
+                )
+            )
+        else:
+            results.append(
+                TaskBatchResult(
+                    index=index, id=item.id, status=BatchItemStatus.NOT_FOUND
+                )
+            )
+    return batch_response(results)
+
+
+async def batch_delete_tasks(
+    session: AsyncDBSessionDep,
+    user: UserPrincipal,
+    batch: TaskBatchIds,
+) -> TaskBatchResponse:
+    unique, duplicates = split_duplicates(batch.ids)
+
+    stmt = (
+        delete(Task)
+        .where(Task.user_id == user.id, Task.id.in_(unique))
+        .returning(Task.id)
+    )
+    deleted = set(await session.scalars(stmt))
+    if deleted:
+        await session.execute(
+            insert(Tombstone),
+            [
+                {"user_id": user.id, "entity": SyncEntity.TASK, "entity_id": task_id}
+                for task_id in deleted
+            ],
+        )
+    await session.commit()
+
+    return batch_response(
+        [
+            duplicates.get(index)
+            or TaskBatchResult(
+                index=index,
+                id=task_id,
+                status=(
+                    BatchItemStatus.OK
+                    if task_id in deleted
+                    else BatchItemStatus.NOT_FOUND
+                ),
+            )
+            for index, task_id in enumerate(batch.ids)
+        ]
+    )
+
+
+async def batch_complete_tasks(
+    session: AsyncDBSessionDep,
+    user: UserPrincipal,
+    batch: TaskBatchIds,
+) -> TaskBatchResponse:
+    unique, duplicates = split_duplicates(batch.ids)
+    today = user.today()
+
+    stmt = select(Task.id).where(Task.user_id == user.id, Task.id.in_(unique))
+    owned = set(await session.scalars(stmt))
+
+    logs: dict[int, TaskLogResponse] = {}
+    rows = [
+        {"task_id": task_id, "date": today, "status": True}
+        for task_id in unique
+        if task_id in owned
+    ]
+    if rows:
+        # Existing logs with status false are completed, true ones are kept.
+        stmt = (
+            dialect_insert(session, TaskLog)
+            .on_conflict_do_update(
+                index_elements=["task_id", "date"],
+                set_={"status": True, "updated_at": datetime.now(timezone.utc)},
+                where=TaskLog.status.is_(False),
+            )
+            .returning(TaskLog.id, TaskLog.task_id, TaskLog.date, TaskLog.status)
+        )
+        try:
+            result = await session.execute(stmt, rows)
+            logs = {
+                row.task_id: TaskLogResponse.model_validate(row._asdict())
+                for row in result
+            }
+            completed = {task_id: [today] for task_id in logs}
+            await record_completions(session, completed)
+            if bitmap_writes_enabled():
+                await set_completion_bits(session, completed)
+            await session.commit()
+        except IntegrityError:
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail="Could not complete tasks"
+            )
+
+        for task_id in logs:
+            await completed_today_store.add(user.id, today, task_id)
+
+    results = []
+    for index, task_id in enumerate(batch.ids):
+        if index in duplicates:
+            results.append(duplicates[index])
+        elif task_id in logs:
+            results.append(
+                TaskBatchResult(
+                    index=index,
+                    id=task_id,
+                    status=BatchItemStatus.OK,
+                    log=logs[task_id],
+                )
+            )
+        elif task_id in owned:
+            results.append(
+                TaskBatchResult(
+                    index=index,
+                    id=task_id,
+                    status=BatchItemStatus.ALREADY_COMPLETED,
+                )
+            )
+        else:
+            results.append(
+                TaskBatchResult(
+                    index=index, id=task_id, status=BatchItemStatus.NOT_FOUND
+                )
+            )
+    return batch_response(results)
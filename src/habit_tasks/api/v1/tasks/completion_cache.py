@@ -0,0 +1,42 @@
+from datetime import date
+
+from sqlalchemy import select
+
+from habit_tasks.config import settings
+from habit_tasks.database import AsyncDBSessionDep
+from habit_tasks.database.models import Task, TaskLog
+from habit_tasks.schemas.user import UserPrincipal
+from habit_tasks.utils import CompletedTodayStore, InMemoryCompletedTodayStore
+
+completed_today_store: CompletedTodayStore = InMemoryCompletedTodayStore(
+    maxsize=settings.task_logs.completed_today_cache_size,
+    ttl=settings.task_logs.completed_today_cache_ttl_seconds,
+)
+
+
+async def get_completed_today(
+    session: AsyncDBSessionDep,
+    user: UserPrincipal,
+    today: date,
+) -> set[int]:
+    """Pass the primary session: a lagging replica could hide a completion
+    made just before, and the set is cached."""
+    completed = await completed_today_store.get(user.id, today)
+    if completed is not None:
+        return completed
+
+    # A complete or undo that lands while this runs makes the result stale.
+    generation = await completed_today_store.generation(user.id)
+
+    stmt = (
+        select(TaskLog.task_id)
+        .join(Task, Task.id == TaskLog.task_id)
+        .where(
+            Task.user_id == user.id,
+            TaskLog.date == today,
+            TaskLog.status.is_(True),
+        )
+    )
+    completed = set(await session.scalars(stmt))
+    await completed_today_store.set(user.id, today, completed, generation)
+    return completed
@@ -1,42 +1,135 @@
-from collections.abc import Sequence
-from datetime import date
+import base64
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime, timedelta, timezone
+from typing import Literal
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import (
+    Select,
+    and_,
+    delete,
+    insert,
+    literal,
+    or_,
+    select,
+    true,
+    update,
+)
 
 from habit_tasks.database import AsyncDBSessionDep
-from habit_tasks.database.models import Task, TaskLog, User
-from habit_tasks.schemas.task import TaskCreate, TaskResponse, TaskUpdate
+from habit_tasks.database.dialect import dialect_insert
+from habit_tasks.database.models import (
+    SyncEntity,
+    Task,
+    TaskLog,
+    TaskLogBitmap,
+    Tombstone,
+)
+from habit_tasks.schemas.task import (
+    CompletionHistoryResponse,
+    TaskCompletionHistory,
+    TaskCreate,
+    TaskLogResponse,
+    TaskResponse,
+    TaskUpdate,
+)
+from habit_tasks.schemas.user import UserPrincipal
+from habit_tasks.utils import decode_cursor, encode_cursor, encode_day_bitmap
+
+from .aggregates import record_completions, record_removed_completion
+from .completion_cache import completed_today_store
+from .log_bitmaps import (
+    bitmap_reads_enabled,
+    bitmap_writes_enabled,
+    bitmaps_stmt,
+    clear_completion_bit,
+    load_completed_dates,
+    set_completion_bits,
+)
+from .reminders import replace_task_reminders
+
+MAX_HISTORY_RANGE_DAYS = 366
+
+
+def parse_tasks_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, task_id = decode_cursor(cursor)
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def user_tasks_stmt(user: UserPrincipal, cursor: str | None = None) -> Select:
+    stmt = (
+        select(Task).where(Task.user_id == user.id).order_by(Task.created_at, Task.id)
+    )
+
+    if cursor:
+        created_at, task_id = parse_tasks_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                Task.created_at > created_at,
+                and_(Task.created_at == created_at, Task.id > task_id),
+            )
+        )
+
+    return stmt
+
+
+def to_task_response(task: Task, completed_today: set[int]) -> TaskResponse:
+    task_dto = TaskResponse.model_validate(task)
+    task_dto.is_completed = task.id in completed_today
+    return task_dto
 
 
 async def get_user_tasks(
     session: AsyncDBSessionDep,
-    user: User,
+    user: UserPrincipal,
+    completed_today: set[int],
+    limit: int | None = None,
+    cursor: str | None = None,
 ) -> Sequence[TaskResponse]:
-    today = date.today()
+    stmt = user_tasks_stmt(user, cursor)
+    if limit is not None:
+        stmt = stmt.limit(limit)
 
-    stmt = (
-        select(Task, TaskLog.id)
-        .outerjoin(TaskLog, and_(Task.id == TaskLog.task_id, TaskLog.date == today))
-        .where(Task.user_id == user.id)
-        .order_by(Task.created_at)
-    )
+    result = await session.scalars(stmt)
 
-    result = await session.execute(stmt)
+    return [to_task_response(task, completed_today) for task in result]
 
-    tasks_with_status = []
-    for task, log_id in result:
-        task_dto = TaskResponse.model_validate(task)
-        task_dto.is_completed = log_id is not None
-        tasks_with_status.append(task_dto)
 
-    return tasks_with_status
+def next_tasks_cursor(tasks: Sequence[TaskResponse], limit: int | None) -> str | None:
+    if limit is None or len(tasks) < limit:
+        return None
+    last = tasks[-1]
+    return encode_cursor([last.created_at.isoformat(), last.id])
+
+
+async def stream_user_tasks(
+    session: AsyncDBSessionDep,
+    user: UserPrincipal,
+    completed_today: set[int],
+    cursor: str | None = None,
+) -> AsyncIterator[bytes]:
+    # The generator outlives the request dependency, so it owns the session
+    # from here on and releases its connection itself.
+    stmt = user_tasks_stmt(user, cursor)
+    try:
+        result = await session.stream_scalars(stmt)
+        async for task in result:
+            yield (
+                to_task_response(task, completed_today).model_dump_json().encode()
+                + b"\n"
+            )
+    finally:
+        await session.close()
 
 
 async def get_task_by_id(
     session: AsyncDBSessionDep,
-    user: User,
+    user: UserPrincipal,
     task_id: int,
 ) -> Task:
     stmt = select(Task).where(Task.id == task_id, Task.user_id == user.id)
@@ -50,122 +143,315 @@ async def get_task_by_id(
 
 async def create_task(
     session: AsyncDBSessionDep,
-    user: User,
+    user: UserPrincipal,
     task_in: TaskCreate,
 ) -> Task:
-    task = Task(**task_in.model_dump(), user_id=user.id)
-    session.add(task)
+    stmt = insert(Task).values(**task_in.model_dump(), user_id=user.id).returning(Task)
+    task = (await session.execute(stmt)).scalar_one()
+    if task.reminders:
+        await replace_task_reminders(
+            session, user.id, user.timezone, {task.id: task.reminders}
+        )
     await session.commit()
-    await session.refresh(task)
     return task
 
 
 async def update_task_logic(
     session: AsyncDBSessionDep,
-    user: User,
+    user: UserPrincipal,
     task_id: int,
     task_update: TaskUpdate,
 ) -> Task:
-    task = await get_task_by_id(session, user, task_id)
-
     update_data = task_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(task, key, value)
+    if not update_data:
+        return await get_task_by_id(session, user, task_id)
 
-    session.add(task)
+    stmt = (
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == user.id)
+        .values(**update_data)
+        .returning(Task)
+    )
+    task = await session.scalar(stmt)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+        )
+
+    if "reminders" in update_data:
+        await replace_task_reminders(
+            session, user.id, user.timezone, {task.id: task.reminders}
+        )
     await session.commit()
-    await session.refresh(task)
     return task
 
 
 async def delete_task_logic(
     session: AsyncDBSessionDep,
-    user: User,
+    user: UserPrincipal,
     task_id: int,
 ) -> None:
-    task = await get_task_by_id(session, user, task_id)
-    await session.delete(task)
+    # Logs, aggregates, bitmaps and reminders go with ON DELETE CASCADE.
+    stmt = (
+        delete(Task)
+        .where(Task.id == task_id, Task.user_id == user.id)
+        .returning(Task.id)
+    )
+    if await session.scalar(stmt) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+        )
+    session.add(Tombstone(user_id=user.id, entity=SyncEntity.TASK, entity_id=task_id))
     await session.commit()
 
 
 async def complete_task_logic(
     session: AsyncDBSessionDep,
-    user: User,
+    user: UserPrincipal,
     task_id: int,
 ) -> TaskLog:
-    task = await get_task_by_id(session, user, task_id)
-    today = date.today()
-
-    stmt_check = select(TaskLog).where(
-        TaskLog.task_id == task.id, TaskLog.date == today
+    """Idempotent: completing a task twice on the same day returns the log
+    stored by the first call. A log with status false for today (e.g. synced
+    from a client) is flipped to completed."""
+    today = user.today()
+
+    # Ownership check, duplicate check and upsert in one statement, so a
+    # concurrent double-tap cannot fail on the unique constraint.
+    owned = select(Task.id, literal(today), true()).where(
+        Task.id == task_id, Task.user_id == user.id
     )
-    existing_log = await session.scalar(stmt_check)
-
-    if existing_log:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Task already completed today",
+    stmt = (
+        dialect_insert(session, TaskLog)
+        .from_select([TaskLog.task_id, TaskLog.date, TaskLog.status], owned)
+        .on_conflict_do_update(
+            index_elements=[TaskLog.task_id, TaskLog.date],
+            set_={"status": True, "updated_at": datetime.now(timezone.utc)},
+            where=TaskLog.status.is_(False),
+        )
+        .returning(TaskLog)
+    )
+    new_log = await session.scalar(stmt)
+
+    if new_log is None:
+        stmt = (
+            select(TaskLog)
+            .join(Task, Task.id == TaskLog.task_id)
+            .where(
+                TaskLog.task_id == task_id,
+                TaskLog.date == today,
+                Task.user_id == user.id,
+            )
         )
+        existing_log = await session.scalar(stmt)
+        if existing_log is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+            )
+        return existing_log
+
+    await record_completions(session, {task_id: [today]})
+    if bitmap_writes_enabled():
+        await set_completion_bits(session, {task_id: [today]})
+    await session.commit()
+    await completed_today_store.add(user.id, today, task_id)
+    return new_log
 
-    new_log = TaskLog(task_id=task.id, date=today, status=True)
-    session.add(new_log)
 
-    try:
-        await session.commit()
-        await session.refresh(new_log)
-        return new_log
-    except IntegrityError:
-        await session.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT, detail="Could not complete task"
-        )
+def task_logs_stmt(
+    task_id: int,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> Select:
+    # Served by the (task_id, date) index behind uq_task_log_date.
+    stmt = select(TaskLog).where(TaskLog.task_id == task_id)
+
+    if date_from:
+        stmt = stmt.where(TaskLog.date >= date_from)
+    if date_to:
+        stmt = stmt.where(TaskLog.date <= date_to)
+
+    return stmt
 
 
 async def get_task_logs_logic(
     session: AsyncDBSessionDep,
-    user: User,
+    user: UserPrincipal,
     task_id: int,
     date_from: date | None = None,
     date_to: date | None = None,
+    limit: int | None = None,
+    before: date | None = None,
 ) -> Sequence[TaskLog]:
     await get_task_by_id(session, user, task_id)
 
-    stmt = (
-        select(TaskLog).where(TaskLog.task_id == task_id).order_by(TaskLog.date.desc())
-    )
+    if bitmap_reads_enabled():
+        if before:
+            date_to = min(date_to or before, before - timedelta(days=1))
+        stmt = bitmaps_stmt(date_from, date_to).where(TaskLogBitmap.task_id == task_id)
+        completed = await load_completed_dates(session, stmt, date_from, date_to)
+        dates = completed.get(task_id, [])[::-1][:limit]
+        return [TaskLog(task_id=task_id, date=day, status=True) for day in dates]
 
-    if date_from:
-        stmt = stmt.where(TaskLog.date >= date_from)
-    if date_to:
-        stmt = stmt.where(TaskLog.date <= date_to)
+    stmt = task_logs_stmt(task_id, date_from, date_to).order_by(TaskLog.date.desc())
+
+    if before:
+        stmt = stmt.where(TaskLog.date < before)
+    if limit is not None:
+        stmt = stmt.limit(limit)
 
     result = await session.scalars(stmt)
     return result.all()
 
 
+def next_logs_cursor(logs: Sequence[TaskLog], limit: int | None) -> str | None:
+    if limit is None or len(logs) < limit:
+        return None
+    return logs[-1].date.isoformat()
+
+
+async def export_task_logs(
+    session: AsyncDBSessionDep,
+    task_id: int,
+    format: Literal["csv", "ndjson"],
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> AsyncIterator[bytes]:
+    # Like stream_user_tasks, the generator owns the session once streaming.
+    try:
+        if format == "csv":
+            yield b"id,date,status\r\n"
+
+        async for log in iter_task_logs(session, task_id, date_from, date_to):
+            if format == "csv":
+                log_id = "" if log.id is None else log.id
+                yield f"{log_id},{log.date.isoformat()},{int(log.status)}\r\n".encode()
+            else:
+                yield TaskLogResponse.model_validate(log).model_dump_json().encode()
+                yield b"\n"
+    finally:
+        await session.close()
+
+
+async def iter_task_logs(
+    session: AsyncDBSessionDep,
+    task_id: int,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> AsyncIterator[TaskLog]:
+    if bitmap_reads_enabled():
+        # A task has at most one bitmap row per month, so this stays small.
+        stmt = bitmaps_stmt(date_from, date_to).where(TaskLogBitmap.task_id == task_id)
+        completed = await load_completed_dates(session, stmt, date_from, date_to)
+        for day in completed.get(task_id, []):
+            yield TaskLog(task_id=task_id, date=day, status=True)
+        return
+
+    stmt = task_logs_stmt(task_id, date_from, date_to).order_by(TaskLog.date)
+    result = await session.stream_scalars(stmt)
+    async for log in result:
+        yield log
+
+
+async def get_completion_history_logic(
+    session: AsyncDBSessionDep,
+    user: UserPrincipal,
+    date_from: date,
+    date_to: date,
+    encoding: Literal["dates", "bitmap"] = "dates",
+) -> CompletionHistoryResponse:
+    days = (date_to - date_from).days + 1
+    if not 0 < days <= MAX_HISTORY_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range must span 1 to {MAX_HISTORY_RANGE_DAYS} days",
+        )
+
+    if bitmap_reads_enabled():
+        stmt = (
+            bitmaps_stmt(date_from, date_to)
+            .join(Task, Task.id == TaskLogBitmap.task_id)
+            .where(Task.user_id == user.id)
+        )
+        dates_by_task = await load_completed_dates(session, stmt, date_from, date_to)
+    else:
+        stmt = (
+            select(TaskLog.task_id, TaskLog.date)
+            .join(Task, Task.id == TaskLog.task_id)
+            .where(
+                Task.user_id == user.id,
+                TaskLog.status.is_(True),
+                TaskLog.date >= date_from,
+                TaskLog.date <= date_to,
+            )
+            .order_by(TaskLog.task_id, TaskLog.date)
+        )
+        result = await session.execute(stmt)
+
+        dates_by_task = {}
+        for task_id, log_date in result:
+            dates_by_task.setdefault(task_id, []).append(log_date)
+
+    history = CompletionHistoryResponse(
+        date_from=date_from, date_to=date_to, encoding=encoding, tasks=[]
+    )
+    for task_id, dates in dates_by_task.items():
+        if not dates:
+            continue
+        if encoding == "bitmap":
+            bitmap = encode_day_bitmap(dates, date_from, days)
+            history.tasks.append(
+                TaskCompletionHistory(
+                    task_id=task_id, bitmap=base64.b64encode(bitmap).decode("ascii")
+                )
+            )
+        else:
+            history.tasks.append(TaskCompletionHistory(task_id=task_id, dates=dates))
+
+    return history
+
+
 async def undo_complete_task_logic(
     session: AsyncDBSessionDep,
-    user: User,
+    user: UserPrincipal,
     task_id: int,
     target_date: date | None = None,
 ) -> None:
-    task = await get_task_by_id(session, user, task_id)
-
+    """Idempotent: undoing a completion that does not exist is a no-op, as
+    long as the task belongs to the user."""
     if target_date is None:
-        target_date = date.today()
+        target_date = user.today()
 
-    # 2. Шукаємо лог
-    stmt = select(TaskLog).where(
-        TaskLog.task_id == task.id, TaskLog.date == target_date
+    owned = select(Task.id).where(Task.id == task_id, Task.user_id == user.id)
+    stmt = (
+        delete(TaskLog)
+        .where(TaskLog.task_id.in_(owned), TaskLog.date == target_date)
+        .returning(TaskLog.id, TaskLog.status)
     )
-    log_entry = await session.scalar(stmt)
-
-    if not log_entry:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Task was not completed on {target_date}",
+    deleted = (await session.execute(stmt)).one_or_none()
+
+    if deleted is None:
+        await get_task_by_id(session, user, task_id)
+        # Months archived by archive_task_logs only exist as bits. There is no
+        # log id left to put in a tombstone.
+        if not (
+            bitmap_writes_enabled()
+            and await clear_completion_bit(session, task_id, target_date)
+        ):
+            return
+        await record_removed_completion(session, task_id, target_date)
+    else:
+        if deleted.status:
+            await record_removed_completion(session, task_id, target_date)
+            if bitmap_writes_enabled():
+                await clear_completion_bit(session, task_id, target_date)
+        session.add(
+            Tombstone(
+                user_id=user.id,
+                entity=SyncEntity.TASK_LOG,
+                entity_id=deleted.id,
+                task_id=task_id,
+                date=target_date,
+            )
         )
-
-    # 3. Видаляємо
-    await session.delete(log_entry)
     await session.commit()
+    await completed_today_store.discard(user.id, target_date, task_id)
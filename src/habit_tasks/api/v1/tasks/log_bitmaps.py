@@ -0,0 +1,96 @@
+from collections.abc import Iterable, Mapping
+from datetime import date
+
+from sqlalchemy import Select, select, update
+
+from habit_tasks.config import settings
+from habit_tasks.database import AsyncDBSessionDep
+from habit_tasks.database.dialect import dialect_insert
+from habit_tasks.database.models import TaskLogBitmap
+from habit_tasks.utils import decode_month_bits, month_day_mask, month_start
+
+
+def bitmap_writes_enabled() -> bool:
+    return settings.task_logs.storage != "rows"
+
+
+def bitmap_reads_enabled() -> bool:
+    return settings.task_logs.storage == "bitmap"
+
+
+def month_masks(dates_by_task: Mapping[int, Iterable[date]]) -> list[dict]:
+    masks: dict[tuple[int, date], int] = {}
+    for task_id, days in dates_by_task.items():
+        for day in days:
+            key = (task_id, month_start(day))
+            masks[key] = masks.get(key, 0) | month_day_mask(day)
+    return [
+        {"task_id": task_id, "month": month, "days": mask}
+        for (task_id, month), mask in masks.items()
+    ]
+
+
+async def set_completion_bits(
+    session: AsyncDBSessionDep,
+    dates_by_task: Mapping[int, Iterable[date]],
+) -> None:
+    rows = month_masks(dates_by_task)
+    if not rows:
+        return
+
+    stmt = dialect_insert(session, TaskLogBitmap)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TaskLogBitmap.task_id, TaskLogBitmap.month],
+        set_={"days": TaskLogBitmap.days.op("|")(stmt.excluded.days)},
+    )
+    await session.execute(stmt, rows)
+
+
+async def clear_completion_bit(
+    session: AsyncDBSessionDep,
+    task_id: int,
+    day: date,
+) -> bool:
+    """Returns whether the bit was set."""
+    stmt = (
+        update(TaskLogBitmap)
+        .where(
+            TaskLogBitmap.task_id == task_id,
+            TaskLogBitmap.month == month_start(day),
+            TaskLogBitmap.days.op("&")(month_day_mask(day)) != 0,
+        )
+        .values(days=TaskLogBitmap.days.op("&")(~month_day_mask(day)))
+        .returning(TaskLogBitmap.task_id)
+    )
+    return await session.scalar(stmt) is not None
+
+
+def bitmaps_stmt(
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> Select:
+    stmt = select(TaskLogBitmap.task_id, TaskLogBitmap.month, TaskLogBitmap.days)
+    if date_from:
+        stmt = stmt.where(TaskLogBitmap.month >= month_start(date_from))
+    if date_to:
+        stmt = stmt.where(TaskLogBitmap.month <= date_to)
+    return stmt.order_by(TaskLogBitmap.task_id, TaskLogBitmap.month)
+
+
+async def load_completed_dates(
+    session: AsyncDBSessionDep,
+    stmt: Select,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> dict[int, list[date]]:
+    """Decode rows of a ``bitmaps_stmt`` into sorted dates per task, trimmed
+    to the requested range."""
+    completed: dict[int, list[date]] = {}
+    for task_id, month, days in await session.execute(stmt):
+        completed.setdefault(task_id, []).extend(
+            day
+            for day in decode_month_bits(month, days)
+            if (date_from is None or day >= date_from)
+            and (date_to is None or day <= date_to)
+        )
+    return completed
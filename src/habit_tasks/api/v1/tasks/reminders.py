@@ -0,0 +1,75 @@
+from collections.abc import Iterable
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, insert, select, update
+
+from habit_tasks.database import AsyncDBSessionDep
+from habit_tasks.database.models import TaskReminder
+from habit_tasks.reminders import next_fire_at, parse_reminder_time
+
+
+def reminder_rows(
+    task_id: int,
+    user_id: int,
+    reminders: Iterable[str],
+    tz_name: str,
+    now: datetime,
+) -> list[dict]:
+    rows = []
+    for local_time in {parse_reminder_time(value) for value in reminders}:
+        rows.append(
+            {
+                "task_id": task_id,
+                "user_id": user_id,
+                "local_time": local_time,
+                "timezone": tz_name,
+                "next_fire_at": next_fire_at(local_time, tz_name, now),
+            }
+        )
+    return rows
+
+
+async def replace_task_reminders(
+    session: AsyncDBSessionDep,
+    user_id: int,
+    tz_name: str,
+    reminders_by_task: dict[int, list[str] | None],
+) -> None:
+    """Re-derive the reminder queue rows of the given tasks from their
+    ``Task.reminders`` values."""
+    if not reminders_by_task:
+        return
+
+    await session.execute(
+        delete(TaskReminder).where(TaskReminder.task_id.in_(reminders_by_task))
+    )
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        row
+        for task_id, reminders in reminders_by_task.items()
+        for row in reminder_rows(task_id, user_id, reminders or [], tz_name, now)
+    ]
+    if rows:
+        await session.execute(insert(TaskReminder), rows)
+
+
+async def reschedule_user_reminders(
+    session: AsyncDBSessionDep,
+    user_id: int,
+    tz_name: str,
+) -> None:
+    stmt = select(TaskReminder.id, TaskReminder.local_time).where(
+        TaskReminder.user_id == user_id
+    )
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": reminder_id,
+            "timezone": tz_name,
+            "next_fire_at": next_fire_at(local_time, tz_name, now),
+        }
+        for reminder_id, local_time in await session.execute(stmt)
+    ]
+    if rows:
+        await session.execute(update(TaskReminder), rows)
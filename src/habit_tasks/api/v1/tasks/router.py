@@ -1,40 +1,138 @@
 from datetime import date
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
 
-from habit_tasks.api.v1.auth.dependencies import get_auth_user_from_access_token
-from habit_tasks.database import AsyncDBSessionDep
-from habit_tasks.database.models import User
+from habit_tasks.api.v1.auth.dependencies import get_current_principal
+from habit_tasks.database import AsyncDBReadSessionDep, AsyncDBSessionDep
 from habit_tasks.schemas.task import (
+    CompletionHistoryResponse,
     TaskCreate,
     TaskLogResponse,
     TaskResponse,
+    TaskStats,
     TaskUpdate,
 )
+from habit_tasks.schemas.task_batch import (
+    TaskBatchCreate,
+    TaskBatchIds,
+    TaskBatchResponse,
+    TaskBatchUpdate,
+)
+from habit_tasks.schemas.user import UserPrincipal
 
+from .batch import (
+    batch_complete_tasks,
+    batch_create_tasks,
+    batch_delete_tasks,
+    batch_update_tasks,
+)
+from .completion_cache import get_completed_today
 from .dependencies import (
     complete_task_logic,
     create_task,
     delete_task_logic,
+    export_task_logs,
+    get_completion_history_logic,
     get_task_by_id,
     get_task_logs_logic,
     get_user_tasks,
+    next_logs_cursor,
+    next_tasks_cursor,
+    stream_user_tasks,
     undo_complete_task_logic,
     update_task_logic,
 )
+from .stats import get_task_stats_logic
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
-CurrentUser = Annotated[User, Depends(get_auth_user_from_access_token)]
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+CurrentUser = Annotated[UserPrincipal, Depends(get_current_principal)]
 
 
 @router.get("/", response_model=list[TaskResponse])
 async def get_my_tasks(
+    session: AsyncDBReadSessionDep,
+    primary_session: AsyncDBSessionDep,
+    user: CurrentUser,
+    response: Response,
+    limit: Annotated[int | None, Query(ge=1, le=500)] = None,
+    cursor: Annotated[
+        str | None, Query(description="X-Next-Cursor of the previous page")
+    ] = None,
+    format: Annotated[Literal["json", "ndjson"], Query()] = "json",
+):
+    completed_today = await get_completed_today(primary_session, user, user.today())
+    if format == "ndjson":
+        return StreamingResponse(
+            stream_user_tasks(session, user, completed_today, cursor),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
+    tasks = await get_user_tasks(session, user, completed_today, limit, cursor)
+    if next_cursor := next_tasks_cursor(tasks, limit):
+        response.headers["X-Next-Cursor"] = next_cursor
+    return tasks
+
+
+@router.get("/logs", response_model=CompletionHistoryResponse)
+async def get_completion_history(
+    session: AsyncDBReadSessionDep,
+    user: CurrentUser,
+    date_from: Annotated[date, Query(description="First day of the range")],
+    date_to: Annotated[date, Query(description="Last day of the range")],
+    encoding: Annotated[Literal["dates", "bitmap"], Query()] = "dates",
+):
+    return await get_completion_history_logic(
+        session, user, date_from, date_to, encoding
+    )
+
+
+@router.get("/stats", response_model=list[TaskStats])
+async def get_my_tasks_stats(
+    session: AsyncDBReadSessionDep,
+    user: CurrentUser,
+):
+    return await get_task_stats_logic(session, user)
+
+
+@router.post("/batch/create", response_model=TaskBatchResponse)
+async def create_tasks_batch(
+    batch: TaskBatchCreate,
+    session: AsyncDBSessionDep,
+    user: CurrentUser,
+):
+    return await batch_create_tasks(session, user, batch)
+
+
+@router.post("/batch/update", response_model=TaskBatchResponse)
+async def update_tasks_batch(
+    batch: TaskBatchUpdate,
+    session: AsyncDBSessionDep,
+    user: CurrentUser,
+):
+    return await batch_update_tasks(session, user, batch)
+
+
+@router.post("/batch/delete", response_model=TaskBatchResponse)
+async def delete_tasks_batch(
+    batch: TaskBatchIds,
     session: AsyncDBSessionDep,
     user: CurrentUser,
 ):
-    return await get_user_tasks(session, user)
+    return await batch_delete_tasks(session, user, batch)
+
+
+@router.post("/batch/complete", response_model=TaskBatchResponse)
+async def complete_tasks_batch(
+    batch: TaskBatchIds,
+    session: AsyncDBSessionDep,
+    user: CurrentUser,
+):
+    return await batch_complete_tasks(session, user, batch)
 
 
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
@@ -49,7 +147,7 @@ async def create_new_task(
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: int,
-    session: AsyncDBSessionDep,
+    session: AsyncDBReadSessionDep,
     user: CurrentUser,
 ):
     return await get_task_by_id(session, user, task_id)
@@ -74,15 +172,55 @@ async def delete_task(
     await delete_task_logic(session, user, task_id)
 
 
+@router.get("/{task_id}/stats", response_model=TaskStats)
+async def get_task_stats(
+    task_id: int,
+    session: AsyncDBReadSessionDep,
+    user: CurrentUser,
+):
+    (stats,) = await get_task_stats_logic(session, user, task_id)
+    return stats
+
+
 @router.get("/{task_id}/logs", response_model=list[TaskLogResponse])
 async def get_task_history(
     task_id: int,
-    session: AsyncDBSessionDep,
+    session: AsyncDBReadSessionDep,
+    user: CurrentUser,
+    response: Response,
+    date_from: Annotated[date | None, Query(description="Start date filter")] = None,
+    date_to: Annotated[date | None, Query(description="End date filter")] = None,
+    limit: Annotated[int | None, Query(ge=1, le=1000)] = None,
+    before: Annotated[
+        date | None, Query(description="X-Next-Cursor of the previous page")
+    ] = None,
+):
+    logs = await get_task_logs_logic(
+        session, user, task_id, date_from, date_to, limit, before
+    )
+    if next_cursor := next_logs_cursor(logs, limit):
+        response.headers["X-Next-Cursor"] = next_cursor
+    return logs
+
+
+@router.get("/{task_id}/logs/export")
+async def export_task_history(
+    task_id: int,
+    session: AsyncDBReadSessionDep,
     user: CurrentUser,
+    format: Annotated[Literal["csv", "ndjson"], Query()] = "csv",
     date_from: Annotated[date | None, Query(description="Start date filter")] = None,
     date_to: Annotated[date | None, Query(description="End date filter")] = None,
 ):
-    return await get_task_logs_logic(session, user, task_id, date_from, date_to)
+    await get_task_by_id(session, user, task_id)
+
+    media_type = "text/csv" if format == "csv" else NDJSON_MEDIA_TYPE
+    filename = f"task-{task_id}-logs.{format}"
+    return StreamingResponse(
+        export_task_logs(session, task_id, format, date_from, date_to),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.post("/{task_id}/complete", response_model=TaskLogResponse)
@@ -0,0 +1,151 @@
+from collections.abc import Collection, Sequence
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from typing import NamedTuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Integer, Select, cast, func, select
+
+from habit_tasks.database import AsyncDBSessionDep
+from habit_tasks.database.dialect import day_number
+from habit_tasks.database.models import Task, TaskAggregate, TaskLog, TaskLogBitmap
+from habit_tasks.schemas.task import TaskStats
+from habit_tasks.schemas.user import UserPrincipal
+
+from .log_bitmaps import bitmap_reads_enabled, bitmaps_stmt, load_completed_dates
+
+
+class Streaks(NamedTuple):
+    total_completions: int = 0
+    # Length of the streak ending at last_completed, alive or not.
+    current_streak: int = 0
+    longest_streak: int = 0
+    last_completed: date | None = None
+
+
+def compute_streaks(dates: Sequence[date]) -> Streaks:
+    """Gaps-and-islands over sorted, distinct completion dates: consecutive
+    days share the same ``ordinal - index`` key."""
+    if not dates:
+        return Streaks()
+
+    islands = [
+        len(list(group))
+        for _, group in groupby(
+            enumerate(dates), key=lambda item: item[1].toordinal() - item[0]
+        )
+    ]
+    return Streaks(len(dates), islands[-1], max(islands), dates[-1])
+
+
+def to_task_stats(
+    task_id: int,
+    created_at: datetime,
+    streaks: Streaks | TaskAggregate | None,
+    today: date,
+) -> TaskStats:
+    if streaks is None or not streaks.total_completions:
+        return TaskStats(task_id=task_id)
+
+    days = (today - created_at.date()).days + 1
+    alive = (
+        streaks.last_completed is not None
+        and streaks.last_completed >= today - timedelta(days=1)
+    )
+
+    return TaskStats(
+        task_id=task_id,
+        total_completions=streaks.total_completions,
+        current_streak=streaks.current_streak if alive else 0,
+        longest_streak=streaks.longest_streak,
+        last_completed=streaks.last_completed,
+        completion_rate=min(1.0, streaks.total_completions / max(days, 1)),
+    )
+
+
+def window_streaks_stmt(task_ids: Collection[int]) -> Select:
+    # Consecutive days minus their row number collapse onto the same value,
+    # which identifies each streak ("island").
+    numbered = (
+        select(
+            TaskLog.task_id,
+            TaskLog.date,
+            (
+                day_number(TaskLog.date)
+                - cast(
+                    func.row_number().over(
+                        partition_by=TaskLog.task_id, order_by=TaskLog.date
+                    ),
+                    Integer,
+                )
+            ).label("island"),
+        )
+        .where(TaskLog.task_id.in_(task_ids), TaskLog.status.is_(True))
+        .subquery()
+    )
+    islands = (
+        select(
+            numbered.c.task_id,
+            func.count().label("length"),
+            func.max(numbered.c.date).label("end_date"),
+        )
+        .group_by(numbered.c.task_id, numbered.c.island)
+        .subquery()
+    )
+    ranked = select(
+        islands,
+        func.row_number()
+        .over(partition_by=islands.c.task_id, order_by=islands.c.end_date.desc())
+        .label("recency"),
+    ).subquery()
+    return select(
+        ranked.c.task_id,
+        func.sum(ranked.c.length),
+        func.max(ranked.c.length).filter(ranked.c.recency == 1),
+        func.max(ranked.c.length),
+        func.max(ranked.c.end_date),
+    ).group_by(ranked.c.task_id)
+
+
+async def load_streaks(
+    session: AsyncDBSessionDep,
+    task_ids: Collection[int],
+) -> dict[int, Streaks]:
+    if not task_ids:
+        return {}
+
+    if bitmap_reads_enabled():
+        stmt = bitmaps_stmt().where(TaskLogBitmap.task_id.in_(task_ids))
+        completed = await load_completed_dates(session, stmt)
+        return {task_id: compute_streaks(dates) for task_id, dates in completed.items()}
+
+    result = await session.execute(window_streaks_stmt(task_ids))
+    return {task_id: Streaks(*values) for task_id, *values in result}
+
+
+async def get_task_stats_logic(
+    session: AsyncDBSessionDep,
+    user: UserPrincipal,
+    task_id: int | None = None,
+) -> list[TaskStats]:
+    stmt = (
+        select(Task.id, Task.created_at, TaskAggregate)
+        .outerjoin(TaskAggregate, TaskAggregate.task_id == Task.id)
+        .where(Task.user_id == user.id)
+        .order_by(Task.id)
+    )
+    if task_id is not None:
+        stmt = stmt.where(Task.id == task_id)
+
+    today = user.today()
+    result = await session.execute(stmt)
+    stats = [
+        to_task_stats(row_task_id, created_at, aggregate, today)
+        for row_task_id, created_at, aggregate in result
+    ]
+
+    if task_id is not None and not stats:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+        )
+    return stats
@@ -1,13 +1,16 @@
 from collections.abc import Sequence
 
-from fastapi import HTTPException, status
-from sqlalchemy import select
+from fastapi import HTTPException, Request, status
+from sqlalchemy import insert, select
 from sqlalchemy.exc import IntegrityError
 
-from habit_tasks.api.v1.auth.utils import hash_password
-from habit_tasks.database import AsyncDBSessionDep
+from habit_tasks.api.v1.auth.password_hasher import password_hasher
+from habit_tasks.api.v1.auth.rate_limit import enforce_register_rate_limit
+from habit_tasks.api.v1.auth.user_cache import invalidate_user
+from habit_tasks.api.v1.tasks.reminders import reschedule_user_reminders
+from habit_tasks.database import AsyncDBReadSessionDep, AsyncDBSessionDep
 from habit_tasks.database.models import User
-from habit_tasks.schemas.user import UserCreate
+from habit_tasks.schemas.user import UserCreate, UserUpdate
 
 
 async def get_user_by_id(session: AsyncDBSessionDep, id: int) -> User:
@@ -16,7 +19,7 @@ async def get_user_by_id(session: AsyncDBSessionDep, id: int) -> User:
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
 
-async def get_all_users(session: AsyncDBSessionDep) -> Sequence[User]:
+async def get_all_users(session: AsyncDBReadSessionDep) -> Sequence[User]:
     statement = select(User).order_by(User.id)
     result = await session.scalars(statement=statement)
     return result.all()
@@ -26,16 +29,15 @@ async def create_user_in_db(
     session: AsyncDBSessionDep,
     user_create: UserCreate,
 ) -> User:
-    hashed_pwd = hash_password(user_create.password)
+    hashed_pwd = await password_hasher.hash(user_create.password)
     user_data = user_create.model_dump(exclude={"password"})
     user_data["password_hash"] = hashed_pwd
 
-    user = User(**user_data)
-    session.add(user)
-
     try:
+        stmt = insert(User).values(**user_data).returning(User)
+        user = (await session.execute(stmt)).scalar_one()
         await session.commit()
-        await session.refresh(user)
+        invalidate_user(user.username)
         return user
     except IntegrityError:
         await session.rollback()
@@ -45,8 +47,26 @@ async def create_user_in_db(
         )
 
 
+async def update_user_in_db(
+    session: AsyncDBSessionDep,
+    user_id: int,
+    user_update: UserUpdate,
+) -> User:
+    user = await get_user_by_id(session, user_id)
+    update_data = user_update.model_dump(exclude_unset=True, exclude_none=True)
+    for field, value in update_data.items():
+        setattr(user, field, value)
+
+    if "timezone" in update_data:
+        await reschedule_user_reminders(session, user.id, user.timezone)
+    await session.commit()
+    return user
+
+
 async def add_user(
+    request: Request,
     session: AsyncDBSessionDep,
     user_create: UserCreate,
 ) -> User:
+    await enforce_register_rate_limit(request)
     return await create_user_in_db(session, user_create)
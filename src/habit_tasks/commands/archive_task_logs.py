@@ -0,0 +1,103 @@
+"""Move task_logs older than the hot window into task_log_bitmaps.
+
+    python -m habit_tasks.commands.archive_task_logs [--hot-months N]
+
+Completed days are OR-ed into the bitmaps first; afterwards whole monthly
+partitions below the cutoff are detached and dropped on PostgreSQL, and any
+remaining older rows are deleted. Requires task_logs.storage = "bitmap" so
+that history reads no longer depend on the archived rows.
+"""
+
+import argparse
+import asyncio
+from datetime import date
+from itertools import groupby
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from habit_tasks.api.v1.tasks.log_bitmaps import (
+    bitmap_reads_enabled,
+    set_completion_bits,
+)
+from habit_tasks.config import settings
+from habit_tasks.database import database_helper
+from habit_tasks.database.models import TaskLog
+from habit_tasks.database.partitions import (
+    add_months,
+    list_task_log_partitions,
+    partition_name,
+)
+
+DESCRIPTION = "Move task_logs older than the hot window into task_log_bitmaps."
+
+
+async def copy_logs_to_bitmaps(session: AsyncSession, before: date) -> int:
+    first = await session.scalar(
+        select(func.min(TaskLog.date)).where(TaskLog.date < before)
+    )
+    if first is None:
+        return 0
+
+    # One month per query, so each read touches a single partition.
+    copied = 0
+    month = first.replace(day=1)
+    while month < before:
+        stmt = (
+            select(TaskLog.task_id, TaskLog.date)
+            .where(
+                TaskLog.date >= month,
+                TaskLog.date < min(add_months(month, 1), before),
+                TaskLog.status.is_(True),
+            )
+            .order_by(TaskLog.task_id)
+        )
+        rows = (await session.execute(stmt)).all()
+        await set_completion_bits(
+            session,
+            {
+                task_id: [log_date for _, log_date in task_rows]
+                for task_id, task_rows in groupby(rows, key=lambda row: row[0])
+            },
+        )
+        copied += len(rows)
+        month = add_months(month, 1)
+    return copied
+
+
+async def drop_archived_partitions(session: AsyncSession, before: date) -> None:
+    connection = await session.connection()
+    for month in await list_task_log_partitions(connection):
+        if add_months(month, 1) <= before:
+            name = partition_name(month)
+            await connection.execute(
+                text(f"ALTER TABLE task_logs DETACH PARTITION {name}")
+            )
+            await connection.execute(text(f"DROP TABLE {name}"))
+
+
+async def archive_task_logs(session: AsyncSession, before: date) -> int:
+    if not bitmap_reads_enabled():
+        raise RuntimeError('Archiving requires task_logs.storage = "bitmap"')
+
+    archived = await copy_logs_to_bitmaps(session, before)
+    if session.get_bind().dialect.name == "postgresql":
+        await drop_archived_partitions(session, before)
+    await session.execute(delete(TaskLog).where(TaskLog.date < before))
+    await session.commit()
+    return archived
+
+
+async def main(hot_months: int) -> None:
+    before = add_months(date.today().replace(day=1), -hot_months)
+    async with database_helper.session_factory() as session:
+        archived = await archive_task_logs(session, before)
+    await database_helper.dispose()
+    print(f"Archived {archived} task logs older than {before}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    parser.add_argument("--hot-months", type=int, default=settings.task_logs.hot_months)
+    args = parser.parse_args()
+    asyncio.run(main(args.hot_months))
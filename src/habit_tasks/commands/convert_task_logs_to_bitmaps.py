@@ -0,0 +1,63 @@
+"""Copy completed task_logs rows into task_log_bitmaps.
+
+    python -m habit_tasks.commands.convert_task_logs_to_bitmaps [--batch-size N]
+
+Bits are OR-ed into existing bitmaps, so the command is safe to re-run while
+the application writes in "dual" mode.
+"""
+
+import argparse
+import asyncio
+from datetime import date
+from itertools import groupby
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from habit_tasks.api.v1.tasks.log_bitmaps import set_completion_bits
+from habit_tasks.database import database_helper
+from habit_tasks.database.models import Task, TaskLog
+
+DESCRIPTION = "Copy completed task_logs rows into task_log_bitmaps."
+
+
+async def convert_task_logs(session: AsyncSession, batch_size: int = 1000) -> int:
+    converted = 0
+    last_id = 0
+    while True:
+        stmt = (
+            select(Task.id).where(Task.id > last_id).order_by(Task.id).limit(batch_size)
+        )
+        task_ids = (await session.scalars(stmt)).all()
+        if not task_ids:
+            return converted
+
+        stmt = (
+            select(TaskLog.task_id, TaskLog.date)
+            .where(TaskLog.task_id.in_(task_ids), TaskLog.status.is_(True))
+            .order_by(TaskLog.task_id)
+        )
+        dates_by_task: dict[int, list[date]] = {
+            task_id: [log_date for _, log_date in rows]
+            for task_id, rows in groupby(
+                await session.execute(stmt), key=lambda row: row[0]
+            )
+        }
+        await set_completion_bits(session, dates_by_task)
+        await session.commit()
+        converted += sum(len(dates) for dates in dates_by_task.values())
+        last_id = task_ids[-1]
+
+
+async def main(batch_size: int) -> None:
+    async with database_helper.session_factory() as session:
+        converted = await convert_task_logs(session, batch_size)
+    await database_helper.dispose()
+    print(f"Converted {converted} task logs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,72 @@
+"""Rebuild task_reminders from Task.reminders.
+
+    python -m habit_tasks.commands.rebuild_reminders [--batch-size N]
+
+Entries that are not valid HH:MM times are skipped and reported.
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from habit_tasks.api.v1.tasks.reminders import replace_task_reminders
+from habit_tasks.database import database_helper
+from habit_tasks.database.models import Task, User
+from habit_tasks.reminders import parse_reminder_time
+
+DESCRIPTION = "Rebuild task_reminders from Task.reminders."
+
+
+def valid_reminders(task_id: int, reminders: list | None) -> list[str]:
+    valid = []
+    for value in reminders or []:
+        try:
+            parse_reminder_time(value)
+        except (TypeError, ValueError):
+            print(f"Task {task_id}: skipping invalid reminder {value!r}")
+        else:
+            valid.append(value)
+    return valid
+
+
+async def rebuild_reminders(session: AsyncSession, batch_size: int = 1000) -> int:
+    rebuilt = 0
+    last_id = 0
+    while True:
+        stmt = (
+            select(Task.id, Task.user_id, Task.reminders, User.timezone)
+            .join(User, User.id == Task.user_id)
+            .where(Task.id > last_id)
+            .order_by(Task.id)
+            .limit(batch_size)
+        )
+        rows = (await session.execute(stmt)).all()
+        if not rows:
+            return rebuilt
+
+        by_user: dict[tuple[int, str], dict[int, list[str] | None]] = {}
+        for task_id, user_id, reminders, tz_name in rows:
+            by_user.setdefault((user_id, tz_name), {})[task_id] = valid_reminders(
+                task_id, reminders
+            )
+        for (user_id, tz_name), reminders_by_task in by_user.items():
+            await replace_task_reminders(session, user_id, tz_name, reminders_by_task)
+        await session.commit()
+        rebuilt += len(rows)
+        last_id = rows[-1][0]
+
+
+async def main(batch_size: int) -> None:
+    async with database_helper.session_factory() as session:
+        rebuilt = await rebuild_reminders(session, batch_size)
+    await database_helper.dispose()
+    print(f"Rebuilt reminders for {rebuilt} tasks")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
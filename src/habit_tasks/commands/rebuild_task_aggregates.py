@@ -0,0 +1,47 @@
+"""Recompute task_aggregates from task_logs.
+
+python -m habit_tasks.commands.rebuild_task_aggregates [--batch-size N]
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from habit_tasks.api.v1.tasks.aggregates import recompute_aggregates
+from habit_tasks.database import database_helper
+from habit_tasks.database.models import Task
+
+DESCRIPTION = "Recompute task_aggregates from task_logs."
+
+
+async def rebuild_task_aggregates(session: AsyncSession, batch_size: int = 1000) -> int:
+    rebuilt = 0
+    last_id = 0
+    while True:
+        stmt = (
+            select(Task.id).where(Task.id > last_id).order_by(Task.id).limit(batch_size)
+        )
+        task_ids = (await session.scalars(stmt)).all()
+        if not task_ids:
+            return rebuilt
+
+        await recompute_aggregates(session, task_ids)
+        await session.commit()
+        rebuilt += len(task_ids)
+        last_id = task_ids[-1]
+
+
+async def main(batch_size: int) -> None:
+    async with database_helper.session_factory() as session:
+        rebuilt = await rebuild_task_aggregates(session, batch_size)
+    await database_helper.dispose()
+    print(f"Rebuilt aggregates for {rebuilt} tasks")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 
 from pydantic import BaseModel, Field
 from pydantic_settings import (
@@ -20,9 +21,86 @@ class AppSettings(BaseModel):
 class AuthSettings(BaseModel):
     secret_key_path: str = (BASE_DIR / "certs" / "jwt" / "private.pem").read_text()
     public_key_path: str = (BASE_DIR / "certs" / "jwt" / "public.pem").read_text()
-    algorithm: str = "RS256"
+    # ES256/EdDSA sign much faster and use smaller keys, RS256 verifies fastest
+    # (benchmarks/bench_token_verification.py). Key files must match.
+    algorithm: Literal["RS256", "ES256", "EdDSA"] = "RS256"
     access_token_expire_minutes: int = 15
     refresh_token_expire_days: int = 30
+    # Opt-in: trust the id/role/tz claims of access tokens instead of loading
+    # the user row. Saves a lookup per request, but a deactivated, deleted or
+    # demoted user keeps their old access until the token expires, so only
+    # enable it with a short access_token_expire_minutes.
+    stateless_access_tokens: bool = False
+    user_cache_size: int = 10_000
+    user_cache_ttl_seconds: float = 60
+    verified_token_cache_size: int = 10_000
+    bcrypt_rounds: int = Field(default=12, ge=4, le=31)
+    password_hash_executor: Literal["thread", "process"] = "thread"
+    password_hash_workers: int = 4
+    # Hash/verify calls allowed to wait or run at once before answering 503.
+    password_hash_max_pending: int = 64
+
+
+class RateLimitRule(BaseModel):
+    limit: int
+    window_seconds: float
+
+
+class RateLimitSettings(BaseModel):
+    enabled: bool = True
+    store_size: int = 100_000
+    login_per_ip: RateLimitRule = RateLimitRule(limit=30, window_seconds=60)
+    login_per_account: RateLimitRule = RateLimitRule(limit=5, window_seconds=60)
+    register_per_ip: RateLimitRule = RateLimitRule(limit=5, window_seconds=3600)
+    # Addresses or networks of reverse proxies in front of the app. Requests
+    # from them are limited by the client IP in X-Forwarded-For; without this
+    # every client behind the proxy shares the proxy's per-IP bucket.
+    trusted_proxies: list[str] = []
+
+
+class TaskLogSettings(BaseModel):
+    # "dual" also maintains task_log_bitmaps, "bitmap" additionally serves log
+    # history from them. Switch to "dual", run
+    # habit_tasks.commands.convert_task_logs_to_bitmaps, then to "bitmap".
+    storage: Literal["rows", "dual", "bitmap"] = "rows"
+    # PostgreSQL only: monthly task_logs partitions are created this far ahead.
+    partition_months_ahead: int = 3
+    partition_maintenance_interval_seconds: float = 6 * 3600
+    # habit_tasks.commands.archive_task_logs keeps this many months as rows.
+    hot_months: int = 13
+    # Per-user "completed today" sets behind the task list.
+    completed_today_cache_size: int = 10_000
+    completed_today_cache_ttl_seconds: float = 60
+
+
+class SyncSettings(BaseModel):
+    # GET /sync/changes holds back rows stamped within this many seconds.
+    # Timestamps are taken when a row is written, not when its transaction
+    # commits, so a row stamped earlier can become visible after a later one
+    # was already pulled. Keep this above the longest write transaction plus
+    # the clock skew between workers.
+    changes_settle_seconds: float = 5
+
+
+class ReminderSettings(BaseModel):
+    # Run the due-reminder scheduler inside the application process.
+    enabled: bool = False
+    workers: int = 1
+    batch_size: int = 1000
+    poll_interval_seconds: float = 1.0
+
+
+class IdempotencySettings(BaseModel):
+    enabled: bool = True
+    # "database" shares stored responses between workers via idempotency_keys.
+    backend: Literal["memory", "database"] = "memory"
+    ttl_seconds: float = 24 * 3600
+    # How long a request in progress holds its key. A reservation left by a
+    # crashed worker is taken over after this, so keep it a few times longer
+    # than the slowest request.
+    lease_seconds: float = 5 * 60
+    store_size: int = 100_000
+    max_key_length: int = 255
 
 
 class DatabseEngineSettings(BaseModel):
@@ -31,6 +109,22 @@ class DatabseEngineSettings(BaseModel):
     echo_pool: bool
     pool_size: int
     max_overflow: int
+    # Seconds to wait for a free connection before failing with 503.
+    pool_timeout: float = 30
+    # Replace connections older than this, e.g. after a failover (-1: never).
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    pool_use_lifo: bool = False
+    # Answer 503 right away once the pool has been exhausted this long.
+    pool_fail_fast_after_seconds: float | None = None
+    # asyncpg: 0 disables prepared statements (needed behind PgBouncer in
+    # transaction mode).
+    prepared_statement_cache_size: int = 100
+    command_timeout_seconds: float | None = None
+    # Server-side statement_timeout for every session.
+    statement_timeout_ms: int | None = None
+    # Send per-request X-DB-Checkouts / X-DB-Statements response headers.
+    request_stats_headers: bool = False
 
 
 class DatabaseNamingConventionsSettings(BaseModel):
@@ -41,6 +135,11 @@ class DatabaseNamingConventionsSettings(BaseModel):
     pk: str = "pk_%(table_name)s"
 
 
+class DatabaseReplicaSettings(BaseModel):
+    host: str
+    port: int = 5432
+
+
 class DatabaseSettings(BaseModel):
     engine: DatabseEngineSettings
     naming_conventions: DatabaseNamingConventionsSettings = Field(
@@ -51,12 +150,24 @@ class DatabaseSettings(BaseModel):
     user: str
     password: str
     name: str
+    # Read replicas share the primary's credentials and database name.
+    replicas: list[DatabaseReplicaSettings] = Field(default_factory=list)
+    # Reads of a client that wrote within this window go to the primary.
+    replica_sticky_seconds: float = 5
+    # A replica that failed to connect is skipped for this long.
+    replica_retry_seconds: float = 30
+    replica_health_check_interval_seconds: float = 5
 
 
 class Settings(BaseSettings):
     app: AppSettings
     database: DatabaseSettings
     auth: AuthSettings = Field(default_factory=AuthSettings)
+    rate_limit: RateLimitSettings = Field(default_factory=RateLimitSettings)
+    task_logs: TaskLogSettings = Field(default_factory=TaskLogSettings)
+    sync: SyncSettings = Field(default_factory=SyncSettings)
+    reminders: ReminderSettings = Field(default_factory=ReminderSettings)
+    idempotency: IdempotencySettings = Field(default_factory=IdempotencySettings)
     model_config = SettingsConfigDict(
         toml_file=BASE_DIR / "config.toml",
         env_nested_delimiter="__",
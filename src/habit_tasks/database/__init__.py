@@ -1,4 +1,15 @@
 from . import models
-from .database_helper import AsyncDBSessionDep, database_helper, url
+from .database_helper import (
+    AsyncDBReadSessionDep,
+    AsyncDBSessionDep,
+    database_helper,
+    url,
+)
 
-__all__ = ["database_helper", "models", "url", "AsyncDBSessionDep"]
+__all__ = [
+    "database_helper",
+    "models",
+    "url",
+    "AsyncDBReadSessionDep",
+    "AsyncDBSessionDep",
+]
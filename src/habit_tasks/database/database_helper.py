@@ -1,7 +1,13 @@
-from typing import Annotated, AsyncGenerator
+import asyncio
+import hashlib
+import itertools
+import logging
+import time
+from collections.abc import Callable, Sequence
+from typing import Annotated, Any, AsyncGenerator
 
-from fastapi import Depends
-from sqlalchemy import URL
+from fastapi import Depends, Request
+from sqlalchemy import URL, exc, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -9,10 +15,42 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
-from habit_tasks.config import settings
+from habit_tasks.config import DatabseEngineSettings, settings
+from habit_tasks.utils import TTLCache
+
+from .pool import MeasuredAsyncQueuePool, measured_pool
+from .request_stats import track_request_stats
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def asyncpg_connect_args(engine_settings: DatabseEngineSettings) -> dict[str, Any]:
+    connect_args: dict[str, Any] = {
+        "prepared_statement_cache_size": engine_settings.prepared_statement_cache_size,
+    }
+    if engine_settings.command_timeout_seconds is not None:
+        connect_args["command_timeout"] = engine_settings.command_timeout_seconds
+    if engine_settings.statement_timeout_ms is not None:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(engine_settings.statement_timeout_ms)
+        }
+    return connect_args
 
 
 class DatabaseHelper:
+    """Primary engine plus optional read replicas.
+
+    ``read_session_getter`` spreads reads over the healthy replicas, except
+    for clients that sent a mutating request within ``sticky_seconds``: those
+    read from the primary so they see their own writes. A replica that fails
+    a health check or a connection is skipped for ``replica_retry_seconds``.
+
+    Sessions only check out a connection on their first statement, and all
+    primary reads and writes of a request share one session.
+    """
+
     def __init__(
         self,
         url: str,
@@ -20,37 +58,168 @@ class DatabaseHelper:
         echo_pool: bool,
         pool_size: int,
         max_overflow: int,
+        pool_timeout: float = 30,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False,
+        pool_use_lifo: bool = False,
+        pool_fail_fast_after: float | None = None,
+        connect_args: dict[str, Any] | None = None,
+        replica_urls: Sequence[str] = (),
+        sticky_seconds: float = 5,
+        replica_retry_seconds: float = 30,
+        sticky_clients: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
     ) -> None:
-        self.engine: AsyncEngine = create_async_engine(
-            url=url,
-            echo=echo,
-            echo_pool=echo_pool,
-            pool_size=pool_size,
-            max_overflow=max_overflow,
-        )
-        self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
-            bind=self.engine,
-            expire_on_commit=False,
-            autoflush=False,
-            autocommit=False,
+        def create_engine(engine_url: str) -> AsyncEngine:
+            engine = create_async_engine(
+                url=engine_url,
+                echo=echo,
+                echo_pool=echo_pool,
+                poolclass=MeasuredAsyncQueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_recycle=pool_recycle,
+                pool_pre_ping=pool_pre_ping,
+                pool_use_lifo=pool_use_lifo,
+                connect_args=connect_args or {},
+            )
+            measured_pool(engine).fail_fast_after = pool_fail_fast_after
+            track_request_stats(engine)
+            return engine
+
+        def create_session_factory(
+            engine: AsyncEngine,
+        ) -> async_sessionmaker[AsyncSession]:
+            return async_sessionmaker(
+                bind=engine,
+                expire_on_commit=False,
+                autoflush=False,
+                autocommit=False,
+            )
+
+        self.engine: AsyncEngine = create_engine(url)
+        self.session_factory = create_session_factory(self.engine)
+        self.replica_engines: list[AsyncEngine] = [
+            create_engine(replica_url) for replica_url in replica_urls
+        ]
+        self.replica_session_factories = [
+            create_session_factory(engine) for engine in self.replica_engines
+        ]
+
+        self.clock = clock
+        self.replica_retry_seconds = replica_retry_seconds
+        self.unhealthy_until: dict[int, float] = {}
+        self.sticky: TTLCache[bytes, bool] = TTLCache(
+            maxsize=sticky_clients, ttl=sticky_seconds, timer=clock
         )
+        self._round_robin = itertools.count()
+
+    def pool_stats(self) -> dict[str, float]:
+        return measured_pool(self.engine).stats()
 
     async def dispose(self) -> None:
         await self.engine.dispose()
+        for engine in self.replica_engines:
+            await engine.dispose()
 
-    async def session_getter(self) -> AsyncGenerator[AsyncSession, None]:
-        async with self.session_factory() as session:
+    def sticky_key(self, request: Request) -> bytes | None:
+        # Hash of the credentials, so that no user lookup is needed here.
+        authorization = request.headers.get("authorization")
+        if not authorization:
+            return None
+        return hashlib.sha256(authorization.encode()).digest()
+
+    def mark_written(self, request: Request) -> None:
+        if request.method not in SAFE_METHODS and (key := self.sticky_key(request)):
+            self.sticky.set(key, True)
+
+    def mark_unhealthy(self, index: int) -> None:
+        self.unhealthy_until[index] = self.clock() + self.replica_retry_seconds
+
+    async def check_replicas(self) -> None:
+        for index, engine in enumerate(self.replica_engines):
+            try:
+                async with engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+            except (exc.DBAPIError, OSError):
+                self.mark_unhealthy(index)
+            else:
+                self.unhealthy_until.pop(index, None)
+
+    async def monitor_replicas(self, interval: float) -> None:
+        while True:
+            try:
+                await self.check_replicas()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Read replica health check failed")
+            await asyncio.sleep(interval)
+
+    def pick_replica(self, request: Request) -> int | None:
+        """Index of the replica to read from, or None for the primary."""
+        if not self.replica_session_factories:
+            return None
+        if (key := self.sticky_key(request)) and self.sticky.get(key):
+            return None
+
+        now = self.clock()
+        healthy = [
+            index
+            for index in range(len(self.replica_session_factories))
+            if self.unhealthy_until.get(index, 0) <= now
+        ]
+        if not healthy:
+            return None
+        return healthy[next(self._round_robin) % len(healthy)]
+
+    def request_session(self, request: Request) -> AsyncSession:
+        """The primary session of ``request``, created on first use."""
+        session = getattr(request.state, "db_session", None)
+        if session is None:
+            session = request.state.db_session = self.session_factory()
+        return session
+
+    async def session_getter(
+        self, request: Request
+    ) -> AsyncGenerator[AsyncSession, None]:
+        # Marked on both ends: before, so a read racing this request already
+        # goes to the primary, and after, so the window starts at the write.
+        self.mark_written(request)
+        async with self.request_session(request) as session:
             yield session
+        self.mark_written(request)
+
+    async def read_session_getter(
+        self, request: Request
+    ) -> AsyncGenerator[AsyncSession, None]:
+        index = self.pick_replica(request)
+        if index is None:
+            async with self.request_session(request) as session:
+                yield session
+            return
+
+        async with self.replica_session_factories[index]() as session:
+            try:
+                yield session
+            except (exc.OperationalError, exc.InterfaceError, OSError):
+                self.mark_unhealthy(index)
+                raise
+
+
+def database_url(host: str, port: int) -> str:
+    return URL.create(
+        drivername=f"{settings.database.engine.name}+asyncpg",
+        username=settings.database.user,
+        password=settings.database.password,
+        host=host,
+        port=port,
+        database=settings.database.name,
+    ).render_as_string(hide_password=False)
 
 
-url = URL.create(
-    drivername=f"{settings.database.engine.name}+asyncpg",
-    username=settings.database.user,
-    password=settings.database.password,
-    host=settings.database.host,
-    port=settings.database.port,
-    database=settings.database.name,
-).render_as_string(hide_password=False)
+url = database_url(settings.database.host, settings.database.port)
 
 database_helper = DatabaseHelper(
     url=url,
@@ -58,6 +227,22 @@ database_helper = DatabaseHelper(
     echo_pool=settings.database.engine.echo_pool,
     pool_size=settings.database.engine.pool_size,
     max_overflow=settings.database.engine.max_overflow,
+    pool_timeout=settings.database.engine.pool_timeout,
+    pool_recycle=settings.database.engine.pool_recycle,
+    pool_pre_ping=settings.database.engine.pool_pre_ping,
+    pool_use_lifo=settings.database.engine.pool_use_lifo,
+    pool_fail_fast_after=settings.database.engine.pool_fail_fast_after_seconds,
+    connect_args=asyncpg_connect_args(settings.database.engine),
+    replica_urls=[
+        database_url(replica.host, replica.port)
+        for replica in settings.database.replicas
+    ],
+    sticky_seconds=settings.database.replica_sticky_seconds,
+    replica_retry_seconds=settings.database.replica_retry_seconds,
 )
 
 AsyncDBSessionDep = Annotated[AsyncSession, Depends(database_helper.session_getter)]
+# Routed to a read replica when configured; see DatabaseHelper.
+AsyncDBReadSessionDep = Annotated[
+    AsyncSession, Depends(database_helper.read_session_getter)
+]
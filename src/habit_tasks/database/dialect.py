@@ -0,0 +1,35 @@
+from typing import Any
+
+from sqlalchemy import Integer
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+def dialect_insert(session: AsyncSession, entity: Any) -> Any:
+    """Return an INSERT construct that supports ``ON CONFLICT`` for the session's
+    dialect (PostgreSQL in production, SQLite in tests)."""
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(entity)
+    return postgresql.insert(entity)
+
+
+class day_number(FunctionElement):
+    """Days since 1970-01-01 of a DATE expression, as an integer."""
+
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(day_number, "postgresql")
+def compile_day_number_postgresql(element, compiler, **kw) -> str:
+    return f"({compiler.process(element.clauses, **kw)} - DATE '1970-01-01')"
+
+
+@compiles(day_number, "sqlite")
+def compile_day_number_sqlite(element, compiler, **kw) -> str:
+    return (
+        f"(CAST(julianday({compiler.process(element.clauses, **kw)}) AS INTEGER)"
+        " - 2440587)"
+    )
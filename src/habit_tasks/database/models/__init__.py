@@ -1,6 +1,22 @@
 from .base import Base
+from .idempotency_key import IdempotencyKey
 from .task import Task
+from .task_aggregate import TaskAggregate
 from .task_log import TaskLog
+from .task_log_bitmap import TaskLogBitmap
+from .task_reminder import TaskReminder
+from .tombstone import SyncEntity, Tombstone
 from .user import User
 
-__all__ = ["Base", "Task", "TaskLog", "User"]
+__all__ = [
+    "Base",
+    "IdempotencyKey",
+    "SyncEntity",
+    "Task",
+    "TaskAggregate",
+    "TaskLog",
+    "TaskLogBitmap",
+    "TaskReminder",
+    "Tombstone",
+    "User",
+]
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from datetime import date as DateType
+
+from sqlalchemy import Date, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class TaskAggregate(Base):
+    task_id: Mapped[int] = mapped_column(
+        ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    total_completions: Mapped[int] = mapped_column(default=0)
+    # Length of the streak ending at last_completed; whether it is still
+    # running depends on the reader's "today".
+    current_streak: Mapped[int] = mapped_column(default=0)
+    longest_streak: Mapped[int] = mapped_column(default=0)
+    last_completed: Mapped[DateType | None] = mapped_column(Date, nullable=True)
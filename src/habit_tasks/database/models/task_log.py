@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from datetime import date as DateType
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, Date, ForeignKey, UniqueConstraint
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -15,7 +16,20 @@ if TYPE_CHECKING:
 
 class TaskLog(Base, IntIDPkMixin):
     task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"))
-    date: Mapped[DateType] = mapped_column(Date, default=DateType.today, index=True)
+    date: Mapped[DateType] = mapped_column(Date)
     status: Mapped[bool] = mapped_column(Boolean, default=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
     task: Mapped["Task"] = relationship("Task", back_populates="logs")
-    __table_args__ = (UniqueConstraint("task_id", "date", name="uq_task_log_date"),)
+    # The unique (task_id, date) index serves every per-task date lookup and
+    # range scan, so date needs no index of its own. On PostgreSQL the table
+    # is range-partitioned by month on date (see database/partitions.py) and
+    # its primary key there is (id, date). Change pulls scan
+    # (task_id, updated_at) for the tasks of one user.
+    __table_args__ = (
+        UniqueConstraint("task_id", "date", name="uq_task_log_date"),
+        Index("ix_task_logs_task_id_updated_at", "task_id", "updated_at"),
+    )
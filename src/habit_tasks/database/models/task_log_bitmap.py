@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from datetime import date as DateType
+
+from sqlalchemy import Date, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class TaskLogBitmap(Base):
+    task_id: Mapped[int] = mapped_column(
+        ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    # First day of the month; bit n of days marks day n + 1 as completed.
+    month: Mapped[DateType] = mapped_column(Date, primary_key=True)
+    days: Mapped[int] = mapped_column(default=0)
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from datetime import datetime, time
+
+from sqlalchemy import DateTime, ForeignKey, String, Time
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .mixins import IntIDPkMixin
+
+
+class TaskReminder(Base, IntIDPkMixin):
+    """One row per entry of ``Task.reminders``, queued by its next fire time."""
+
+    task_id: Mapped[int] = mapped_column(
+        ForeignKey("tasks.id", ondelete="CASCADE"), index=True
+    )
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+    local_time: Mapped[time] = mapped_column(Time)
+    timezone: Mapped[str] = mapped_column(String(64))
+    next_fire_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
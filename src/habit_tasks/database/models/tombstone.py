@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from datetime import date as DateType
+from datetime import datetime, timezone
+from enum import Enum as PyEnum
+
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .mixins import IntIDPkMixin
+
+
+class SyncEntity(str, PyEnum):
+    TASK = "task"
+    TASK_LOG = "task_log"
+
+
+class Tombstone(Base, IntIDPkMixin):
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    entity: Mapped[SyncEntity] = mapped_column(
+        Enum(SyncEntity, native_enum=False), nullable=False
+    )
+    entity_id: Mapped[int]
+    task_id: Mapped[int | None]
+    date: Mapped[DateType | None] = mapped_column(Date, nullable=True)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+    __table_args__ = (
+        Index("ix_tombstones_user_id_deleted_at", "user_id", "deleted_at"),
+    )
@@ -32,6 +32,11 @@ class User(Base, IntIDPkMixin):
         nullable=False,
     )
 
+    # IANA name; decides which calendar day counts as "today" for the user.
+    timezone: Mapped[str] = mapped_column(
+        String(64), default="UTC", server_default="UTC", nullable=False
+    )
+
     tasks: Mapped[list["Task"]] = relationship(
         "Task", back_populates="user", cascade="all, delete-orphan"
     )
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import re
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+PARTITION_NAME_RE = re.compile(r"^task_logs_p(\d{4})_(\d{2})$")
+DEFAULT_PARTITION = "task_logs_default"
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"task_logs_p{month.year:04}_{month.month:02}"
+
+
+async def list_task_log_partitions(connection: AsyncConnection) -> list[date]:
+    result = await connection.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'task_logs'::regclass"
+        )
+    )
+    months = []
+    for (name,) in result:
+        if match := PARTITION_NAME_RE.match(name):
+            months.append(date(int(match[1]), int(match[2]), 1))
+    return sorted(months)
+
+
+def create_partition_statements(month: date, move_default_rows: bool) -> list[str]:
+    """SQL creating the partition of ``month``.
+
+    PostgreSQL refuses to create a partition while the default partition
+    holds rows in its range (e.g. future dates accepted by sync), so those
+    are moved out with the default partition detached.
+    """
+    bounds = f"FROM ('{month}') TO ('{add_months(month, 1)}')"
+    create = (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+        f"PARTITION OF task_logs FOR VALUES {bounds}"
+    )
+    if not move_default_rows:
+        return [create]
+
+    in_range = f"date >= '{month}' AND date < '{add_months(month, 1)}'"
+    columns = "id, task_id, date, status, updated_at"
+    return [
+        f"ALTER TABLE task_logs DETACH PARTITION {DEFAULT_PARTITION}",
+        create,
+        f"INSERT INTO task_logs ({columns}) "
+        f"SELECT {columns} FROM {DEFAULT_PARTITION} WHERE {in_range}",
+        f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}",
+        f"ALTER TABLE task_logs ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT",
+    ]
+
+
+async def default_partition_has_rows(connection: AsyncConnection, month: date) -> bool:
+    stmt = text(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+        "WHERE date >= :start AND date < :end)"
+    )
+    result = await connection.execute(
+        stmt, {"start": month, "end": add_months(month, 1)}
+    )
+    return bool(result.scalar())
+
+
+async def create_task_log_partitions(
+    connection: AsyncConnection,
+    months_ahead: int,
+    today: date | None = None,
+) -> list[date]:
+    """Create the monthly partitions from the current month up to
+    ``months_ahead`` months into the future. Returns the months created."""
+    current = (today or date.today()).replace(day=1)
+    existing = set(await list_task_log_partitions(connection))
+
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month in existing:
+            continue
+        move_default_rows = await default_partition_has_rows(connection, month)
+        for statement in create_partition_statements(month, move_default_rows):
+            await connection.execute(text(statement))
+        created.append(month)
+    return created
+
+
+async def maintain_task_log_partitions(
+    engine: AsyncEngine,
+    months_ahead: int,
+    interval: float,
+) -> None:
+    """Background loop keeping future partitions in place, so that new rows
+    never land in the default partition."""
+    while True:
+        try:
+            async with engine.begin() as connection:
+                created = await create_task_log_partitions(connection, months_ahead)
+            if created:
+                logger.info("Created task_logs partitions for %s", created)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("task_logs partition maintenance failed")
+        await asyncio.sleep(interval)
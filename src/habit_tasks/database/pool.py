@@ -0,0 +1,107 @@
+import time
+from typing import cast
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolExhaustedError(exc.TimeoutError):
+    """Checkout rejected without waiting because the pool has had no free
+    connection for longer than ``fail_fast_after``."""
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.checkouts = 0
+        # Checkouts that found every connection in use and had to queue.
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self.rejections = 0
+
+    def record(self, waited: bool, seconds: float) -> None:
+        self.checkouts += 1
+        if waited:
+            self.waits += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "wait_seconds": self.wait_seconds,
+            "max_wait_seconds": self.max_wait_seconds,
+            "avg_wait_seconds": self.wait_seconds / self.waits if self.waits else 0.0,
+            "timeouts": self.timeouts,
+            "rejections": self.rejections,
+        }
+
+
+class MeasuredAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long checkouts wait for a
+    connection.
+
+    With ``fail_fast_after`` set, once every checkout for that many seconds
+    has found the pool exhausted, further checkouts raise PoolExhaustedError
+    right away instead of queueing for the full pool timeout.
+    """
+
+    fail_fast_after: float | None = None
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        self.exhausted_since: float | None = None
+
+    def exhausted(self) -> bool:
+        return (
+            self._max_overflow > -1
+            and self._overflow >= self._max_overflow
+            and self._pool.empty()
+        )
+
+    def _do_get(self):
+        start = time.monotonic()
+        waited = self.exhausted()
+        if not waited:
+            self.exhausted_since = None
+        elif self.exhausted_since is None:
+            self.exhausted_since = start
+        elif (
+            self.fail_fast_after is not None
+            and start - self.exhausted_since >= self.fail_fast_after
+        ):
+            self.metrics.rejections += 1
+            raise PoolExhaustedError(
+                f"Connection pool exhausted for over {self.fail_fast_after}s"
+            )
+
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        self.metrics.record(waited, time.monotonic() - start)
+        return connection
+
+    def recreate(self) -> "MeasuredAsyncQueuePool":
+        pool = cast(MeasuredAsyncQueuePool, super().recreate())
+        pool.fail_fast_after = self.fail_fast_after
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> dict[str, float]:
+        return {
+            **self.metrics.stats(),
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+        }
+
+
+def measured_pool(engine: AsyncEngine) -> MeasuredAsyncQueuePool:
+    """The pool of an engine created with ``poolclass=MeasuredAsyncQueuePool``."""
+    return cast(MeasuredAsyncQueuePool, engine.pool)
@@ -0,0 +1,79 @@
+import logging
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from habit_tasks.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RequestDBStats:
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.statements = 0
+
+
+current_request_stats: ContextVar[RequestDBStats | None] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+def count_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    if (stats := current_request_stats.get()) is not None:
+        stats.checkouts += 1
+
+
+def count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    if (stats := current_request_stats.get()) is not None:
+        stats.statements += 1
+
+
+def track_request_stats(engine: AsyncEngine) -> None:
+    # SQLAlchemy runs these inside greenlets that inherit the request's
+    # context, so they see the stats set by RequestDBStatsMiddleware.
+    event.listen(engine.sync_engine, "checkout", count_checkout)
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+
+
+class RequestDBStatsMiddleware:
+    """Counts the pool checkouts and statements of each request on engines
+    passed to ``track_request_stats``. Logged at DEBUG, and sent as
+    X-DB-Checkouts / X-DB-Statements headers if request_stats_headers is on.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDBStats()
+        token = current_request_stats.set(stats)
+
+        async def send_with_stats(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and settings.database.engine.request_stats_headers
+            ):
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Checkouts", str(stats.checkouts))
+                headers.append("X-DB-Statements", str(stats.statements))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            current_request_stats.reset(token)
+            logger.debug(
+                "%s %s: %d checkouts, %d statements",
+                scope["method"],
+                scope["path"],
+                stats.checkouts,
+                stats.statements,
+            )
@@ -1,22 +1,94 @@
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy import exc
 
 from habit_tasks import api
+from habit_tasks.api.idempotency import IdempotencyMiddleware, idempotency_store
+from habit_tasks.api.v1.auth.password_hasher import password_hasher
 from habit_tasks.config import settings
 from habit_tasks.database import database_helper
+from habit_tasks.database.partitions import maintain_task_log_partitions
+from habit_tasks.database.request_stats import RequestDBStatsMiddleware
+from habit_tasks.reminders import LoggingReminderSink, ReminderScheduler, ReminderSink
+
+logger = logging.getLogger(__name__)
+
+# Replace with a real delivery backend (push, e-mail, queue, ...).
+reminder_sink: ReminderSink = LoggingReminderSink()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    background: list[asyncio.Task] = []
+    if database_helper.engine.dialect.name == "postgresql":
+        background.append(
+            asyncio.create_task(
+                maintain_task_log_partitions(
+                    database_helper.engine,
+                    settings.task_logs.partition_months_ahead,
+                    settings.task_logs.partition_maintenance_interval_seconds,
+                )
+            )
+        )
+    if database_helper.replica_engines:
+        background.append(
+            asyncio.create_task(
+                database_helper.monitor_replicas(
+                    settings.database.replica_health_check_interval_seconds
+                )
+            )
+        )
+    if settings.reminders.enabled:
+        scheduler = ReminderScheduler(
+            database_helper.session_factory,
+            reminder_sink,
+            batch_size=settings.reminders.batch_size,
+            poll_interval=settings.reminders.poll_interval_seconds,
+        )
+        background.extend(
+            asyncio.create_task(scheduler.run())
+            for _ in range(settings.reminders.workers)
+        )
+
     yield
+
+    for task in background:
+        task.cancel()
+    for task in background:
+        with suppress(asyncio.CancelledError):
+            await task
+    password_hasher.shutdown()
     await database_helper.dispose()
 
 
 app = FastAPI(lifespan=lifespan)
 
+
+@app.exception_handler(exc.TimeoutError)
+async def database_pool_timeout_handler(
+    request: Request, error: exc.TimeoutError
+) -> JSONResponse:
+    # Pool timeout or fail-fast rejection (see database/pool.py).
+    logger.warning(
+        "%s %s: %s; primary pool: %s",
+        request.method,
+        request.url.path,
+        error,
+        database_helper.pool_stats(),
+    )
+    return JSONResponse(
+        {"detail": "Server is busy, try again later"},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "1"},
+    )
+
+
 origins = [
     "http://localhost:3000",
     "http://localhost:5173",
@@ -24,6 +96,10 @@ origins = [
     "http://127.0.0.1:5173",
 ]
 
+# Added before CORS so that it wraps replayed responses too.
+if settings.idempotency.enabled:
+    app.add_middleware(IdempotencyMiddleware, store=idempotency_store)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -32,6 +108,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so that the counts cover every other middleware.
+app.add_middleware(RequestDBStatsMiddleware)
+
 app.include_router(router=api.router)
 
 
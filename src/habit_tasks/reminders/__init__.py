@@ -0,0 +1,18 @@
+from .schedule import next_fire_at, parse_reminder_time
+from .scheduler import ReminderScheduler
+from .sinks import (
+    InMemoryReminderSink,
+    LoggingReminderSink,
+    ReminderDelivery,
+    ReminderSink,
+)
+
+__all__ = [
+    "InMemoryReminderSink",
+    "LoggingReminderSink",
+    "ReminderDelivery",
+    "ReminderScheduler",
+    "ReminderSink",
+    "next_fire_at",
+    "parse_reminder_time",
+]
@@ -0,0 +1,24 @@
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+
+def parse_reminder_time(value: str) -> time:
+    """Parse an ``HH:MM`` (or ``HH:MM:SS``) wall-clock time."""
+    parsed = time.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        raise ValueError("Reminder times are local to the user's timezone")
+    return parsed
+
+
+def next_fire_at(local_time: time, tz_name: str, after: datetime) -> datetime:
+    """First moment strictly after ``after`` at which the user's clock shows
+    ``local_time``, in UTC."""
+    zone = ZoneInfo(tz_name)
+    local_day = after.astimezone(zone).date()
+
+    candidate = datetime.combine(local_day, local_time, tzinfo=zone)
+    if candidate <= after:
+        candidate = datetime.combine(
+            local_day + timedelta(days=1), local_time, tzinfo=zone
+        )
+    return candidate.astimezone(timezone.utc)
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from habit_tasks.database.models import TaskReminder
+
+from .schedule import next_fire_at
+from .sinks import ReminderDelivery, ReminderSink
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderScheduler:
+    """Drains due reminders in batches. Rows are claimed with
+    ``FOR UPDATE SKIP LOCKED``, so any number of schedulers (tasks or
+    processes) can share the queue without handing out a reminder twice."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        sink: ReminderSink,
+        batch_size: int = 1000,
+        poll_interval: float = 1.0,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        self.session_factory = session_factory
+        self.sink = sink
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.clock = clock
+
+    async def run_once(self) -> int:
+        now = self.clock()
+        stmt = (
+            select(TaskReminder)
+            .where(TaskReminder.next_fire_at <= now)
+            .order_by(TaskReminder.next_fire_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.session_factory() as session:
+            reminders = (await session.scalars(stmt)).all()
+            if not reminders:
+                return 0
+
+            await self.sink.deliver(
+                [
+                    ReminderDelivery(
+                        reminder.id, reminder.task_id, reminder.user_id, now
+                    )
+                    for reminder in reminders
+                ]
+            )
+            # Missed occurrences (e.g. after downtime) collapse into this one.
+            for reminder in reminders:
+                reminder.next_fire_at = next_fire_at(
+                    reminder.local_time, reminder.timezone, now
+                )
+            await session.commit()
+            return len(reminders)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                claimed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Reminder batch failed")
+                claimed = 0
+
+            if claimed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
@@ -0,0 +1,34 @@
+import logging
+from collections.abc import Sequence
+from datetime import datetime
+from typing import NamedTuple, Protocol
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderDelivery(NamedTuple):
+    reminder_id: int
+    task_id: int
+    user_id: int
+    fire_at: datetime
+
+
+class ReminderSink(Protocol):
+    """Delivery backend (push, e-mail, queue, ...). Called inside the claiming
+    transaction: raising leaves the batch due, so delivery is at least once."""
+
+    async def deliver(self, deliveries: Sequence[ReminderDelivery]) -> None: ...
+
+
+class InMemoryReminderSink:
+    def __init__(self) -> None:
+        self.deliveries: list[ReminderDelivery] = []
+
+    async def deliver(self, deliveries: Sequence[ReminderDelivery]) -> None:
+        self.deliveries.extend(deliveries)
+
+
+class LoggingReminderSink:
+    async def deliver(self, deliveries: Sequence[ReminderDelivery]) -> None:
+        for delivery in deliveries:
+            logger.info("Reminder due: %s", delivery)
@@ -1,23 +1,94 @@
-from datetime import date
-from typing import List
+from datetime import date as DateType
+from datetime import datetime
+from enum import Enum
+from typing import Any, List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
-from habit_tasks.schemas.task import TaskCreate
+from habit_tasks.database.models.tombstone import SyncEntity
+from habit_tasks.schemas.task import TaskBase, TaskCreate
+
+
+class SyncItemStatus(str, Enum):
+    CREATED = "created"
+    DUPLICATE = "duplicate"
+    REJECTED_NOT_OWNED = "rejected_not_owned"
+    INVALID = "invalid"
+
+
+class SyncTaskCreate(TaskCreate):
+    client_id: str | None = Field(default=None, max_length=64)
 
 
 class TaskLogSync(BaseModel):
-    task_id: int
-    date: date
+    task_id: int | None = None
+    task_client_id: str | None = None
+    date: DateType
     status: bool
 
 
 class SyncPayload(BaseModel):
-    created_tasks: List[TaskCreate] = []
-    new_logs: List[TaskLogSync] = []
+    # Items are validated one by one as SyncTaskCreate / TaskLogSync, so an
+    # invalid item is reported as such instead of failing the whole sync.
+    created_tasks: List[dict[str, Any]] = []
+    new_logs: List[dict[str, Any]] = []
+
+
+class SyncTaskResult(BaseModel):
+    index: int
+    client_id: str | None = None
+    id: int | None = None
+    status: SyncItemStatus
+    detail: str | None = None
+
+
+class SyncLogResult(BaseModel):
+    index: int
+    task_id: int | None = None
+    # None when the item itself failed validation.
+    date: DateType | None = None
+    status: SyncItemStatus
+    detail: str | None = None
 
 
 class SyncResponse(BaseModel):
     processed_tasks: int
     processed_logs: int
+    tasks: List[SyncTaskResult] = []
+    logs: List[SyncLogResult] = []
+    task_ids: dict[str, int] = {}
     status: str = "ok"
+
+
+class SyncTaskChange(TaskBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SyncLogChange(BaseModel):
+    id: int
+    task_id: int
+    date: DateType
+    status: bool
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SyncDeletion(BaseModel):
+    entity: SyncEntity
+    id: int
+    task_id: int | None = None
+    date: DateType | None = None
+    deleted_at: datetime
+
+
+class SyncChangesResponse(BaseModel):
+    tasks: List[SyncTaskChange] = []
+    logs: List[SyncLogChange] = []
+    deleted: List[SyncDeletion] = []
+    cursor: str | None = None
+    has_more: bool = False
@@ -1,22 +1,35 @@
-from datetime import datetime
+from datetime import date, datetime
+from typing import Annotated, Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
+
+from habit_tasks.reminders import parse_reminder_time
+
+
+def normalize_reminder(value: str) -> str:
+    return parse_reminder_time(value).isoformat("minutes")
+
+
+# Local wall-clock time of a daily reminder, normalized to HH:MM.
+ReminderTime = Annotated[str, AfterValidator(normalize_reminder)]
 
 
 class TaskBase(BaseModel):
     title: str = Field(min_length=1, max_length=100)
     description: str | None = Field(default=None, max_length=500)
+    # Not validated on the way out: rows written before ReminderTime may hold
+    # other strings.
     reminders: list[str] | None = None
 
 
 class TaskCreate(TaskBase):
-    pass
+    reminders: list[ReminderTime] | None = None
 
 
 class TaskUpdate(BaseModel):
     title: str | None = Field(default=None, min_length=1, max_length=100)
     description: str | None = Field(default=None, max_length=500)
-    reminders: list[str] | None = None
+    reminders: list[ReminderTime] | None = None
 
 
 class TaskResponse(TaskBase):
@@ -29,9 +42,34 @@ class TaskResponse(TaskBase):
 
 
 class TaskLogResponse(BaseModel):
-    id: int
+    # None when the log is served from bitmap storage.
+    id: int | None = None
     task_id: int
     date: datetime
     status: bool
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TaskCompletionHistory(BaseModel):
+    task_id: int
+    dates: list[date] | None = None
+    # Base64 bitmap, bit i (LSB-first per byte) set when date_from + i days
+    # was completed.
+    bitmap: str | None = None
+
+
+class CompletionHistoryResponse(BaseModel):
+    date_from: date
+    date_to: date
+    encoding: Literal["dates", "bitmap"]
+    tasks: list[TaskCompletionHistory]
+
+
+class TaskStats(BaseModel):
+    task_id: int
+    total_completions: int = 0
+    current_streak: int = 0
+    longest_streak: int = 0
+    last_completed: date | None = None
+    completion_rate: float = 0.0
@@ -0,0 +1,49 @@
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+from habit_tasks.schemas.task import (
+    TaskCreate,
+    TaskLogResponse,
+    TaskResponse,
+    TaskUpdate,
+)
+
+MAX_BATCH_SIZE = 500
+
+
+class BatchItemStatus(str, Enum):
+    OK = "ok"
+    NOT_FOUND = "not_found"
+    ALREADY_COMPLETED = "already_completed"
+    INVALID = "invalid"
+
+
+class TaskBatchCreate(BaseModel):
+    tasks: list[TaskCreate] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskBatchUpdateItem(TaskUpdate):
+    id: int
+
+
+class TaskBatchUpdate(BaseModel):
+    tasks: list[TaskBatchUpdateItem] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskBatchIds(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskBatchResult(BaseModel):
+    index: int
+    id: int | None = None
+    status: BatchItemStatus
+    task: TaskResponse | None = None
+    log: TaskLogResponse | None = None
+    detail: str | None = None
+
+
+class TaskBatchResponse(BaseModel):
+    results: list[TaskBatchResult]
+    status: str = "ok"
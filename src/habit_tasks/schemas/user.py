@@ -1,12 +1,32 @@
-from pydantic import BaseModel, ConfigDict, EmailStr
+from datetime import date, datetime
+from typing import Annotated
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from pydantic import AfterValidator, BaseModel, ConfigDict, EmailStr
 
 from habit_tasks.database.models.user import UserRole
 
 
+def check_timezone(value: str) -> str:
+    try:
+        ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {value}")
+    return value
+
+
+TimezoneName = Annotated[str, AfterValidator(check_timezone)]
+
+
 class UserCreate(BaseModel):
     username: str
     email: EmailStr
     password: str
+    timezone: TimezoneName = "UTC"
+
+
+class UserUpdate(BaseModel):
+    timezone: TimezoneName | None = None
 
 
 class UserRead(BaseModel):
@@ -14,5 +34,18 @@ class UserRead(BaseModel):
     username: str
     email: EmailStr
     role: UserRole
+    timezone: str
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class UserPrincipal(BaseModel):
+    id: int
+    username: str
+    role: UserRole
+    timezone: str = "UTC"
+
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
+    def today(self) -> date:
+        return datetime.now(ZoneInfo(self.timezone)).date()
@@ -1,3 +1,38 @@
+from .bitmap import (
+    decode_day_bitmap,
+    decode_month_bits,
+    encode_day_bitmap,
+    month_day_mask,
+    month_start,
+)
+from .cache import TTLCache
 from .change_case import camel_case_to_snake_case
+from .completion_cache import CompletedTodayStore, InMemoryCompletedTodayStore
+from .cursor import decode_cursor, encode_cursor
+from .idempotency import (
+    IdempotencyRecord,
+    IdempotencyStore,
+    InMemoryIdempotencyStore,
+    StoredResponse,
+)
+from .rate_limit import InMemoryRateLimitStore, RateLimitStore
 
-__all__ = ["camel_case_to_snake_case"]
+__all__ = [
+    "CompletedTodayStore",
+    "IdempotencyRecord",
+    "IdempotencyStore",
+    "InMemoryCompletedTodayStore",
+    "InMemoryIdempotencyStore",
+    "InMemoryRateLimitStore",
+    "RateLimitStore",
+    "StoredResponse",
+    "TTLCache",
+    "camel_case_to_snake_case",
+    "decode_cursor",
+    "decode_day_bitmap",
+    "decode_month_bits",
+    "encode_cursor",
+    "encode_day_bitmap",
+    "month_day_mask",
+    "month_start",
+]
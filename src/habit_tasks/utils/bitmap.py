@@ -0,0 +1,37 @@
+from collections.abc import Iterable, Iterator
+from datetime import date, timedelta
+
+
+def encode_day_bitmap(days: Iterable[date], start: date, length: int) -> bytes:
+    """Pack dates into a bitmap where bit ``i`` (LSB-first within each byte)
+    marks ``start + i`` days. Dates outside the range are ignored."""
+    bitmap = bytearray((length + 7) // 8)
+    for day in days:
+        offset = (day - start).days
+        if 0 <= offset < length:
+            bitmap[offset >> 3] |= 1 << (offset & 7)
+    return bytes(bitmap)
+
+
+def decode_day_bitmap(bitmap: bytes, start: date) -> Iterator[date]:
+    for index, byte in enumerate(bitmap):
+        while byte:
+            bit = (byte & -byte).bit_length() - 1
+            yield start + timedelta(days=index * 8 + bit)
+            byte &= byte - 1
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def month_day_mask(day: date) -> int:
+    """Bit of ``day`` within its month's bitmask (bit 0 is the 1st)."""
+    return 1 << (day.day - 1)
+
+
+def decode_month_bits(month: date, bits: int) -> Iterator[date]:
+    while bits:
+        bit = (bits & -bits).bit_length() - 1
+        yield month + timedelta(days=bit)
+        bits &= bits - 1
@@ -0,0 +1,92 @@
+import itertools
+import time
+from collections.abc import Callable, Iterable
+from datetime import date
+from typing import Protocol
+
+from .cache import TTLCache
+
+
+class CompletedTodayStore(Protocol):
+    """Per-user set of task ids completed on a given day; implement it over a
+    shared store (e.g. Redis) to share it between workers."""
+
+    async def get(self, user_id: int, day: date) -> set[int] | None:
+        """Return the cached set for ``day``, or None if unknown."""
+        ...
+
+    async def generation(self, user_id: int) -> int:
+        """Changes whenever ``add`` or ``discard`` runs for the user."""
+        ...
+
+    async def set(
+        self,
+        user_id: int,
+        day: date,
+        task_ids: Iterable[int],
+        generation: int | None = None,
+    ) -> None:
+        """Cache ``task_ids``. With ``generation``, skipped if the user's
+        generation has changed since, i.e. the set may already be stale."""
+        ...
+
+    async def add(self, user_id: int, day: date, task_id: int) -> None:
+        """Record a completion if ``day``'s set is cached."""
+        ...
+
+    async def discard(self, user_id: int, day: date, task_id: int) -> None: ...
+
+    async def clear(self) -> None: ...
+
+
+class InMemoryCompletedTodayStore:
+    """Keeps one day per user; an entry for an earlier day counts as a miss,
+    so the set resets when the day rolls over."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float | None = None,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.entries: TTLCache[int, tuple[date, frozenset[int]]] = TTLCache(
+            maxsize=maxsize, ttl=ttl, timer=timer
+        )
+        # Values come from one global counter, so a generation that was
+        # evicted and bumped again never matches an older read.
+        self.generations: TTLCache[int, int] = TTLCache(maxsize=maxsize)
+        self._counter = itertools.count(1)
+
+    async def get(self, user_id: int, day: date) -> set[int] | None:
+        entry = self.entries.get(user_id)
+        if entry is None or entry[0] != day:
+            return None
+        return set(entry[1])
+
+    async def generation(self, user_id: int) -> int:
+        return self.generations.get(user_id) or 0
+
+    async def set(
+        self,
+        user_id: int,
+        day: date,
+        task_ids: Iterable[int],
+        generation: int | None = None,
+    ) -> None:
+        if generation is not None and generation != await self.generation(user_id):
+            return
+        self.entries.set(user_id, (day, frozenset(task_ids)))
+
+    async def add(self, user_id: int, day: date, task_id: int) -> None:
+        self.generations.set(user_id, next(self._counter))
+        if (task_ids := await self.get(user_id, day)) is not None:
+            await self.set(user_id, day, task_ids | {task_id})
+
+    async def discard(self, user_id: int, day: date, task_id: int) -> None:
+        self.generations.set(user_id, next(self._counter))
+        if (task_ids := await self.get(user_id, day)) is not None:
+            await self.set(user_id, day, task_ids - {task_id})
+
+    async def clear(self) -> None:
+        self.entries.clear()
+        self.generations.clear()
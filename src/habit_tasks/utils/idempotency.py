@@ -0,0 +1,76 @@
+import time
+from collections.abc import Callable
+from typing import NamedTuple, Protocol
+
+from .cache import TTLCache
+
+
+class StoredResponse(NamedTuple):
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: bytes
+
+
+class IdempotencyRecord(NamedTuple):
+    fingerprint: str
+    # None while the first request with the key is still running.
+    response: StoredResponse | None = None
+
+
+class IdempotencyStore(Protocol):
+    """Responses of mutating requests keyed by user and ``Idempotency-Key``;
+    implement it over a shared store to dedupe retries across workers."""
+
+    async def reserve(
+        self, user_id: int, key: str, fingerprint: str, lease: float
+    ) -> IdempotencyRecord | None:
+        """Claim ``key`` for a new request for ``lease`` seconds, or until
+        ``save`` keeps its response.
+
+        Returns None if the key was free, otherwise the record already stored
+        under it.
+        """
+        ...
+
+    async def save(
+        self, user_id: int, key: str, response: StoredResponse, ttl: float
+    ) -> None: ...
+
+    async def release(self, user_id: int, key: str) -> None:
+        """Forget a reservation whose request failed, so it can be retried."""
+        ...
+
+    async def clear(self) -> None: ...
+
+
+class InMemoryIdempotencyStore:
+    def __init__(
+        self,
+        maxsize: int,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.records: TTLCache[tuple[int, str], IdempotencyRecord] = TTLCache(
+            maxsize=maxsize, timer=timer
+        )
+
+    async def reserve(
+        self, user_id: int, key: str, fingerprint: str, lease: float
+    ) -> IdempotencyRecord | None:
+        if (record := self.records.get((user_id, key))) is not None:
+            return record
+        self.records.set((user_id, key), IdempotencyRecord(fingerprint), ttl=lease)
+        return None
+
+    async def save(
+        self, user_id: int, key: str, response: StoredResponse, ttl: float
+    ) -> None:
+        if (record := self.records.get((user_id, key))) is not None:
+            self.records.set(
+                (user_id, key), record._replace(response=response), ttl=ttl
+            )
+
+    async def release(self, user_id: int, key: str) -> None:
+        self.records.pop((user_id, key))
+
+    async def clear(self) -> None:
+        self.records.clear()
@@ -0,0 +1,53 @@
+import time
+from collections.abc import Callable
+from typing import Protocol
+
+from .cache import TTLCache
+
+
+class RateLimitStore(Protocol):
+    """Backend holding limiter state; implement it over a shared store (e.g.
+    Redis) to enforce limits across workers."""
+
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        """Consume one request for ``key``.
+
+        Returns 0 if the request is allowed, otherwise the number of seconds
+        until it would be.
+        """
+        ...
+
+    async def reset(self) -> None: ...
+
+
+class InMemoryRateLimitStore:
+    """Token bucket per key: ``limit`` requests burst, refilled evenly over
+    ``window`` seconds. Buckets expire once they would be full again."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.timer = timer
+        self.buckets: TTLCache[str, tuple[float, float]] = TTLCache(
+            maxsize=maxsize, timer=timer
+        )
+
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        now = self.timer()
+        rate = limit / window
+
+        tokens, updated_at = self.buckets.get(key) or (float(limit), now)
+        tokens = min(float(limit), tokens + (now - updated_at) * rate)
+
+        if tokens < 1:
+            self.buckets.set(key, (tokens, now), ttl=window)
+            return (1 - tokens) / rate
+
+        tokens -= 1
+        self.buckets.set(key, (tokens, now), ttl=(limit - tokens) / rate)
+        return 0
+
+    async def reset(self) -> None:
+        self.buckets.clear()
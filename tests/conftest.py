@@ -1,16 +1,23 @@
 import asyncio
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Awaitable, Callable, Generator
 
+import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
+from habit_tasks.api.idempotency import idempotency_store
+from habit_tasks.api.v1.auth.rate_limit import rate_limit_store
+from habit_tasks.api.v1.auth.user_cache import user_cache
 from habit_tasks.api.v1.auth.utils import generate_token_info, hash_password
+from habit_tasks.api.v1.tasks.completion_cache import completed_today_store
+from habit_tasks.config import settings
 from habit_tasks.database.database_helper import database_helper
-from habit_tasks.database.models import Base, User
+from habit_tasks.database.models import Base, Task, User
 from habit_tasks.database.models.user import UserRole
+from habit_tasks.database.request_stats import track_request_stats
 from habit_tasks.main import app
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -34,12 +41,35 @@ TestingSessionLocal = async_sessionmaker(
 )
 
 
-async def override_get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    async with TestingSessionLocal() as session:
-        yield session
+# The real session dependencies run, on the test engine.
+database_helper.session_factory = TestingSessionLocal
+track_request_stats(engine_test)
+
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
 
+@pytest.fixture
+def query_counter() -> Generator[QueryCounter, None, None]:
+    counter = QueryCounter()
+    event.listen(engine_test.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine_test.sync_engine, "before_cursor_execute", counter)
 
-app.dependency_overrides[database_helper.session_getter] = override_get_db_session
+
+@pytest.fixture
+def stateless_access_tokens(monkeypatch) -> None:
+    """Trust token claims, so query counts cover only the endpoint's work."""
+    monkeypatch.setattr(settings.auth, "stateless_access_tokens", True)
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -60,6 +90,10 @@ async def prepare_database():
 
 @pytest_asyncio.fixture(autouse=True)
 async def clear_data_between_tests(session: AsyncSession):
+    user_cache.clear()
+    await rate_limit_store.reset()
+    await completed_today_store.clear()
+    await idempotency_store.clear()
     for table in reversed(Base.metadata.sorted_tables):
         await session.execute(table.delete())
     await session.commit()
@@ -119,3 +153,26 @@ async def user_client(ac: AsyncClient, regular_user: User) -> AsyncClient:
     token_info = generate_token_info(regular_user)
     ac.headers.update({"Authorization": f"Bearer {token_info.access_token}"})
     return ac
+
+
+@pytest.fixture
+def create_task(session: AsyncSession) -> Callable[..., Awaitable[Task]]:
+    async def create(user: User, title: str = "Run") -> Task:
+        task = Task(title=title, user_id=user.id)
+        session.add(task)
+        await session.commit()
+        await session.refresh(task)
+        return task
+
+    return create
+
+
+@pytest.fixture
+def create_tasks(session: AsyncSession) -> Callable[[User, int], Awaitable[list[Task]]]:
+    async def create(user: User, count: int) -> list[Task]:
+        tasks = [Task(title=f"Task {i}", user_id=user.id) for i in range(count)]
+        session.add_all(tasks)
+        await session.commit()
+        return tasks
+
+    return create
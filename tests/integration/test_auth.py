@@ -0,0 +1,210 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from habit_tasks.api.v1.auth.password_hasher import password_hasher
+from habit_tasks.api.v1.auth.utils import (
+    TokenType,
+    decode_token,
+    encode_token,
+    generate_token_info,
+    hash_password,
+    validate_password,
+)
+from habit_tasks.config import RateLimitRule, settings
+from habit_tasks.database.models import User
+from habit_tasks.database.models.user import UserRole
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.mark.usefixtures("stateless_access_tokens")
+async def test_access_token_carries_principal_claims(
+    user_client: AsyncClient, regular_user: User, query_counter
+):
+    response = await user_client.get("/api/v1/tasks/")
+
+    assert response.status_code == 200
+    assert not any("FROM users" in stmt for stmt in query_counter.statements)
+
+
+@pytest.mark.usefixtures("stateless_access_tokens")
+async def test_access_token_without_claims_falls_back_to_db(
+    ac: AsyncClient, regular_user: User, query_counter
+):
+    token = encode_token({"sub": regular_user.username, "type": TokenType.ACCESS})
+    ac.headers.update({"Authorization": f"Bearer {token}"})
+
+    response = await ac.get("/api/v1/tasks/")
+
+    assert response.status_code == 200
+    assert any("FROM users" in stmt for stmt in query_counter.statements)
+
+
+async def test_deleted_user_token_is_rejected_by_default(
+    user_client: AsyncClient, regular_user: User, session: AsyncSession
+):
+    await session.delete(regular_user)
+    await session.commit()
+
+    response = await user_client.get("/api/v1/tasks/")
+    assert response.status_code == 401
+
+
+async def test_refresh_token_is_rejected_as_access_token(
+    ac: AsyncClient, regular_user: User
+):
+    token = encode_token({"sub": regular_user.username, "type": TokenType.REFRESH})
+    ac.headers.update({"Authorization": f"Bearer {token}"})
+
+    response = await ac.get("/api/v1/tasks/")
+    assert response.status_code == 401
+
+
+async def test_refresh_uses_cached_user(
+    ac: AsyncClient, regular_user: User, query_counter
+):
+    token_info = generate_token_info(regular_user)
+    ac.headers.update({"Authorization": f"Bearer {token_info.refresh_token}"})
+
+    assert (await ac.post("/api/v1/auth/refresh")).status_code == 200
+    assert (await ac.post("/api/v1/auth/refresh")).status_code == 200
+
+    user_selects = [stmt for stmt in query_counter.statements if "FROM users" in stmt]
+    assert len(user_selects) == 1
+
+
+async def test_user_update_invalidates_cached_user(
+    ac: AsyncClient, regular_user: User, session: AsyncSession
+):
+    token_info = generate_token_info(regular_user)
+    ac.headers.update({"Authorization": f"Bearer {token_info.access_token}"})
+    assert (await ac.get("/api/v1/auth/users/me")).json()["role"] == "user"
+
+    regular_user.role = UserRole.ADMIN
+    session.add(regular_user)
+    await session.commit()
+
+    assert (await ac.get("/api/v1/auth/users/me")).json()["role"] == "admin"
+
+
+async def test_login_rehashes_password_with_configured_cost(
+    ac: AsyncClient, session: AsyncSession
+):
+    user = User(
+        username="legacy",
+        email="legacy@test.com",
+        password_hash=hash_password("legacypass", rounds=4),
+    )
+    session.add(user)
+    await session.commit()
+
+    response = await ac.post(
+        "/api/v1/auth/login", data={"username": "legacy", "password": "legacypass"}
+    )
+
+    assert response.status_code == 200
+    await session.refresh(user)
+    assert not password_hasher.needs_rehash(user.password_hash)
+    assert validate_password("legacypass", user.password_hash)
+
+
+async def test_login_returns_503_when_hasher_is_saturated(
+    ac: AsyncClient, regular_user: User, monkeypatch
+):
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+
+    response = await ac.post(
+        "/api/v1/auth/login", data={"username": "simple_tester", "password": "x"}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+async def test_login_is_rate_limited_per_account_before_db_lookup(
+    ac: AsyncClient, regular_user: User, monkeypatch, query_counter
+):
+    monkeypatch.setattr(
+        settings.rate_limit,
+        "login_per_account",
+        RateLimitRule(limit=2, window_seconds=60),
+    )
+    form = {"username": "Simple_Tester", "password": "wrong"}
+
+    for _ in range(2):
+        assert (await ac.post("/api/v1/auth/login", data=form)).status_code == 401
+
+    query_counter.statements.clear()
+    response = await ac.post("/api/v1/auth/login", data=form)
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+    assert query_counter.count == 0
+
+
+async def test_register_is_rate_limited_per_ip(ac: AsyncClient, monkeypatch):
+    monkeypatch.setattr(
+        settings.rate_limit,
+        "register_per_ip",
+        RateLimitRule(limit=1, window_seconds=3600),
+    )
+
+    first = await ac.post(
+        "/api/v1/auth/register",
+        json={"username": "first", "email": "first@test.com", "password": "pass"},
+    )
+    second = await ac.post(
+        "/api/v1/auth/register",
+        json={"username": "second", "email": "second@test.com", "password": "pass"},
+    )
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+
+
+async def test_register_limit_uses_forwarded_ip_behind_trusted_proxy(
+    ac: AsyncClient, monkeypatch
+):
+    monkeypatch.setattr(
+        settings.rate_limit,
+        "register_per_ip",
+        RateLimitRule(limit=1, window_seconds=3600),
+    )
+
+    async def register(name: str, forwarded_for: str) -> int:
+        response = await ac.post(
+            "/api/v1/auth/register",
+            json={"username": name, "email": f"{name}@test.com", "password": "pass"},
+            headers={"X-Forwarded-For": forwarded_for},
+        )
+        return response.status_code
+
+    # The header is ignored unless the peer is a trusted proxy.
+    assert await register("first", "203.0.113.1") == 200
+    assert await register("second", "203.0.113.2") == 429
+
+    monkeypatch.setattr(settings.rate_limit, "trusted_proxies", ["127.0.0.0/8"])
+    assert await register("third", "203.0.113.3") == 200
+    assert await register("fourth", "203.0.113.4") == 200
+    # Entries left of the last untrusted hop are client-supplied.
+    assert await register("fifth", "198.51.100.9, 203.0.113.4") == 429
+
+
+async def test_update_timezone_and_claims(
+    user_client: AsyncClient, regular_user: User, session: AsyncSession
+):
+    response = await user_client.patch(
+        "/api/v1/auth/users/me", json={"timezone": "Mars/Olympus_Mons"}
+    )
+    assert response.status_code == 422
+
+    response = await user_client.patch(
+        "/api/v1/auth/users/me", json={"timezone": "Asia/Tokyo"}
+    )
+    assert response.status_code == 200
+    assert response.json()["timezone"] == "Asia/Tokyo"
+
+    await session.refresh(regular_user)
+    token_info = generate_token_info(regular_user)
+    assert decode_token(token_info.access_token)["tz"] == "Asia/Tokyo"
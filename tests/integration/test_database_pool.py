@@ -0,0 +1,82 @@
+from collections.abc import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from habit_tasks.database import database_helper
+from habit_tasks.database.pool import (
+    MeasuredAsyncQueuePool,
+    PoolExhaustedError,
+    measured_pool,
+)
+from habit_tasks.main import app
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path) -> AsyncGenerator[AsyncEngine, None]:
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=MeasuredAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    yield engine
+    await engine.dispose()
+
+
+async def test_pool_records_waits_and_timeouts(engine: AsyncEngine):
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+        with pytest.raises(exc.TimeoutError):
+            await engine.connect()
+
+    async with engine.connect():
+        pass
+
+    stats = measured_pool(engine).stats()
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["waits"] == 0
+    assert stats["checked_out"] == 0
+
+
+async def test_pool_fails_fast_once_exhausted_past_threshold(engine: AsyncEngine):
+    pool = measured_pool(engine)
+    pool.fail_fast_after = 0
+
+    async with engine.connect():
+        # The first checkout to find the pool exhausted still queues.
+        with pytest.raises(exc.TimeoutError) as first:
+            await engine.connect()
+        assert not isinstance(first.value, PoolExhaustedError)
+
+        with pytest.raises(PoolExhaustedError):
+            await engine.connect()
+
+    async with engine.connect():
+        pass
+
+    assert pool.exhausted_since is None
+    assert pool.stats()["rejections"] == 1
+
+
+async def test_pool_exhaustion_is_503(user_client: AsyncClient, caplog):
+    async def exhausted_session() -> AsyncGenerator[AsyncSession, None]:
+        raise PoolExhaustedError("exhausted")
+        yield
+
+    app.dependency_overrides[database_helper.read_session_getter] = exhausted_session
+    try:
+        response = await user_client.get("/api/v1/tasks/")
+    finally:
+        del app.dependency_overrides[database_helper.read_session_getter]
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert "primary pool: {'checkouts'" in caplog.text
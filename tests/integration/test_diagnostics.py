@@ -0,0 +1,21 @@
+import pytest
+from httpx import AsyncClient
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_diagnostics_report_user_cache_and_pool(admin_client: AsyncClient):
+    first = (await admin_client.get("/api/v1/diagnostics/")).json()
+    second = (await admin_client.get("/api/v1/diagnostics/")).json()
+
+    assert first["user_cache"]["size"] == 1
+    assert second["user_cache"]["hits"] > first["user_cache"]["hits"]
+    assert {"checkouts", "waits", "timeouts", "checked_out"} <= set(
+        first["database_pool"]
+    )
+
+
+async def test_diagnostics_require_admin(user_client: AsyncClient):
+    response = await user_client.get("/api/v1/diagnostics/")
+
+    assert response.status_code == 403
@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from habit_tasks.api.idempotency import DatabaseIdempotencyStore
+from habit_tasks.api.v1.auth.utils import generate_token_info
+from habit_tasks.database.models import Task, User
+from habit_tasks.utils import IdempotencyRecord, StoredResponse
+
+pytestmark = pytest.mark.asyncio
+
+
+async def count_tasks(session: AsyncSession) -> int:
+    return (await session.execute(select(func.count(Task.id)))).scalar_one()
+
+
+async def test_retry_replays_stored_response(
+    user_client: AsyncClient, session: AsyncSession
+):
+    headers = {"Idempotency-Key": "create-1"}
+    first = await user_client.post(
+        "/api/v1/tasks/", json={"title": "Run"}, headers=headers
+    )
+    retry = await user_client.post(
+        "/api/v1/tasks/", json={"title": "Run"}, headers=headers
+    )
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    assert await count_tasks(session) == 1
+
+
+async def test_requests_without_key_are_not_deduped(
+    user_client: AsyncClient, session: AsyncSession
+):
+    await user_client.post("/api/v1/tasks/", json={"title": "Run"})
+    await user_client.post("/api/v1/tasks/", json={"title": "Run"})
+
+    assert await count_tasks(session) == 2
+
+
+async def test_key_reused_for_another_request_is_rejected(
+    user_client: AsyncClient, session: AsyncSession
+):
+    headers = {"Idempotency-Key": "create-1"}
+    await user_client.post("/api/v1/tasks/", json={"title": "Run"}, headers=headers)
+    response = await user_client.post(
+        "/api/v1/tasks/", json={"title": "Read"}, headers=headers
+    )
+
+    assert response.status_code == 422
+    assert await count_tasks(session) == 1
+
+
+async def test_keys_are_scoped_per_user(
+    user_client: AsyncClient, admin_user: User, session: AsyncSession
+):
+    headers = {"Idempotency-Key": "create-1"}
+    await user_client.post("/api/v1/tasks/", json={"title": "Run"}, headers=headers)
+
+    token = generate_token_info(admin_user).access_token
+    response = await user_client.post(
+        "/api/v1/tasks/",
+        json={"title": "Run"},
+        headers={**headers, "Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 201
+    assert "idempotent-replayed" not in response.headers
+    assert await count_tasks(session) == 2
+
+
+async def test_sync_retry_does_not_duplicate_created_tasks(
+    user_client: AsyncClient, session: AsyncSession
+):
+    payload = {"created_tasks": [{"client_id": "tmp-1", "title": "Run"}]}
+    headers = {"Idempotency-Key": "sync-1"}
+
+    first = await user_client.post("/api/v1/sync/", json=payload, headers=headers)
+    retry = await user_client.post("/api/v1/sync/", json=payload, headers=headers)
+
+    assert first.status_code == 200
+    assert retry.json() == first.json()
+    assert await count_tasks(session) == 1
+
+
+async def test_database_store(regular_user: User, session: AsyncSession):
+    now = datetime(2025, 3, 10, 12, tzinfo=timezone.utc)
+    store = DatabaseIdempotencyStore(
+        async_sessionmaker(bind=session.bind, expire_on_commit=False),
+        clock=lambda: now,
+    )
+    response = StoredResponse(201, [("content-type", "application/json")], b"{}")
+
+    assert await store.reserve(regular_user.id, "key", "abc", lease=60) is None
+    assert await store.reserve(regular_user.id, "key", "abc", lease=60) == (
+        IdempotencyRecord("abc")
+    )
+
+    await store.save(regular_user.id, "key", response, ttl=60)
+    assert await store.reserve(regular_user.id, "key", "abc", lease=60) == (
+        IdempotencyRecord("abc", response)
+    )
+
+    now += timedelta(seconds=61)
+    assert await store.reserve(regular_user.id, "key", "def", lease=60) is None
+
+    await store.release(regular_user.id, "key")
+    assert await store.reserve(regular_user.id, "key", "ghi", lease=60) is None
+
+
+async def test_database_store_takes_over_expired_lease(
+    regular_user: User, session: AsyncSession
+):
+    now = datetime(2025, 3, 10, 12, tzinfo=timezone.utc)
+    store = DatabaseIdempotencyStore(
+        async_sessionmaker(bind=session.bind, expire_on_commit=False),
+        clock=lambda: now,
+    )
+    response = StoredResponse(201, [("content-type", "application/json")], b"{}")
+
+    # The worker holding the reservation died without saving or releasing.
+    await store.reserve(regular_user.id, "key", "abc", lease=10)
+    now += timedelta(seconds=11)
+    assert await store.reserve(regular_user.id, "key", "abc", lease=10) is None
+
+    # A saved response outlives the lease.
+    await store.save(regular_user.id, "key", response, ttl=3600)
+    now += timedelta(seconds=60)
+    assert await store.reserve(regular_user.id, "key", "abc", lease=10) == (
+        IdempotencyRecord("abc", response)
+    )
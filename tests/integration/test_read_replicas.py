@@ -0,0 +1,119 @@
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import exc
+
+from habit_tasks.database import database_helper
+from habit_tasks.database.database_helper import DatabaseHelper
+from habit_tasks.database.models import Base
+from habit_tasks.main import app
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("stateless_access_tokens")]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def use_helper(
+    helper: DatabaseHelper, create_replicas: bool = True
+) -> AsyncGenerator[DatabaseHelper, None]:
+    engines = [helper.engine, *(helper.replica_engines if create_replicas else [])]
+    for engine in engines:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    overrides = dict(app.dependency_overrides)
+    app.dependency_overrides[database_helper.session_getter] = helper.session_getter
+    app.dependency_overrides[database_helper.read_session_getter] = (
+        helper.read_session_getter
+    )
+    yield helper
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(overrides)
+    await helper.dispose()
+
+
+def sqlite_helper(
+    primary: Path, replicas: list[Path], clock: FakeClock
+) -> DatabaseHelper:
+    return DatabaseHelper(
+        url=f"sqlite+aiosqlite:///{primary}",
+        echo=False,
+        echo_pool=False,
+        pool_size=2,
+        max_overflow=0,
+        replica_urls=[f"sqlite+aiosqlite:///{replica}" for replica in replicas],
+        sticky_seconds=5,
+        replica_retry_seconds=30,
+        clock=clock,
+    )
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest_asyncio.fixture
+async def replicated(tmp_path, clock) -> AsyncGenerator[DatabaseHelper, None]:
+    # Nothing replicates between the files, so a read shows where it went.
+    helper = sqlite_helper(tmp_path / "primary.db", [tmp_path / "replica.db"], clock)
+    async for ready in use_helper(helper):
+        yield ready
+
+
+@pytest_asyncio.fixture
+async def broken_replica(tmp_path, clock) -> AsyncGenerator[DatabaseHelper, None]:
+    # SQLite cannot open a file in a directory that does not exist.
+    replica = tmp_path / "missing" / "replica.db"
+    helper = sqlite_helper(tmp_path / "primary.db", [replica], clock)
+    async for ready in use_helper(helper, create_replicas=False):
+        yield ready
+
+
+async def list_titles(client: AsyncClient) -> list[str]:
+    response = await client.get("/api/v1/tasks/")
+    assert response.status_code == 200
+    return [task["title"] for task in response.json()]
+
+
+async def test_reads_follow_writes_then_go_to_replica(
+    user_client: AsyncClient, replicated: DatabaseHelper, clock: FakeClock
+):
+    response = await user_client.post("/api/v1/tasks/", json={"title": "Run"})
+    assert response.status_code == 201
+
+    assert await list_titles(user_client) == ["Run"]
+
+    clock.now = 6
+    assert await list_titles(user_client) == []
+
+
+async def test_unhealthy_replica_falls_back_to_primary(
+    user_client: AsyncClient, broken_replica: DatabaseHelper, clock: FakeClock
+):
+    await user_client.post("/api/v1/tasks/", json={"title": "Run"})
+    clock.now = 6
+
+    await broken_replica.check_replicas()
+
+    assert broken_replica.unhealthy_until == {0: 36}
+    assert await list_titles(user_client) == ["Run"]
+
+
+async def test_failed_replica_connection_marks_it_unhealthy(
+    user_client: AsyncClient, broken_replica: DatabaseHelper, clock: FakeClock
+):
+    with pytest.raises(exc.OperationalError):
+        await user_client.get("/api/v1/tasks/")
+
+    assert broken_replica.unhealthy_until == {0: 30}
+    assert await list_titles(user_client) == []
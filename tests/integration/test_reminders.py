@@ -0,0 +1,108 @@
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from habit_tasks.database.models import Task, TaskReminder, User
+from habit_tasks.reminders import InMemoryReminderSink, ReminderScheduler
+
+pytestmark = pytest.mark.asyncio
+
+
+async def get_reminders(session: AsyncSession) -> list[TaskReminder]:
+    stmt = (
+        select(TaskReminder)
+        .order_by(TaskReminder.local_time)
+        .execution_options(populate_existing=True)
+    )
+    return list((await session.scalars(stmt)).all())
+
+
+async def test_task_reminders_are_queued(
+    user_client: AsyncClient, session: AsyncSession
+):
+    response = await user_client.post(
+        "/api/v1/tasks/", json={"title": "Run", "reminders": ["20:30", "07:00:00"]}
+    )
+    assert response.status_code == 201
+    task = response.json()
+    assert task["reminders"] == ["20:30", "07:00"]
+
+    reminders = await get_reminders(session)
+    assert [str(r.local_time) for r in reminders] == ["07:00:00", "20:30:00"]
+    assert all(r.task_id == task["id"] for r in reminders)
+
+    response = await user_client.patch(
+        f"/api/v1/tasks/{task['id']}", json={"reminders": ["09:15"]}
+    )
+    assert response.status_code == 200
+    reminders = await get_reminders(session)
+    assert [str(r.local_time) for r in reminders] == ["09:15:00"]
+
+    await user_client.delete(f"/api/v1/tasks/{task['id']}")
+    assert await get_reminders(session) == []
+
+
+async def test_invalid_reminder_is_rejected(user_client: AsyncClient):
+    response = await user_client.post(
+        "/api/v1/tasks/", json={"title": "Run", "reminders": ["soon"]}
+    )
+    assert response.status_code == 422
+
+
+async def test_legacy_reminders_are_still_listed(
+    user_client: AsyncClient, session: AsyncSession, regular_user: User
+):
+    session.add(Task(user_id=regular_user.id, title="Old", reminders=["morning"]))
+    await session.commit()
+
+    response = await user_client.get("/api/v1/tasks/")
+    assert response.status_code == 200
+    assert response.json()[0]["reminders"] == ["morning"]
+
+
+async def test_timezone_change_reschedules_reminders(
+    user_client: AsyncClient, session: AsyncSession
+):
+    await user_client.post(
+        "/api/v1/tasks/", json={"title": "Run", "reminders": ["08:00"]}
+    )
+    (reminder,) = await get_reminders(session)
+    assert reminder.timezone == "UTC"
+
+    await user_client.patch("/api/v1/auth/users/me", json={"timezone": "Asia/Tokyo"})
+
+    (after,) = await get_reminders(session)
+    assert after.timezone == "Asia/Tokyo"
+    fire_at = after.next_fire_at.replace(tzinfo=timezone.utc)
+    assert fire_at.astimezone(ZoneInfo("Asia/Tokyo")).time() == time(8, 0)
+
+
+async def test_scheduler_delivers_due_reminders_in_batches(
+    user_client: AsyncClient, regular_user: User, session: AsyncSession
+):
+    for title in ("Run", "Read", "Write"):
+        await user_client.post(
+            "/api/v1/tasks/", json={"title": title, "reminders": ["06:00", "18:00"]}
+        )
+
+    now = datetime.now(timezone.utc) + timedelta(days=1)
+    sink = InMemoryReminderSink()
+    scheduler = ReminderScheduler(
+        async_sessionmaker(bind=session.bind, expire_on_commit=False),
+        sink,
+        batch_size=4,
+        clock=lambda: now,
+    )
+
+    assert await scheduler.run_once() == 4
+    assert await scheduler.run_once() == 2
+    assert await scheduler.run_once() == 0
+
+    assert len({d.reminder_id for d in sink.deliveries}) == 6
+    assert {d.user_id for d in sink.deliveries} == {regular_user.id}
+    for reminder in await get_reminders(session):
+        assert reminder.next_fire_at.replace(tzinfo=timezone.utc) > now
@@ -0,0 +1,50 @@
+import pytest
+from httpx import AsyncClient
+
+from habit_tasks.api.v1.auth.utils import encode_token
+from habit_tasks.config import settings
+from habit_tasks.database.models import User
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+def request_stats_headers(monkeypatch):
+    monkeypatch.setattr(settings.database.engine, "request_stats_headers", True)
+
+
+async def test_rejected_request_checks_out_no_connection(ac: AsyncClient):
+    response = await ac.get(
+        "/api/v1/tasks/", headers={"Authorization": "Bearer not-a-token"}
+    )
+
+    assert response.status_code == 401
+    assert response.headers["x-db-checkouts"] == "0"
+    assert response.headers["x-db-statements"] == "0"
+
+
+@pytest.mark.usefixtures("stateless_access_tokens")
+async def test_stateless_principal_reads_with_one_checkout(
+    user_client: AsyncClient, query_counter
+):
+    response = await user_client.get("/api/v1/tasks/")
+
+    assert response.status_code == 200
+    assert response.headers["x-db-checkouts"] == "1"
+    assert response.headers["x-db-statements"] == str(query_counter.count)
+
+
+async def test_principal_lookup_and_read_share_one_checkout(
+    ac: AsyncClient, regular_user: User
+):
+    # Without the uid/role/tz claims the principal is loaded from the DB, by
+    # a different dependency than the one reading the tasks.
+    token = encode_token({"sub": regular_user.username, "type": "access"})
+
+    response = await ac.get(
+        "/api/v1/tasks/", headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["x-db-checkouts"] == "1"
+    assert int(response.headers["x-db-statements"]) >= 2
@@ -0,0 +1,287 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from habit_tasks.config import settings
+from habit_tasks.database.models import Task, TaskLog, User
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+def settle_immediately(monkeypatch):
+    monkeypatch.setattr(settings.sync, "changes_settle_seconds", 0)
+
+
+async def test_sync_creates_tasks_and_logs(
+    user_client: AsyncClient, regular_user: User, session: AsyncSession, create_task
+):
+    task = await create_task(regular_user)
+    payload = {
+        "created_tasks": [{"title": "Read"}, {"title": "Write"}],
+        "new_logs": [
+            {"task_id": task.id, "date": "2025-01-01", "status": True},
+            {"task_id": task.id, "date": "2025-01-02", "status": True},
+        ],
+    }
+
+    response = await user_client.post("/api/v1/sync/", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["processed_tasks"] == 2
+    assert data["processed_logs"] == 2
+    assert [item["status"] for item in data["logs"]] == ["created", "created"]
+
+    tasks_count = await session.scalar(
+        select(func.count(Task.id)).where(Task.user_id == regular_user.id)
+    )
+    assert tasks_count == 3
+
+
+async def test_synced_incomplete_log_does_not_complete_task(
+    user_client: AsyncClient, regular_user: User, create_task
+):
+    task = await create_task(regular_user)
+    today = datetime.now(timezone.utc).date().isoformat()
+    payload = {"new_logs": [{"task_id": task.id, "date": today, "status": False}]}
+
+    response = await user_client.post("/api/v1/sync/", json=payload)
+    assert response.json()["processed_logs"] == 1
+
+    response = await user_client.get("/api/v1/tasks/")
+    assert response.json()[0]["is_completed"] is False
+
+
+async def test_sync_reports_duplicates_and_foreign_tasks(
+    user_client: AsyncClient,
+    regular_user: User,
+    admin_user: User,
+    session: AsyncSession,
+    create_task,
+):
+    task = await create_task(regular_user)
+    foreign_task = await create_task(admin_user)
+    session.add(TaskLog(task_id=task.id, date=task.created_at.date(), status=True))
+    await session.commit()
+
+    payload = {
+        "new_logs": [
+            {"task_id": task.id, "date": str(task.created_at.date()), "status": True},
+            {"task_id": task.id, "date": "2025-03-01", "status": True},
+            {"task_id": task.id, "date": "2025-03-01", "status": True},
+            {"task_id": foreign_task.id, "date": "2025-03-01", "status": True},
+        ],
+    }
+
+    response = await user_client.post("/api/v1/sync/", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["processed_logs"] == 1
+    assert [item["status"] for item in data["logs"]] == [
+        "duplicate",
+        "created",
+        "duplicate",
+        "rejected_not_owned",
+    ]
+
+    foreign_logs = await session.scalar(
+        select(func.count(TaskLog.id)).where(TaskLog.task_id == foreign_task.id)
+    )
+    assert foreign_logs == 0
+
+
+async def test_sync_maps_client_ids_and_reports_invalid_items(
+    user_client: AsyncClient, session: AsyncSession
+):
+    payload = {
+        "created_tasks": [
+            {"title": "Read", "client_id": "tmp-1"},
+            {"title": "Write", "client_id": "tmp-1"},
+            {"title": "Walk", "client_id": "tmp-2"},
+        ],
+        "new_logs": [
+            {"task_client_id": "tmp-2", "date": "2025-01-01", "status": True},
+            {"task_client_id": "tmp-404", "date": "2025-01-01", "status": True},
+            {"date": "2025-01-01", "status": True},
+        ],
+    }
+
+    response = await user_client.post("/api/v1/sync/", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "partial"
+    assert data["processed_tasks"] == 2
+    assert data["processed_logs"] == 1
+    assert [item["status"] for item in data["tasks"]] == [
+        "created",
+        "invalid",
+        "created",
+    ]
+    assert [item["status"] for item in data["logs"]] == [
+        "created",
+        "invalid",
+        "invalid",
+    ]
+    assert set(data["task_ids"]) == {"tmp-1", "tmp-2"}
+    assert data["logs"][0]["task_id"] == data["task_ids"]["tmp-2"]
+
+    task = await session.get(Task, data["task_ids"]["tmp-2"])
+    assert task is not None
+    assert task.title == "Walk"
+
+
+async def test_sync_stores_valid_items_next_to_invalid_ones(
+    user_client: AsyncClient, regular_user: User, session: AsyncSession, create_task
+):
+    task = await create_task(regular_user)
+    payload = {
+        "created_tasks": [
+            {"title": ""},
+            {"title": "Read", "reminders": ["morning"]},
+            {"title": "Write"},
+        ],
+        "new_logs": [
+            {"task_id": task.id, "date": "not-a-date", "status": True},
+            {"task_id": task.id, "date": "2025-01-01", "status": True},
+        ],
+    }
+
+    response = await user_client.post("/api/v1/sync/", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["status"] for item in data["tasks"]] == [
+        "invalid",
+        "invalid",
+        "created",
+    ]
+    assert data["tasks"][0]["detail"].startswith("title: ")
+    assert data["tasks"][1]["detail"].startswith("reminders.0: ")
+    assert [item["status"] for item in data["logs"]] == ["invalid", "created"]
+    assert data["logs"][0]["date"] is None
+    assert data["logs"][0]["detail"].startswith("date: ")
+
+    titles = await session.scalars(
+        select(Task.title).where(Task.user_id == regular_user.id).order_by(Task.id)
+    )
+    assert list(titles) == ["Run", "Write"]
+
+
+async def test_sync_round_trips_do_not_grow_with_payload(
+    user_client: AsyncClient,
+    regular_user: User,
+    query_counter,
+    create_task,
+):
+    task = await create_task(regular_user)
+
+    async def sync_logs(month: int, days: int) -> int:
+        payload = {
+            "new_logs": [
+                {
+                    "task_id": task.id,
+                    "date": f"2025-{month:02}-{day:02}",
+                    "status": True,
+                }
+                for day in range(1, days + 1)
+            ]
+        }
+        before = query_counter.count
+        response = await user_client.post("/api/v1/sync/", json=payload)
+        assert response.status_code == 200
+        return query_counter.count - before
+
+    # The first sync also creates the task's aggregate row.
+    await sync_logs(1, 1)
+    assert await sync_logs(2, 2) == await sync_logs(3, 28)
+
+
+async def test_changes_returns_only_rows_after_cursor(
+    user_client: AsyncClient, regular_user: User, create_task
+):
+    task = await create_task(regular_user)
+
+    response = await user_client.get("/api/v1/sync/changes")
+    assert response.status_code == 200
+    data = response.json()
+    assert [t["id"] for t in data["tasks"]] == [task.id]
+    cursor = data["cursor"]
+
+    response = await user_client.get("/api/v1/sync/changes", params={"since": cursor})
+    data = response.json()
+    assert data["tasks"] == [] and data["logs"] == [] and data["deleted"] == []
+    assert data["cursor"] == cursor
+
+    await user_client.post(f"/api/v1/tasks/{task.id}/complete")
+    response = await user_client.get("/api/v1/sync/changes", params={"since": cursor})
+    data = response.json()
+    assert [log["task_id"] for log in data["logs"]] == [task.id]
+    cursor = data["cursor"]
+
+    await user_client.delete(f"/api/v1/tasks/{task.id}/complete")
+    await user_client.delete(f"/api/v1/tasks/{task.id}")
+    response = await user_client.get("/api/v1/sync/changes", params={"since": cursor})
+    data = response.json()
+    assert data["logs"] == []
+    assert [(d["entity"], d["task_id"]) for d in data["deleted"]] == [
+        ("task_log", task.id),
+        ("task", None),
+    ]
+
+
+async def test_changes_paginates_with_cursor(
+    user_client: AsyncClient, regular_user: User, create_task
+):
+    tasks = [await create_task(regular_user, f"Task {i}") for i in range(3)]
+
+    seen = []
+    cursor = None
+    has_more = True
+    while has_more:
+        params = {"limit": 1} | ({"since": cursor} if cursor else {})
+        data = (await user_client.get("/api/v1/sync/changes", params=params)).json()
+        seen.extend(t["id"] for t in data["tasks"])
+        cursor, has_more = data["cursor"], data["has_more"]
+
+    assert seen == [task.id for task in tasks]
+
+
+async def test_changes_wait_for_earlier_stamped_rows_to_commit(
+    user_client: AsyncClient, regular_user: User, session: AsyncSession, monkeypatch
+):
+    monkeypatch.setattr(settings.sync, "changes_settle_seconds", 30)
+    now = datetime.now(timezone.utc)
+    later = Task(title="Later", user_id=regular_user.id, updated_at=now)
+    session.add(later)
+    await session.commit()
+
+    # Not settled yet, so the cursor does not move past it.
+    data = (await user_client.get("/api/v1/sync/changes")).json()
+    assert data["tasks"] == []
+
+    # A transaction stamped before it commits afterwards.
+    earlier = Task(
+        title="Earlier",
+        user_id=regular_user.id,
+        updated_at=now - timedelta(seconds=1),
+    )
+    session.add(earlier)
+    await session.commit()
+
+    monkeypatch.setattr(settings.sync, "changes_settle_seconds", 0)
+    params = {"since": data["cursor"]} if data["cursor"] else {}
+    data = (await user_client.get("/api/v1/sync/changes", params=params)).json()
+    assert [t["title"] for t in data["tasks"]] == ["Earlier", "Later"]
+
+
+async def test_changes_rejects_malformed_cursor(user_client: AsyncClient):
+    response = await user_client.get(
+        "/api/v1/sync/changes", params={"since": "not-a-cursor"}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,136 @@
+from datetime import datetime, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from habit_tasks.database.models import Task, TaskLog, Tombstone, User
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_batch_create(user_client: AsyncClient, regular_user: User):
+    response = await user_client.post(
+        "/api/v1/tasks/batch/create",
+        json={"tasks": [{"title": "Run"}, {"title": "Read", "reminders": ["08:00"]}]},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ok"
+    assert [r["task"]["title"] for r in data["results"]] == ["Run", "Read"]
+    assert all(r["task"]["user_id"] == regular_user.id for r in data["results"])
+
+
+async def test_batch_update_reports_per_item(
+    user_client: AsyncClient,
+    regular_user: User,
+    admin_user: User,
+    session: AsyncSession,
+    create_tasks,
+):
+    tasks = await create_tasks(regular_user, 2)
+    (foreign,) = await create_tasks(admin_user, 1)
+
+    response = await user_client.post(
+        "/api/v1/tasks/batch/update",
+        json={
+            "tasks": [
+                {"id": tasks[0].id, "title": "Renamed"},
+                {"id": tasks[1].id, "description": "Daily"},
+                {"id": foreign.id, "title": "Stolen"},
+                {"id": tasks[0].id, "title": "Again"},
+            ]
+        },
+    )
+
+    data = response.json()
+    assert data["status"] == "partial"
+    assert [r["status"] for r in data["results"]] == [
+        "ok",
+        "ok",
+        "not_found",
+        "invalid",
+    ]
+    assert data["results"][0]["task"]["title"] == "Renamed"
+    assert data["results"][1]["task"]["description"] == "Daily"
+
+    await session.refresh(foreign)
+    assert foreign.title == "Task 0"
+
+
+async def test_batch_delete(
+    user_client: AsyncClient,
+    regular_user: User,
+    admin_user: User,
+    session: AsyncSession,
+    create_tasks,
+):
+    tasks = await create_tasks(regular_user, 2)
+    (foreign,) = await create_tasks(admin_user, 1)
+    session.add(TaskLog(task_id=tasks[0].id, date=tasks[0].created_at.date()))
+    await session.commit()
+
+    response = await user_client.post(
+        "/api/v1/tasks/batch/delete",
+        json={"ids": [tasks[0].id, foreign.id, tasks[1].id]},
+    )
+
+    assert [r["status"] for r in response.json()["results"]] == [
+        "ok",
+        "not_found",
+        "ok",
+    ]
+    remaining = await session.scalars(select(Task.id).order_by(Task.id))
+    assert remaining.all() == [foreign.id]
+    assert await session.scalar(select(func.count(TaskLog.id))) == 0
+    assert await session.scalar(select(func.count(Tombstone.id))) == 2
+
+
+async def test_batch_complete_in_constant_round_trips(
+    user_client: AsyncClient,
+    regular_user: User,
+    query_counter,
+    create_tasks,
+):
+    tasks = await create_tasks(regular_user, 12)
+    await user_client.post(f"/api/v1/tasks/{tasks[0].id}/complete")
+
+    async def complete(ids: list[int]) -> tuple[list[str], int]:
+        before = query_counter.count
+        response = await user_client.post(
+            "/api/v1/tasks/batch/complete", json={"ids": ids}
+        )
+        assert response.status_code == 200
+        statuses = [r["status"] for r in response.json()["results"]]
+        return statuses, query_counter.count - before
+
+    statuses, small = await complete([tasks[0].id, tasks[1].id, 999_999])
+    assert statuses == ["already_completed", "ok", "not_found"]
+
+    statuses, large = await complete([task.id for task in tasks[2:]])
+    assert statuses == ["ok"] * 10
+
+    response = await user_client.get("/api/v1/tasks/")
+    assert all(task["is_completed"] for task in response.json())
+    assert large == small
+
+
+async def test_batch_complete_flips_incomplete_logs(
+    user_client: AsyncClient, regular_user: User, session: AsyncSession, create_tasks
+):
+    (task,) = await create_tasks(regular_user, 1)
+    today = datetime.now(timezone.utc).date()
+    session.add(TaskLog(task_id=task.id, date=today, status=False))
+    await session.commit()
+
+    response = await user_client.post(
+        "/api/v1/tasks/batch/complete", json={"ids": [task.id]}
+    )
+
+    (result,) = response.json()["results"]
+    assert result["status"] == "ok"
+    assert result["log"]["status"] is True
+    response = await user_client.get("/api/v1/tasks/")
+    assert response.json()[0]["is_completed"] is True
@@ -0,0 +1,414 @@
+import base64
+import json
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from habit_tasks.api.v1.auth.utils import generate_token_info
+from habit_tasks.commands.archive_task_logs import archive_task_logs
+from habit_tasks.commands.convert_task_logs_to_bitmaps import convert_task_logs
+from habit_tasks.commands.rebuild_task_aggregates import rebuild_task_aggregates
+from habit_tasks.config import settings
+from habit_tasks.database.models import Task, TaskAggregate, TaskLog, User
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_get_tasks_returns_all_without_limit(
+    user_client: AsyncClient, regular_user: User, create_tasks
+):
+    tasks = await create_tasks(regular_user, 3)
+
+    response = await user_client.get("/api/v1/tasks/")
+
+    assert response.status_code == 200
+    assert [t["id"] for t in response.json()] == [task.id for task in tasks]
+    assert "X-Next-Cursor" not in response.headers
+
+
+async def test_get_tasks_keyset_pagination(
+    user_client: AsyncClient, regular_user: User, create_tasks
+):
+    tasks = await create_tasks(regular_user, 5)
+
+    seen = []
+    params: dict = {"limit": 2}
+    while True:
+        response = await user_client.get("/api/v1/tasks/", params=params)
+        assert response.status_code == 200
+        seen.extend(t["id"] for t in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    assert seen == [task.id for task in tasks]
+
+
+async def test_get_tasks_rejects_malformed_cursor(user_client: AsyncClient):
+    response = await user_client.get("/api/v1/tasks/", params={"cursor": "???"})
+    assert response.status_code == 400
+
+
+async def test_get_tasks_ndjson_stream(
+    user_client: AsyncClient, regular_user: User, create_tasks
+):
+    tasks = await create_tasks(regular_user, 3)
+    await user_client.post(f"/api/v1/tasks/{tasks[1].id}/complete")
+
+    response = await user_client.get("/api/v1/tasks/", params={"format": "ndjson"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [task.id for task in tasks]
+    assert [row["is_completed"] for row in rows] == [False, True, False]
+
+
+async def create_logs(session: AsyncSession, task: Task, days: int) -> list[date]:
+    dates = [date(2025, 1, 1) + timedelta(days=i) for i in range(days)]
+    session.add_all(TaskLog(task_id=task.id, date=d, status=True) for d in dates)
+    await session.commit()
+    return dates
+
+
+async def test_get_task_logs_paginates_by_date(
+    user_client: AsyncClient, regular_user: User, session: AsyncSession, create_tasks
+):
+    [task] = await create_tasks(regular_user, 1)
+    dates = await create_logs(session, task, 5)
+
+    seen = []
+    params: dict = {"limit": 2}
+    while True:
+        response = await user_client.get(f"/api/v1/tasks/{task.id}/logs", params=params)
+        assert response.status_code == 200
+        seen.extend(log["date"][:10] for log in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["before"] = response.headers["X-Next-Cursor"]
+
+    assert seen == [d.isoformat() for d in reversed(dates)]
+
+
+async def test_export_task_logs_csv(
+    user_client: AsyncClient, regular_user: User, session: AsyncSession, create_tasks
+):
+    [task] = await create_tasks(regular_user, 1)
+    dates = await create_logs(session, task, 3)
+
+    response = await user_client.get(f"/api/v1/tasks/{task.id}/logs/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.splitlines()
+    assert lines[0] == "id,date,status"
+    assert [line.split(",")[1] for line in lines[1:]] == [d.isoformat() for d in dates]
+
+
+async def test_export_task_logs_ndjson(
+    user_client: AsyncClient, regular_user: User, session: AsyncSession, create_tasks
+):
+    [task] = await create_tasks(regular_user, 1)
+    await create_logs(session, task, 2)
+
+    response = await user_client.get(
+        f"/api/v1/tasks/{task.id}/logs/export", params={"format": "ndjson"}
+    )
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["task_id"] for row in rows] == [task.id, task.id]
+
+
+async def test_export_task_logs_of_foreign_task(
+    user_client: AsyncClient, admin_user: User, create_tasks
+):
+    [task] = await create_tasks(admin_user, 1)
+
+    response = await user_client.get(f"/api/v1/tasks/{task.id}/logs/export")
+    assert response.status_code == 404
+
+
+@pytest.mark.usefixtures("stateless_access_tokens")
+async def test_completion_history_groups_logs_by_task(
+    user_client: AsyncClient,
+    regular_user: User,
+    admin_user: User,
+    session: AsyncSession,
+    query_counter,
+    create_tasks,
+):
+    first, second = await create_tasks(regular_user, 2)
+    [foreign] = await create_tasks(admin_user, 1)
+    await create_logs(session, first, 3)
+    await create_logs(session, foreign, 3)
+    session.add(TaskLog(task_id=second.id, date=date(2025, 1, 2), status=True))
+    await session.commit()
+
+    query_counter.statements.clear()
+    response = await user_client.get(
+        "/api/v1/tasks/logs",
+        params={"date_from": "2025-01-02", "date_to": "2025-01-31"},
+    )
+
+    assert response.status_code == 200
+    assert query_counter.count == 1
+    assert response.json()["tasks"] == [
+        {"task_id": first.id, "dates": ["2025-01-02", "2025-01-03"], "bitmap": None},
+        {"task_id": second.id, "dates": ["2025-01-02"], "bitmap": None},
+    ]
+
+
+async def test_completion_history_bitmap_encoding(
+    user_client: AsyncClient, regular_user: User, session: AsyncSession, create_tasks
+):
+    [task] = await create_tasks(regular_user, 1)
+    await create_logs(session, task, 3)
+
+    response = await user_client.get(
+        "/api/v1/tasks/logs",
+        params={
+            "date_from": "2025-01-01",
+            "date_to": "2025-01-31",
+            "encoding": "bitmap",
+        },
+    )
+
+    [history] = response.json()["tasks"]
+    assert base64.b64decode(history["bitmap"]) == b"\x07\x00\x00\x00"
+
+
+async def test_completion_history_rejects_oversized_range(user_client: AsyncClient):
+    response = await user_client.get(
+        "/api/v1/tasks/logs",
+        params={"date_from": "2020-01-01", "date_to": "2025-01-01"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.usefixtures("stateless_access_tokens")
+async def test_task_stats_for_all_tasks(
+    user_client: AsyncClient,
+    regular_user: User,
+    session: AsyncSession,
+    query_counter,
+    create_tasks,
+):
+    tasks = await create_tasks(regular_user, 2)
+    await create_logs(session, tasks[0], 5)
+    assert await rebuild_task_aggregates(session) == 2
+
+    before = query_counter.count
+    response = await user_client.get("/api/v1/tasks/stats")
+
+    assert response.status_code == 200
+    assert query_counter.count - before == 1
+    stats = {item["task_id"]: item for item in response.json()}
+    assert stats[tasks[0].id]["total_completions"] == 5
+    assert stats[tasks[0].id]["longest_streak"] == 5
+    assert stats[tasks[0].id]["current_streak"] == 0
+    assert stats[tasks[0].id]["last_completed"] == "2025-01-05"
+    assert stats[tasks[1].id]["total_completions"] == 0
+
+
+async def test_single_task_stats(
+    user_client: AsyncClient,
+    regular_user: User,
+    admin_user: User,
+    create_tasks,
+):
+    (task,) = await create_tasks(regular_user, 1)
+    (foreign_task,) = await create_tasks(admin_user, 1)
+    await user_client.post(f"/api/v1/tasks/{task.id}/complete")
+
+    response = await user_client.get(f"/api/v1/tasks/{task.id}/stats")
+    assert response.status_code == 200
+    assert response.json()["current_streak"] == 1
+
+    response = await user_client.get(f"/api/v1/tasks/{foreign_task.id}/stats")
+    assert response.status_code == 404
+
+
+async def test_aggregates_follow_sync_and_undo(
+    user_client: AsyncClient, regular_user: User, session: AsyncSession, create_tasks
+):
+    (task,) = await create_tasks(regular_user, 1)
+
+    async def sync_days(*days: int) -> None:
+        logs = [
+            {"task_id": task.id, "date": f"2025-01-{day:02}", "status": True}
+            for day in days
+        ]
+        response = await user_client.post("/api/v1/sync/", json={"new_logs": logs})
+        assert response.status_code == 200
+
+    async def aggregate() -> tuple:
+        row = await session.get(TaskAggregate, task.id, populate_existing=True)
+        assert row is not None
+        return (
+            row.total_completions,
+            row.current_streak,
+            row.longest_streak,
+            row.last_completed,
+        )
+
+    await sync_days(1, 2, 5, 6, 7)
+    assert await aggregate() == (5, 3, 3, date(2025, 1, 7))
+
+    # Filling the gap joins both streaks.
+    await sync_days(3, 4)
+    assert await aggregate() == (7, 7, 7, date(2025, 1, 7))
+
+    response = await user_client.delete(
+        f"/api/v1/tasks/{task.id}/complete", params={"date": "2025-01-04"}
+    )
+    assert response.status_code == 204
+    assert await aggregate() == (6, 3, 3, date(2025, 1, 7))
+
+    await user_client.post(f"/api/v1/tasks/{task.id}/complete")
+    assert await aggregate() == (7, 1, 3, date.today())
+
+
+async def test_bitmap_storage_serves_history(
+    user_client: AsyncClient,
+    regular_user: User,
+    session: AsyncSession,
+    monkeypatch,
+    create_tasks,
+):
+    (task,) = await create_tasks(regular_user, 1)
+    dates = await create_logs(session, task, 40)
+    assert await convert_task_logs(session) == 40
+
+    monkeypatch.setattr(settings.task_logs, "storage", "bitmap")
+    url = f"/api/v1/tasks/{task.id}/logs"
+
+    response = await user_client.get(url, params={"limit": 3})
+    assert [log["date"][:10] for log in response.json()] == [
+        d.isoformat() for d in dates[:-4:-1]
+    ]
+    assert response.json()[0]["id"] is None
+
+    response = await user_client.get(
+        url, params={"limit": 3, "before": response.headers["X-Next-Cursor"]}
+    )
+    assert [log["date"][:10] for log in response.json()] == [
+        d.isoformat() for d in dates[-4:-7:-1]
+    ]
+
+    await user_client.post(f"/api/v1/tasks/{task.id}/complete")
+    await user_client.delete(
+        f"/api/v1/tasks/{task.id}/complete", params={"date": "2025-01-31"}
+    )
+    response = await user_client.get(
+        "/api/v1/tasks/logs",
+        params={"date_from": "2025-01-30", "date_to": "2025-02-01"},
+    )
+    assert response.json()["tasks"][0]["dates"] == ["2025-01-30", "2025-02-01"]
+
+    response = await user_client.get(url, params={"date_from": str(date.today())})
+    assert [log["date"][:10] for log in response.json()] == [str(date.today())]
+
+
+async def test_archive_moves_old_logs_to_bitmaps(
+    user_client: AsyncClient,
+    regular_user: User,
+    session: AsyncSession,
+    monkeypatch,
+    create_tasks,
+):
+    (task,) = await create_tasks(regular_user, 1)
+    dates = await create_logs(session, task, 45)
+
+    with pytest.raises(RuntimeError):
+        await archive_task_logs(session, date(2025, 2, 1))
+
+    monkeypatch.setattr(settings.task_logs, "storage", "bitmap")
+    assert await archive_task_logs(session, date(2025, 2, 1)) == 31
+
+    remaining = await session.scalar(
+        select(func.min(TaskLog.date)).where(TaskLog.task_id == task.id)
+    )
+    assert remaining == date(2025, 2, 1)
+
+    # January now lives only in the bitmaps, February only in rows.
+    await convert_task_logs(session)
+    response = await user_client.get(f"/api/v1/tasks/{task.id}/logs")
+    assert [log["date"][:10] for log in response.json()] == [
+        d.isoformat() for d in reversed(dates)
+    ]
+
+    # An archived completion can still be undone.
+    response = await user_client.delete(
+        f"/api/v1/tasks/{task.id}/complete", params={"date": "2025-01-15"}
+    )
+    assert response.status_code == 204
+    response = await user_client.get(f"/api/v1/tasks/{task.id}/logs")
+    assert "2025-01-15" not in [log["date"][:10] for log in response.json()]
+    stats = (await user_client.get(f"/api/v1/tasks/{task.id}/stats")).json()
+    assert stats["total_completions"] == len(dates) - 1
+    assert stats["longest_streak"] == 30
+
+
+@pytest.mark.usefixtures("stateless_access_tokens")
+async def test_task_list_reuses_completed_today_set(
+    user_client: AsyncClient,
+    regular_user: User,
+    query_counter,
+    create_tasks,
+):
+    tasks = await create_tasks(regular_user, 2)
+
+    async def list_tasks() -> tuple[list[bool], int]:
+        before = query_counter.count
+        response = await user_client.get("/api/v1/tasks/")
+        assert response.status_code == 200
+        return [
+            t["is_completed"] for t in response.json()
+        ], query_counter.count - before
+
+    assert await list_tasks() == ([False, False], 2)
+    assert await list_tasks() == ([False, False], 1)
+
+    await user_client.post(f"/api/v1/tasks/{tasks[1].id}/complete")
+    assert await list_tasks() == ([False, True], 1)
+
+    response = await user_client.post(f"/api/v1/tasks/{tasks[1].id}/complete")
+    assert response.status_code == 200
+
+    await user_client.delete(f"/api/v1/tasks/{tasks[1].id}/complete")
+    assert await list_tasks() == ([False, False], 1)
+
+    today = str(date.today())
+    await user_client.post(
+        "/api/v1/sync/",
+        json={"new_logs": [{"task_id": tasks[0].id, "date": today, "status": True}]},
+    )
+    assert await list_tasks() == ([True, False], 1)
+
+
+@pytest.mark.parametrize("timezone", ["Pacific/Kiritimati", "Etc/GMT+12"])
+async def test_today_follows_user_timezone(
+    ac: AsyncClient,
+    regular_user: User,
+    session: AsyncSession,
+    timezone: str,
+    create_tasks,
+):
+    regular_user.timezone = timezone
+    await session.commit()
+    token_info = generate_token_info(regular_user)
+    ac.headers.update({"Authorization": f"Bearer {token_info.access_token}"})
+    (task,) = await create_tasks(regular_user, 1)
+
+    response = await ac.post(f"/api/v1/tasks/{task.id}/complete")
+
+    assert response.status_code == 200
+    local_today = datetime.now(ZoneInfo(timezone)).date()
+    assert response.json()["date"][:10] == local_today.isoformat()
+
+    response = await ac.get("/api/v1/tasks/")
+    assert response.json()[0]["is_completed"] is True
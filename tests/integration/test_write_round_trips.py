@@ -0,0 +1,233 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from habit_tasks.database.models import Task, TaskLog, Tombstone, User
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("stateless_access_tokens")]
+
+
+def statement_kinds(query_counter) -> list[str]:
+    return [statement.split()[0].upper() for statement in query_counter.statements]
+
+
+def task_log_writes(query_counter) -> list[str]:
+    return [
+        statement
+        for statement in query_counter.statements
+        if statement.startswith(("INSERT INTO task_logs", "DELETE FROM task_logs"))
+    ]
+
+
+def task_selects(query_counter) -> list[str]:
+    return [
+        statement
+        for statement in query_counter.statements
+        if statement.startswith("SELECT tasks.")
+    ]
+
+
+async def test_create_task_is_one_insert(user_client: AsyncClient, query_counter):
+    response = await user_client.post("/api/v1/tasks/", json={"title": "Run"})
+
+    assert response.status_code == 201
+    assert response.json()["title"] == "Run"
+    assert statement_kinds(query_counter) == ["INSERT"]
+
+
+async def test_update_task_is_one_update(
+    user_client: AsyncClient,
+    regular_user: User,
+    query_counter,
+    create_task,
+):
+    task = await create_task(regular_user)
+    query_counter.statements.clear()
+
+    response = await user_client.patch(
+        f"/api/v1/tasks/{task.id}", json={"title": "Walk"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "Walk"
+    assert statement_kinds(query_counter) == ["UPDATE"]
+
+
+async def test_update_foreign_task_is_404_from_empty_returning(
+    user_client: AsyncClient,
+    admin_user: User,
+    session: AsyncSession,
+    query_counter,
+    create_task,
+):
+    task = await create_task(admin_user)
+    query_counter.statements.clear()
+
+    response = await user_client.patch(
+        f"/api/v1/tasks/{task.id}", json={"title": "Mine now"}
+    )
+
+    assert response.status_code == 404
+    assert statement_kinds(query_counter) == ["UPDATE"]
+    stmt = select(Task.title).where(Task.id == task.id)
+    assert await session.scalar(stmt) == "Run"
+
+
+async def test_delete_task_is_one_delete_plus_tombstone(
+    user_client: AsyncClient,
+    regular_user: User,
+    session: AsyncSession,
+    query_counter,
+    create_task,
+):
+    task = await create_task(regular_user)
+    session.add(TaskLog(task_id=task.id, date=date.today()))
+    await session.commit()
+    query_counter.statements.clear()
+
+    response = await user_client.delete(f"/api/v1/tasks/{task.id}")
+
+    assert response.status_code == 204
+    assert statement_kinds(query_counter) == ["DELETE", "INSERT"]
+    assert await session.scalar(select(TaskLog.id)) is None
+    assert await session.scalar(select(Tombstone.entity_id)) == task.id
+
+
+async def test_delete_foreign_task_is_404(
+    user_client: AsyncClient,
+    admin_user: User,
+    session: AsyncSession,
+    query_counter,
+    create_task,
+):
+    task = await create_task(admin_user)
+    query_counter.statements.clear()
+
+    response = await user_client.delete(f"/api/v1/tasks/{task.id}")
+
+    assert response.status_code == 404
+    assert statement_kinds(query_counter) == ["DELETE"]
+    assert await session.scalar(select(Task.id)) == task.id
+
+
+async def test_complete_task_is_one_log_statement(
+    user_client: AsyncClient,
+    regular_user: User,
+    query_counter,
+    create_task,
+):
+    task = await create_task(regular_user)
+    query_counter.statements.clear()
+
+    response = await user_client.post(f"/api/v1/tasks/{task.id}/complete")
+
+    assert response.status_code == 200
+    assert response.json()["task_id"] == task.id
+    (insert,) = task_log_writes(query_counter)
+    assert insert.startswith("INSERT INTO task_logs") and "RETURNING" in insert
+    assert task_selects(query_counter) == []
+
+
+async def test_complete_task_is_idempotent(
+    user_client: AsyncClient,
+    regular_user: User,
+    create_task,
+):
+    task = await create_task(regular_user)
+
+    first = await user_client.post(f"/api/v1/tasks/{task.id}/complete")
+    second = await user_client.post(f"/api/v1/tasks/{task.id}/complete")
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    stats = await user_client.get(f"/api/v1/tasks/{task.id}/stats")
+    assert stats.json()["total_completions"] == 1
+
+
+async def test_complete_flips_incomplete_log_of_today(
+    user_client: AsyncClient,
+    regular_user: User,
+    session: AsyncSession,
+    create_task,
+):
+    task = await create_task(regular_user)
+    today = datetime.now(timezone.utc).date()
+    session.add(TaskLog(task_id=task.id, date=today, status=False))
+    await session.commit()
+
+    response = await user_client.post(f"/api/v1/tasks/{task.id}/complete")
+
+    assert response.status_code == 200
+    assert response.json()["status"] is True
+    stats = await user_client.get(f"/api/v1/tasks/{task.id}/stats")
+    assert stats.json()["total_completions"] == 1
+    tasks = await user_client.get("/api/v1/tasks/")
+    assert tasks.json()[0]["is_completed"] is True
+
+
+async def test_complete_foreign_task_is_404(
+    user_client: AsyncClient,
+    admin_user: User,
+    session: AsyncSession,
+    create_task,
+):
+    task = await create_task(admin_user)
+
+    response = await user_client.post(f"/api/v1/tasks/{task.id}/complete")
+
+    assert response.status_code == 404
+    assert await session.scalar(select(TaskLog.id)) is None
+
+
+async def test_undo_complete_is_one_delete_and_idempotent(
+    user_client: AsyncClient,
+    regular_user: User,
+    session: AsyncSession,
+    query_counter,
+    create_task,
+):
+    task = await create_task(regular_user)
+    await user_client.post(f"/api/v1/tasks/{task.id}/complete")
+    query_counter.statements.clear()
+
+    response = await user_client.delete(f"/api/v1/tasks/{task.id}/complete")
+
+    assert response.status_code == 204
+    (delete,) = task_log_writes(query_counter)
+    assert delete.startswith("DELETE FROM task_logs") and "RETURNING" in delete
+    assert task_selects(query_counter) == []
+
+    response = await user_client.delete(f"/api/v1/tasks/{task.id}/complete")
+    assert response.status_code == 204
+    tombstones = await session.scalars(select(Tombstone.entity_id))
+    assert len(tombstones.all()) == 1
+
+
+async def test_undo_complete_of_foreign_task_is_404(
+    user_client: AsyncClient,
+    admin_user: User,
+    session: AsyncSession,
+    create_task,
+):
+    task = await create_task(admin_user)
+    session.add(TaskLog(task_id=task.id, date=date.today()))
+    await session.commit()
+
+    response = await user_client.delete(f"/api/v1/tasks/{task.id}/complete")
+
+    assert response.status_code == 404
+    assert await session.scalar(select(TaskLog.id)) is not None
+
+
+async def test_register_is_one_insert(ac: AsyncClient, query_counter):
+    response = await ac.post(
+        "/api/v1/auth/register",
+        json={"username": "new", "email": "new@test.com", "password": "pass"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["access_token"]
+    assert statement_kinds(query_counter) == ["INSERT"]
@@ -0,0 +1,39 @@
+from datetime import date
+
+from habit_tasks.utils import (
+    decode_day_bitmap,
+    decode_month_bits,
+    encode_day_bitmap,
+    month_day_mask,
+    month_start,
+)
+
+
+def test_day_bitmap_round_trip():
+    start = date(2025, 1, 1)
+    days = [date(2025, 1, 1), date(2025, 1, 9), date(2025, 2, 1)]
+
+    bitmap = encode_day_bitmap(days, start, 40)
+
+    assert len(bitmap) == 5
+    assert bitmap[0] == 0b1
+    assert bitmap[1] == 0b1
+    assert list(decode_day_bitmap(bitmap, start)) == days
+
+
+def test_day_bitmap_ignores_days_outside_range():
+    start = date(2025, 1, 1)
+
+    bitmap = encode_day_bitmap([date(2024, 12, 31), date(2025, 1, 9)], start, 8)
+
+    assert bitmap == b"\x00"
+
+
+def test_month_bits_round_trip():
+    days = [date(2025, 1, 1), date(2025, 1, 17), date(2025, 1, 31)]
+    bits = 0
+    for day in days:
+        bits |= month_day_mask(day)
+
+    assert bits < 2**31
+    assert list(decode_month_bits(month_start(days[1]), bits)) == days
@@ -0,0 +1,55 @@
+from habit_tasks.utils import TTLCache
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    timer = FakeTimer()
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=5, timer=timer)
+
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    timer.now = 5
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache: TTLCache[str, int] = TTLCache(maxsize=2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_counts_hits_and_misses():
+    cache: TTLCache[str, int] = TTLCache(maxsize=2)
+
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("missing")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_ttl_cache_per_entry_ttl_overrides_default():
+    timer = FakeTimer()
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=100, timer=timer)
+
+    cache.set("a", 1, ttl=1)
+    timer.now = 2
+    assert cache.get("a") is None
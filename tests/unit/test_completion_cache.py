@@ -0,0 +1,46 @@
+from datetime import date
+
+import pytest
+
+from habit_tasks.utils import InMemoryCompletedTodayStore
+
+pytestmark = pytest.mark.asyncio
+
+TODAY = date(2025, 3, 10)
+TOMORROW = date(2025, 3, 11)
+
+
+async def test_write_through_updates_cached_day_only():
+    store = InMemoryCompletedTodayStore(maxsize=10)
+
+    await store.add(1, TODAY, 5)
+    assert await store.get(1, TODAY) is None
+
+    await store.set(1, TODAY, {5})
+    await store.add(1, TODAY, 6)
+    await store.discard(1, TODAY, 5)
+    assert await store.get(1, TODAY) == {6}
+
+
+async def test_day_rollover_is_a_miss():
+    store = InMemoryCompletedTodayStore(maxsize=10)
+    await store.set(1, TODAY, {5})
+
+    assert await store.get(1, TOMORROW) is None
+
+    await store.add(1, TOMORROW, 6)
+    assert await store.get(1, TODAY) == {5}
+
+
+async def test_fill_is_skipped_after_concurrent_write():
+    store = InMemoryCompletedTodayStore(maxsize=10)
+
+    generation = await store.generation(1)
+    await store.add(1, TODAY, 6)
+    await store.set(1, TODAY, {5}, generation)
+    assert await store.get(1, TODAY) is None
+
+    generation = await store.generation(1)
+    await store.discard(2, TODAY, 5)
+    await store.set(1, TODAY, {5}, generation)
+    assert await store.get(1, TODAY) == {5}
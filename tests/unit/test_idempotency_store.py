@@ -0,0 +1,60 @@
+import pytest
+
+from habit_tasks.utils import (
+    IdempotencyRecord,
+    InMemoryIdempotencyStore,
+    StoredResponse,
+)
+
+pytestmark = pytest.mark.asyncio
+
+RESPONSE = StoredResponse(201, [("content-type", "application/json")], b"{}")
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_reserve_save_and_replay():
+    store = InMemoryIdempotencyStore(maxsize=10)
+
+    assert await store.reserve(1, "key", "abc", lease=60) is None
+    assert await store.reserve(1, "key", "abc", lease=60) == IdempotencyRecord("abc")
+
+    await store.save(1, "key", RESPONSE, ttl=60)
+    assert await store.reserve(1, "key", "abc", lease=60) == IdempotencyRecord(
+        "abc", RESPONSE
+    )
+    assert await store.reserve(2, "key", "abc", lease=60) is None
+
+
+async def test_released_and_expired_keys_are_free_again():
+    timer = FakeTimer()
+    store = InMemoryIdempotencyStore(maxsize=10, timer=timer)
+
+    await store.reserve(1, "key", "abc", lease=60)
+    await store.release(1, "key")
+    assert await store.reserve(1, "key", "def", lease=60) is None
+
+    await store.save(1, "key", RESPONSE, ttl=60)
+    timer.now = 61
+    assert await store.reserve(1, "key", "ghi", lease=60) is None
+
+
+async def test_abandoned_reservation_expires_after_lease():
+    timer = FakeTimer()
+    store = InMemoryIdempotencyStore(maxsize=10, timer=timer)
+
+    await store.reserve(1, "key", "abc", lease=10)
+    timer.now = 11
+    assert await store.reserve(1, "key", "abc", lease=10) is None
+
+    await store.save(1, "key", RESPONSE, ttl=60)
+    timer.now = 50
+    assert await store.reserve(1, "key", "abc", lease=10) == IdempotencyRecord(
+        "abc", RESPONSE
+    )
@@ -0,0 +1,44 @@
+from datetime import date
+
+from habit_tasks.database.partitions import (
+    PARTITION_NAME_RE,
+    add_months,
+    create_partition_statements,
+    partition_name,
+)
+
+
+def test_add_months_crosses_years():
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+
+def test_partition_name_round_trip():
+    name = partition_name(date(2025, 3, 1))
+
+    assert name == "task_logs_p2025_03"
+    match = PARTITION_NAME_RE.match(name)
+    assert match is not None
+    assert match.groups() == ("2025", "03")
+
+
+def test_partition_is_created_directly_when_default_has_no_rows():
+    (statement,) = create_partition_statements(date(2025, 3, 1), False)
+
+    assert statement == (
+        "CREATE TABLE IF NOT EXISTS task_logs_p2025_03 PARTITION OF task_logs "
+        "FOR VALUES FROM ('2025-03-01') TO ('2025-04-01')"
+    )
+
+
+def test_default_rows_are_moved_while_default_is_detached():
+    statements = create_partition_statements(date(2025, 12, 1), True)
+
+    assert statements[0] == "ALTER TABLE task_logs DETACH PARTITION task_logs_default"
+    assert statements[1].startswith("CREATE TABLE IF NOT EXISTS task_logs_p2025_12")
+    assert statements[2].startswith("INSERT INTO task_logs")
+    assert statements[3].startswith("DELETE FROM task_logs_default")
+    assert "date >= '2025-12-01' AND date < '2026-01-01'" in statements[3]
+    assert statements[-1] == (
+        "ALTER TABLE task_logs ATTACH PARTITION task_logs_default DEFAULT"
+    )
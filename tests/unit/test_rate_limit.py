@@ -0,0 +1,39 @@
+import pytest
+
+from habit_tasks.utils import InMemoryRateLimitStore
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_token_bucket_allows_burst_then_limits():
+    store = InMemoryRateLimitStore(maxsize=10, timer=FakeTimer())
+
+    assert [await store.hit("k", 3, 60) for _ in range(3)] == [0, 0, 0]
+    assert await store.hit("k", 3, 60) == pytest.approx(20)
+
+
+async def test_token_bucket_refills_over_window():
+    timer = FakeTimer()
+    store = InMemoryRateLimitStore(maxsize=10, timer=timer)
+    for _ in range(3):
+        await store.hit("k", 3, 60)
+
+    timer.now = 20
+    assert await store.hit("k", 3, 60) == 0
+    assert await store.hit("k", 3, 60) > 0
+
+
+async def test_token_bucket_keys_are_independent():
+    store = InMemoryRateLimitStore(maxsize=10, timer=FakeTimer())
+
+    assert await store.hit("a", 1, 60) == 0
+    assert await store.hit("b", 1, 60) == 0
+    assert await store.hit("a", 1, 60) > 0
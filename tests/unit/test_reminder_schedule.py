@@ -0,0 +1,39 @@
+from datetime import datetime, time, timezone
+
+import pytest
+
+from habit_tasks.reminders import next_fire_at, parse_reminder_time
+
+
+def utc(*args: int) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_next_fire_later_today_or_tomorrow():
+    assert next_fire_at(time(9, 0), "UTC", utc(2025, 3, 1, 8, 0)) == utc(
+        2025, 3, 1, 9, 0
+    )
+    assert next_fire_at(time(9, 0), "UTC", utc(2025, 3, 1, 9, 0)) == utc(
+        2025, 3, 2, 9, 0
+    )
+
+
+def test_next_fire_uses_the_users_wall_clock():
+    # 08:00 in Tokyo (UTC+9) is 23:00 UTC of the previous day.
+    assert next_fire_at(time(8, 0), "Asia/Tokyo", utc(2025, 3, 1, 12, 0)) == utc(
+        2025, 3, 1, 23, 0
+    )
+
+
+def test_next_fire_follows_dst_change():
+    before = next_fire_at(time(8, 0), "America/New_York", utc(2025, 3, 8, 14, 0))
+    after = next_fire_at(time(8, 0), "America/New_York", before)
+
+    assert before == utc(2025, 3, 9, 12, 0)
+    assert after == utc(2025, 3, 10, 12, 0)
+
+
+@pytest.mark.parametrize("value", ["25:00", "8am", "08:00+02:00"])
+def test_parse_reminder_time_rejects_invalid_values(value: str):
+    with pytest.raises(ValueError):
+        parse_reminder_time(value)
@@ -0,0 +1,64 @@
+from datetime import date, timedelta
+
+from habit_tasks.api.v1.tasks.aggregates import (
+    append_completions,
+    can_append,
+    can_remove,
+    remove_completion,
+)
+from habit_tasks.api.v1.tasks.stats import compute_streaks
+from habit_tasks.database.models import TaskAggregate
+
+START = date(2025, 1, 1)
+
+
+def day(offset: int) -> date:
+    return START + timedelta(days=offset)
+
+
+def empty_aggregate() -> TaskAggregate:
+    return TaskAggregate(
+        task_id=1, total_completions=0, current_streak=0, longest_streak=0
+    )
+
+
+def snapshot(aggregate: TaskAggregate) -> tuple:
+    return (
+        aggregate.total_completions,
+        aggregate.current_streak,
+        aggregate.longest_streak,
+        aggregate.last_completed,
+    )
+
+
+def test_in_order_appends_match_full_recompute():
+    days = [day(i) for i in (0, 1, 2, 5, 6, 9)]
+    aggregate = empty_aggregate()
+
+    for completed in days:
+        assert can_append(aggregate, [completed])
+        append_completions(aggregate, [completed])
+
+    assert snapshot(aggregate) == tuple(compute_streaks(days))
+
+
+def test_out_of_order_date_cannot_be_appended():
+    aggregate = empty_aggregate()
+    append_completions(aggregate, [day(5)])
+
+    assert not can_append(aggregate, [day(3)])
+    assert not can_append(aggregate, [day(5)])
+
+
+def test_remove_newest_day_of_shorter_streak():
+    days = [day(i) for i in (0, 1, 2, 3, 7, 8)]
+    aggregate = empty_aggregate()
+    append_completions(aggregate, days)
+
+    assert can_remove(aggregate, day(8))
+    remove_completion(aggregate, day(8))
+    assert snapshot(aggregate) == tuple(compute_streaks(days[:-1]))
+
+    # The remaining one-day streak and the record need the history.
+    assert not can_remove(aggregate, day(7))
+    assert not can_remove(aggregate, day(3))
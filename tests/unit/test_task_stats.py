@@ -0,0 +1,88 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from habit_tasks.api.v1.tasks.stats import (
+    compute_streaks,
+    load_streaks,
+    to_task_stats,
+    window_streaks_stmt,
+)
+from habit_tasks.database.models import Task, TaskLog, User
+
+TODAY = date(2025, 3, 10)
+CREATED_AT = datetime(2025, 3, 1)
+
+
+def days_ago(*offsets: int) -> list[date]:
+    return sorted(TODAY - timedelta(days=offset) for offset in offsets)
+
+
+def test_streaks_split_on_gaps():
+    stats = to_task_stats(
+        1, CREATED_AT, compute_streaks(days_ago(9, 8, 7, 6, 4, 1, 0)), TODAY
+    )
+
+    assert stats.total_completions == 7
+    assert stats.longest_streak == 4
+    assert stats.current_streak == 2
+    assert stats.last_completed == TODAY
+    assert stats.completion_rate == 0.7
+
+
+def test_current_streak_survives_until_end_of_next_day():
+    stats = to_task_stats(1, CREATED_AT, compute_streaks(days_ago(3, 2, 1)), TODAY)
+    assert stats.current_streak == 3
+
+    stats = to_task_stats(1, CREATED_AT, compute_streaks(days_ago(4, 3, 2)), TODAY)
+    assert stats.current_streak == 0
+    assert stats.longest_streak == 3
+
+
+def test_task_without_completions():
+    stats = to_task_stats(1, CREATED_AT, compute_streaks([]), TODAY)
+
+    assert stats.total_completions == 0
+    assert stats.last_completed is None
+    assert stats.completion_rate == 0.0
+
+
+def test_window_query_compiles_for_postgresql():
+    sql = str(window_streaks_stmt([1, 2]).compile(dialect=postgresql.dialect()))
+
+    assert (
+        "(task_logs.date - DATE '1970-01-01') - CAST(row_number() OVER "
+        "(PARTITION BY task_logs.task_id ORDER BY task_logs.date) AS INTEGER)"
+    ) in sql
+    assert "FILTER (WHERE" in sql
+
+
+@pytest.mark.asyncio
+async def test_window_query_matches_python_streaks(session: AsyncSession):
+    user = User(username="streaks", email="streaks@test.com", password_hash="x")
+    session.add(user)
+    await session.flush()
+    first = Task(user_id=user.id, title="first")
+    second = Task(user_id=user.id, title="second")
+    session.add_all([first, second])
+    await session.flush()
+
+    # Streaks across a month and a year boundary, plus an undone day.
+    first_days = [date(2024, 12, 30) + timedelta(days=offset) for offset in range(4)]
+    first_days += [date(2025, 2, 27), date(2025, 2, 28), date(2025, 3, 1)]
+    second_days = [date(2025, 3, 5), date(2025, 3, 7)]
+    session.add_all(TaskLog(task_id=first.id, date=day) for day in first_days)
+    session.add_all(TaskLog(task_id=second.id, date=day) for day in second_days)
+    session.add(TaskLog(task_id=second.id, date=date(2025, 3, 6), status=False))
+    await session.commit()
+
+    streaks = await load_streaks(session, [first.id, second.id])
+
+    assert streaks == {
+        first.id: compute_streaks(first_days),
+        second.id: compute_streaks(second_days),
+    }
+    assert streaks[first.id].longest_streak == 4
+    assert streaks[first.id].current_streak == 3
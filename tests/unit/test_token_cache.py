@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta, timezone
+
+from habit_tasks.api.v1.auth import utils
+
+
+def test_decode_token_cached_verifies_once(monkeypatch):
+    token = utils.encode_token({"sub": "cached"})
+    calls = []
+    decode_token = utils.decode_token
+
+    def counting_decode(token):
+        calls.append(token)
+        return decode_token(token)
+
+    monkeypatch.setattr(utils, "decode_token", counting_decode)
+
+    first = utils.decode_token_cached(token)
+    second = utils.decode_token_cached(token)
+
+    assert first == second
+    assert first["sub"] == "cached"
+    assert len(calls) == 1
+
+
+def test_decode_token_cached_returns_copies():
+    token = utils.encode_token({"sub": "cached"})
+
+    utils.decode_token_cached(token)["sub"] = "tampered"
+
+    assert utils.decode_token_cached(token)["sub"] == "cached"
+
+
+def test_decode_token_cached_entry_expires_with_token(monkeypatch):
+    cache = utils.verified_token_cache
+    cache.clear()
+    expires = datetime.now(timezone.utc) + timedelta(seconds=30)
+    utils.decode_token_cached(utils.encode_token({"sub": "cached", "exp": expires}))
+    assert len(cache) == 1
+
+    timer = cache.timer
+    monkeypatch.setattr(cache, "timer", lambda: timer() + 31)
+
+    assert cache.get(next(iter(cache._data))) is None